@@ -0,0 +1,85 @@
+"""Сравнение потокового чтения/записи XLSX с `pd.read_excel`/`to_excel`.
+
+Для каждого размера генерируется синтетический датасет, после чего замеряется
+время (и с флагом `--memory` — пиковая память через tracemalloc, что заметно
+замедляет openpyxl) четырех операций: запись через
+`to_excel(engine="openpyxl")`, запись через книгу `write_only`, чтение через
+`pd.read_excel` и чтение через итератор строк `read_only`.
+
+Запуск из корня проекта:
+    python benchmarks/bench_excel.py --rows 100000 1000000 [--memory]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data_excel import EXCEL_MAX_ROWS, read_excel_streaming, write_excel_rows  # noqa: E402
+
+
+def make_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Создает синтетический датасет, похожий на выгрузку пациентов."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Patient_ID": np.arange(rows),
+        "Age": rng.integers(18, 95, rows),
+        "Tumor_Size": rng.normal(3.5, 1.2, rows).round(2),
+        "Cancer_Type": rng.choice(["Lung", "Breast", "Colon", "Skin", "Prostate"], rows),
+        "Mutation_Type": rng.choice(["TP53", "KRAS", "EGFR", "BRCA1"], rows),
+        "Smoker": rng.choice(["Yes", "No"], rows),
+    })
+
+
+def measure(action, track_memory: bool):
+    """Выполняет действие и возвращает (результат, секунды, пиковые МБ или None)."""
+    if track_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = action()
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20 if track_memory else None
+        return result, seconds, peak
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+
+
+def run(rows: int, workdir: Path, track_memory: bool):
+    df = make_frame(min(rows, EXCEL_MAX_ROWS - 1))
+    pandas_path = workdir / f"pandas_{rows}.xlsx"
+    streaming_path = workdir / f"streaming_{rows}.xlsx"
+    blocks = lambda: (df.iloc[i:i + 50_000] for i in range(0, len(df), 50_000))
+
+    results = [
+        ("write to_excel", measure(lambda: df.to_excel(pandas_path, index=False, engine="openpyxl"), track_memory)),
+        ("write write_only", measure(lambda: write_excel_rows(blocks(), list(df.columns), streaming_path), track_memory)),
+        ("read pd.read_excel", measure(lambda: pd.read_excel(pandas_path), track_memory)),
+        ("read read_only", measure(lambda: read_excel_streaming(streaming_path), track_memory)),
+    ]
+    print(f"\n{len(df)} строк")
+    for name, (_, seconds, peak) in results:
+        memory = f"{peak:10.1f} МБ" if peak is not None else ""
+        print(f"  {name:<20} {seconds:8.2f} с {memory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--memory", action="store_true", help="замерять пиковую память (медленно)")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            run(rows, Path(tmp), args.memory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Сравнение `TableRenderer` с `tabulate(..., tablefmt="psql")`.
+
+Для каждого размера генерируется синтетический датасет и замеряется время
+форматирования всей таблицы одним вызовом, а также постраничного вывода
+(страницы по 20 строк, как в просмотре таблицы): `tabulate` заново
+определяет ширины на каждой странице, `TableRenderer` — один раз по
+выборке строк.
+
+Запуск из корня проекта:
+    python benchmarks/bench_table_renderer.py --rows 20 1000 100000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data_table_renderer import TableRenderer  # noqa: E402
+
+PAGE_ROWS = 20
+
+
+def make_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Создает синтетический датасет, похожий на выгрузку пациентов."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Patient_ID": np.arange(rows),
+        "Age": rng.integers(18, 95, rows),
+        "Tumor_Size": rng.normal(3.5, 1.2, rows).round(2),
+        "Cancer_Type": rng.choice(["Lung", "Breast", "Colon", "Skin", "Prostate"], rows),
+        "Mutation_Type": rng.choice(["TP53", "KRAS", "EGFR", "BRCA1"], rows),
+        "Smoker": rng.choice(["Yes", "No"], rows),
+    })
+
+
+def measure(action, repeat: int) -> float:
+    """Лучшее время из `repeat` запусков."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def paged_tabulate(df: pd.DataFrame):
+    for start in range(0, len(df), PAGE_ROWS):
+        tabulate(df.iloc[start:start + PAGE_ROWS], headers="keys", tablefmt="psql")
+
+
+def paged_renderer(df: pd.DataFrame):
+    renderer = TableRenderer().fit(df.iloc[np.linspace(0, len(df) - 1, min(200, len(df))).astype(np.int64)])
+    for start in range(0, len(df), PAGE_ROWS):
+        renderer.render(df.iloc[start:start + PAGE_ROWS])
+
+
+def run(rows: int):
+    df = make_frame(rows)
+    # Малые таблицы форматируются за миллисекунды: берется лучшее из нескольких запусков
+    repeat = 20 if rows <= 1_000 else 1
+    results = [
+        ("table tabulate", measure(lambda: tabulate(df, headers="keys", tablefmt="psql"), repeat)),
+        ("table TableRenderer", measure(lambda: TableRenderer().render(df), repeat)),
+        ("pages tabulate", measure(lambda: paged_tabulate(df), repeat)),
+        ("pages TableRenderer", measure(lambda: paged_renderer(df), repeat)),
+    ]
+    print(f"\n{rows} строк")
+    for name, seconds in results:
+        print(f"  {name:<22} {seconds * 1000:10.1f} мс")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[20, 1_000, 100_000])
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows)
+
+
+if __name__ == "__main__":
+    main()
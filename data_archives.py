@@ -0,0 +1,160 @@
+"""Модуль чтения сжатых файлов и архивов без распаковки на диск.
+
+Сжатые файлы (`.csv.gz`, `.csv.bz2`, `.csv.xz`, `.csv.zst`) pandas
+распаковывает потоково сам, поэтому здесь для них определяется только
+формат содержимого. Архивы (`.zip`, `.tar`, `.tar.gz`, `.tar.bz2`, `.tar.xz`)
+представляются списком членов `ArchiveMember`; член архива открывается как
+бинарный поток и передается прямо в парсер, в том числе в потоковый импорт
+CSV чанками.
+
+Классы:
+    ArchiveMember: Файл данных внутри архива.
+
+Функции:
+    full_suffix: Возвращает составное расширение файла.
+    inner_suffix: Возвращает формат содержимого сжатого файла.
+    is_archive: Проверяет, является ли файл архивом.
+    list_members: Перечисляет файлы данных внутри архива.
+    read_member: Читает член архива в DataFrame.
+"""
+
+import io
+import tarfile
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from typing import List
+
+import pandas as pd
+
+from data_columnar import FEATHER_SUFFIXES, PARQUET_SUFFIXES
+
+COMPRESSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.zst': 'zstd'}
+COMPRESSED_SUFFIXES = tuple(COMPRESSIONS)
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tgz', '.tar.gz', '.tar.bz2', '.tar.xz')
+MEMBER_SUFFIXES = ('.csv', '.xlsx', '.xls') + PARQUET_SUFFIXES + FEATHER_SUFFIXES
+
+
+def full_suffix(path) -> str:
+    """Возвращает составное расширение в нижнем регистре: `.csv.gz`, `.tar.xz`, `.csv`."""
+    suffixes = [suffix.lower() for suffix in PurePosixPath(str(path)).suffixes]
+    if len(suffixes) >= 2 and suffixes[-1] in COMPRESSED_SUFFIXES:
+        return "".join(suffixes[-2:])
+    return suffixes[-1] if suffixes else ""
+
+
+def inner_suffix(path) -> str:
+    """Возвращает формат содержимого: `.csv` для `data.csv.gz` и для `data.csv`."""
+    suffix = full_suffix(path)
+    for compressed in COMPRESSED_SUFFIXES:
+        if suffix.endswith(compressed) and suffix != compressed:
+            return suffix[:-len(compressed)]
+    return suffix
+
+
+def is_archive(path) -> bool:
+    """Проверяет, является ли файл архивом zip или tar."""
+    return full_suffix(path) in ARCHIVE_SUFFIXES
+
+
+class ArchiveMember:
+    """Файл данных внутри архива.
+
+    Объект хранит только путь к архиву и имя члена, поэтому его можно
+    передавать в процессы пула при параллельном импорте.
+
+    Attributes:
+        archive: Путь к архиву
+        name: Имя члена внутри архива
+        size: Размер члена в байтах до сжатия
+    """
+
+    def __init__(self, archive: Path, name: str, size: int = 0):
+        self.archive = Path(archive)
+        self.name = name
+        self.size = size
+
+    @property
+    def suffix(self) -> str:
+        """Формат содержимого члена архива."""
+        return inner_suffix(self.name)
+
+    @property
+    def compression(self):
+        """Сжатие самого члена архива для pandas (например, `.csv.gz` внутри zip) или None."""
+        return COMPRESSIONS.get(PurePosixPath(self.name).suffix.lower())
+
+    @contextmanager
+    def open(self):
+        """Открывает член архива как бинарный поток без распаковки на диск."""
+        if full_suffix(self.archive) == '.zip':
+            with zipfile.ZipFile(self.archive) as archive, archive.open(self.name) as stream:
+                yield stream
+        else:
+            with tarfile.open(self.archive, "r:*") as archive:
+                stream = archive.extractfile(self.name)
+                if stream is None:
+                    raise ValueError(f"{self.name} не является файлом")
+                with stream:
+                    yield stream
+
+    def __str__(self):
+        return f"{self.archive}/{self.name}"
+
+    def __repr__(self):
+        return f"ArchiveMember({str(self.archive)!r}, {self.name!r})"
+
+
+def list_members(archive_path: Path) -> List[ArchiveMember]:
+    """Перечисляет файлы данных поддерживаемых форматов внутри архива.
+
+    Args:
+        archive_path: Путь к архиву zip или tar (в том числе сжатому)
+
+    Returns:
+        List[ArchiveMember]: Члены архива в порядке имен
+    """
+    archive_path = Path(archive_path)
+    if full_suffix(archive_path) == '.zip':
+        with zipfile.ZipFile(archive_path) as archive:
+            entries = [(info.filename, info.file_size) for info in archive.infolist() if not info.is_dir()]
+    else:
+        with tarfile.open(archive_path, "r:*") as archive:
+            entries = [(info.name, info.size) for info in archive.getmembers() if info.isfile()]
+    return sorted(
+        (ArchiveMember(archive_path, name, size) for name, size in entries if inner_suffix(name) in MEMBER_SUFFIXES),
+        key=lambda member: member.name,
+    )
+
+
+def read_member(member: ArchiveMember, streaming: bool = False) -> pd.DataFrame:
+    """Читает член архива в DataFrame.
+
+    CSV разбирается прямо из потока распаковки с автоопределением параметров
+    (при `streaming` — чанками по плану типов). Excel, Parquet и Feather требуют произвольного доступа к
+    файлу, поэтому читаются из буфера в памяти.
+
+    Args:
+        member: Член архива
+        streaming: Читать CSV чанками по плану типов
+
+    Returns:
+        pd.DataFrame: Загруженные данные
+
+    Raises:
+        ValueError: Если формат члена архива не поддерживается
+    """
+    suffix = member.suffix
+    if suffix == '.csv':
+        from data_sniffer import read_csv_auto
+        return read_csv_auto(member.open, member.compression, streaming, track_memory=False)[0]
+    if suffix not in MEMBER_SUFFIXES:
+        raise ValueError(f"Неподдерживаемый формат в архиве: {member.name}")
+
+    with member.open() as stream:
+        buffer = io.BytesIO(stream.read())
+    if suffix in PARQUET_SUFFIXES:
+        return pd.read_parquet(buffer)
+    if suffix in FEATHER_SUFFIXES:
+        return pd.read_feather(buffer)
+    return pd.read_excel(buffer)
@@ -0,0 +1,200 @@
+"""Модуль дискового кэша разобранных датасетов.
+
+Разобранный DataFrame сохраняется в несжатом формате Arrow IPC, который при
+следующем импорте того же файла открывается через memory map без повторного
+разбора CSV/XLSX. Текстовые столбцы (строки Arrow) остаются в отображенных
+буферах файла, а числовые и коды категорий копируются в массивы NumPy:
+массивы без копирования Arrow отдает только для чтения, а данные в просмотре
+и при импорте изменяются на месте. Ключ записи строится из пути, размера,
+времени изменения, хэша содержимого и параметров разбора. Размер кэша
+ограничен, при превышении удаляются давно не использованные записи (LRU).
+
+Кэши хранятся в `~/.datalyze_cache` (или в каталоге из переменной окружения
+`DATALYZE_CACHE_DIR`) независимо от текущего каталога запуска.
+
+Классы:
+    DatasetCache: Кэш разобранных датасетов.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+CACHE_ROOT = Path(os.environ.get("DATALYZE_CACHE_DIR") or Path.home() / ".datalyze_cache")
+DEFAULT_CACHE_DIR = CACHE_ROOT / "datasets"
+DEFAULT_MAX_BYTES = 2 * 2 ** 30
+_HASH_BLOCK_SIZE = 2 ** 20
+
+
+def file_content_hash(file_path: Path) -> str:
+    """Вычисляет хэш содержимого файла, читая его блоками.
+
+    Args:
+        file_path: Путь к файлу
+
+    Returns:
+        str: Шестнадцатеричный BLAKE2b-дайджест
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DatasetCache:
+    """Кэш разобранных датасетов с LRU-вытеснением по размеру.
+
+    Attributes:
+        cache_dir: Каталог с файлами кэша и индексом `index.json`
+        max_bytes: Максимальный суммарный размер файлов кэша
+        hits: Количество попаданий за сессию
+        misses: Количество промахов за сессию
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Инициализирует кэш и загружает индекс.
+
+        Args:
+            cache_dir: Каталог кэша (создается при первой записи)
+            max_bytes: Ограничение суммарного размера файлов кэша
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._hashes = {}
+        self._index_path = self.cache_dir / "index.json"
+        self._index = self._load_index()
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_index(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+
+    def _content_hash(self, file_path: Path, stat: os.stat_result) -> str:
+        """Возвращает хэш содержимого, переиспользуя его для неизмененного файла.
+
+        Если в индексе или в памяти уже есть хэш для того же пути, размера
+        и времени изменения, файл повторно не читается.
+        """
+        fingerprint = (str(file_path), stat.st_size, stat.st_mtime_ns)
+        if fingerprint not in self._hashes:
+            for entry in self._index.values():
+                if (entry["path"], entry["size"], entry["mtime_ns"]) == fingerprint:
+                    self._hashes[fingerprint] = entry["content_hash"]
+                    break
+            else:
+                self._hashes[fingerprint] = file_content_hash(file_path)
+        return self._hashes[fingerprint]
+
+    def _key(self, file_path: Path, options: dict):
+        file_path = Path(file_path).resolve()
+        stat = file_path.stat()
+        content_hash = self._content_hash(file_path, stat)
+        key_source = json.dumps({"content_hash": content_hash, "options": options}, sort_keys=True, default=str)
+        key = hashlib.blake2b(key_source.encode('utf-8'), digest_size=16).hexdigest()
+        meta = {
+            "path": str(file_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "content_hash": content_hash,
+        }
+        return key, meta
+
+    def get(self, file_path: Path, options: dict) -> Optional[pd.DataFrame]:
+        """Возвращает закэшированный DataFrame или None при промахе.
+
+        Args:
+            file_path: Путь к исходному файлу
+            options: Параметры разбора, влияющие на результат
+
+        Returns:
+            Optional[pd.DataFrame]: Данные из кэша либо None
+        """
+        key, meta = self._key(file_path, options)
+        entry = self._index.get(key)
+        data_path = self.cache_dir / f"{key}.arrow"
+        if entry is None or not data_path.exists():
+            self.misses += 1
+            return None
+
+        import pyarrow as pa
+        with pa.memory_map(str(data_path), 'r') as source:
+            df = pa.ipc.open_file(source).read_all().to_pandas()
+
+        entry.update(meta)
+        entry["last_access"] = time.time()
+        self._save_index()
+        self.hits += 1
+        return df
+
+    def put(self, file_path: Path, options: dict, df: pd.DataFrame):
+        """Сохраняет разобранный DataFrame в кэш и вытесняет старые записи.
+
+        Args:
+            file_path: Путь к исходному файлу
+            options: Параметры разбора, влияющие на результат
+            df: Разобранные данные
+        """
+        import pyarrow as pa
+
+        key, meta = self._key(file_path, options)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        data_path = self.cache_dir / f"{key}.arrow"
+        tmp_path = data_path.with_suffix('.tmp')
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(str(tmp_path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, data_path)
+
+        self._index[key] = dict(meta, bytes=data_path.stat().st_size, last_access=time.time())
+        self._evict()
+        self._save_index()
+
+    def _evict(self):
+        """Удаляет давно не использованные записи, пока кэш превышает лимит."""
+        total = sum(entry["bytes"] for entry in self._index.values())
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            (self.cache_dir / f"{key}.arrow").unlink(missing_ok=True)
+            total -= entry["bytes"]
+            del self._index[key]
+
+    def clear(self):
+        """Удаляет все записи кэша."""
+        for key in list(self._index):
+            (self.cache_dir / f"{key}.arrow").unlink(missing_ok=True)
+        self._index = {}
+        self._save_index()
+
+    def stats(self) -> dict:
+        """Возвращает статистику кэша.
+
+        Returns:
+            dict: Количество записей, занятый объем, лимит, попадания и промахи
+        """
+        return {
+            "entries": len(self._index),
+            "bytes": sum(entry["bytes"] for entry in self._index.values()),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,134 @@
+"""Модуль чтения и записи колоночных форматов Parquet и Feather (Arrow IPC).
+
+Колоночные файлы хранят уже разобранные типизированные данные, поэтому
+повторная загрузка большого датасета не требует разбора текста. Поддерживается
+проекция: чтение только выбранных столбцов и групп строк (row groups в Parquet,
+record batches в Feather).
+
+Функции:
+    describe_columnar: Возвращает столбцы и число групп строк файла.
+    read_columnar: Читает файл с проекцией столбцов и групп строк.
+    write_columnar: Записывает DataFrame в Parquet или Feather.
+"""
+
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+FEATHER_SUFFIXES = ('.feather', '.arrow', '.ipc')
+COLUMNAR_SUFFIXES = PARQUET_SUFFIXES + FEATHER_SUFFIXES
+
+DEFAULT_ROW_GROUP_SIZE = 256_000
+
+
+def _require_pyarrow():
+    """Импортирует pyarrow или сообщает, как его установить."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Для Parquet/Feather требуется pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def is_columnar(file_path: Path) -> bool:
+    """Проверяет, относится ли файл к колоночным форматам по расширению."""
+    return Path(file_path).suffix.lower() in COLUMNAR_SUFFIXES
+
+
+def describe_columnar(file_path: Path) -> Tuple[List[str], int]:
+    """Читает только метаданные файла.
+
+    Args:
+        file_path: Путь к файлу Parquet/Feather
+
+    Returns:
+        Tuple[List[str], int]: Имена столбцов и количество групп строк
+    """
+    pa = _require_pyarrow()
+    file_path = Path(file_path)
+    if file_path.suffix.lower() in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+        metadata = pq.ParquetFile(file_path).metadata
+        return list(metadata.schema.names), metadata.num_row_groups
+
+    with pa.memory_map(str(file_path), 'r') as source:
+        reader = pa.ipc.open_file(source)
+        return list(reader.schema.names), reader.num_record_batches
+
+
+def read_columnar(file_path: Path,
+                  columns: Optional[Sequence[str]] = None,
+                  row_groups: Optional[Sequence[int]] = None) -> pd.DataFrame:
+    """Читает Parquet/Feather с проекцией столбцов и групп строк.
+
+    Args:
+        file_path: Путь к файлу
+        columns: Столбцы для чтения (None — все)
+        row_groups: Номера групп строк для чтения (None — все)
+
+    Returns:
+        pd.DataFrame: Загруженные данные
+
+    Raises:
+        ImportError: Если не установлен pyarrow
+        ValueError: Если формат не поддерживается
+    """
+    pa = _require_pyarrow()
+    file_path = Path(file_path)
+    columns = list(columns) if columns else None
+    suffix = file_path.suffix.lower()
+
+    if suffix in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(file_path, memory_map=True)
+        if row_groups:
+            table = parquet_file.read_row_groups(list(row_groups), columns=columns)
+        else:
+            table = parquet_file.read(columns=columns)
+        return table.to_pandas()
+
+    if suffix in FEATHER_SUFFIXES:
+        with pa.memory_map(str(file_path), 'r') as source:
+            reader = pa.ipc.open_file(source)
+            if row_groups:
+                batches = [reader.get_batch(i) for i in row_groups]
+                table = pa.Table.from_batches(batches, schema=reader.schema)
+            else:
+                table = reader.read_all()
+            if columns:
+                table = table.select(columns)
+            return table.to_pandas()
+
+    raise ValueError(f"Неподдерживаемый колоночный формат: {suffix}")
+
+
+def write_columnar(df: pd.DataFrame, file_path: Path, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+    """Записывает DataFrame в Parquet или Feather в зависимости от расширения.
+
+    Данные пишутся группами по `row_group_size` строк, чтобы при чтении
+    можно было выбирать отдельные группы.
+
+    Args:
+        df: Данные для записи
+        file_path: Путь к файлу (.parquet/.pq или .feather/.arrow/.ipc)
+        row_group_size: Количество строк в группе
+
+    Raises:
+        ImportError: Если не установлен pyarrow
+        ValueError: Если формат не поддерживается
+    """
+    pa = _require_pyarrow()
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    if suffix in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+        pq.write_table(table, file_path, row_group_size=row_group_size, compression='zstd')
+    elif suffix in FEATHER_SUFFIXES:
+        import pyarrow.feather as feather
+        feather.write_feather(table, file_path, compression='lz4', chunksize=row_group_size)
+    else:
+        raise ValueError(f"Неподдерживаемый колоночный формат: {suffix}")
@@ -0,0 +1,154 @@
+"""Модуль удаления повторяющихся строк при импорте.
+
+Каждая строка (или выбранный набор ключевых столбцов) векторизованно
+хэшируется в 64-битное число через `pd.util.hash_pandas_object`. Уже
+встреченные хэши хранятся в нескольких отсортированных массивах uint64
+(8 байт на уникальную строку), которые сливаются по мере роста, как в
+LSM-дереве; проверка блока строк выполняется через `np.searchsorted`.
+Поэтому блоки можно фильтровать по мере чтения, не держа в памяти ни
+все данные, ни множество Python-объектов.
+
+Совпадение 64-битных хэшей у разных строк возможно, но для миллионов
+строк его вероятность пренебрежимо мала (порядка n²/2⁶⁵).
+
+Классы:
+    RowDeduplicator: Фильтр повторяющихся строк с компактным множеством хэшей.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BLOCK_ROWS = 500_000
+
+
+def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+    """Приводит числовые столбцы к float64 перед хэшированием.
+
+    Хэш зависит от типа: значение 1 в int8, int64 и float64 хэшируется
+    по-разному. При потоковом импорте тип столбца может меняться между
+    чанками — расшириться до int64 или, после пропуска, до float64, — поэтому
+    все числа, включая `Int64`/`Float64` с пропусками, хэшируются в одном
+    виде: float64 с NaN вместо пропуска. Целые больше 2⁵³ при этом
+    округляются, что может лишь добавить совпадение, как и коллизия хэшей.
+    """
+    columns = {}
+    for name in frame.columns:
+        column = frame[name]
+        if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+            columns[name] = pd.Series(column.to_numpy(dtype=np.float64, na_value=np.nan), index=frame.index)
+        else:
+            columns[name] = column
+    return pd.DataFrame(columns, index=frame.index)
+
+
+class RowDeduplicator:
+    """Фильтр повторяющихся строк для последовательности блоков.
+
+    Attributes:
+        keys: Ключевые столбцы (None — все столбцы, кроме `exclude`)
+        exclude: Столбцы, не участвующие в сравнении при `keys=None`
+        rows_seen: Количество проверенных строк
+        dropped: Количество удаленных повторов
+
+    Example:
+        >>> dedup = RowDeduplicator(keys=["Patient_ID"])
+        >>> chunks = [dedup.filter(chunk) for chunk in reader]
+        >>> print(dedup.report())
+    """
+
+    def __init__(self, keys: Optional[Sequence[str]] = None, exclude: Sequence[str] = ()):
+        self.keys = list(keys) if keys else None
+        self.exclude = list(exclude)
+        self.rows_seen = 0
+        self.dropped = 0
+        self._runs: List[np.ndarray] = []
+
+    @property
+    def spec(self):
+        """Описание ключа для ключа кэша: список столбцов или `*`."""
+        return self.keys or "*"
+
+    @property
+    def unique_rows(self) -> int:
+        return sum(len(run) for run in self._runs)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Объем памяти, занятый множеством хэшей."""
+        return sum(run.nbytes for run in self._runs)
+
+    def _key_columns(self, frame: pd.DataFrame) -> List[str]:
+        if self.keys is None:
+            return [column for column in frame.columns if column not in self.exclude]
+        missing = [key for key in self.keys if key not in frame.columns]
+        if missing:
+            raise KeyError(f"Нет ключевых столбцов: {', '.join(map(str, missing))}")
+        return self.keys
+
+    def _contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            positions = np.searchsorted(run, hashes)
+            positions[positions == len(run)] = 0
+            found |= run[positions] == hashes
+        return found
+
+    def _add(self, hashes: np.ndarray):
+        """Добавляет отсортированный блок хэшей, сливая блоки сопоставимого размера."""
+        self._runs.append(hashes)
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            last = self._runs.pop()
+            # Блоки отсортированы и не пересекаются: устойчивая сортировка
+            # (timsort) сливает две готовые серии за линейное время
+            self._runs[-1] = np.sort(np.concatenate([self._runs[-1], last]), kind="stable")
+
+    def filter(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Оставляет строки блока, не встречавшиеся ни в нем ранее, ни в прошлых блоках.
+
+        Args:
+            frame: Очередной блок строк
+
+        Returns:
+            pd.DataFrame: Блок без повторов (исходный объект, если повторов нет)
+        """
+        if frame.empty:
+            return frame
+        keys = _normalize(frame[self._key_columns(frame)])
+        hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+        # Первые вхождения внутри блока — через хэш-таблицу pandas, без сортировки
+        first = np.flatnonzero(~pd.Series(hashes).duplicated().to_numpy())
+        # Отсортированные запросы к searchsorted идут по памяти последовательно
+        order = first[np.argsort(hashes[first])]
+        candidates = hashes[order]
+        new = ~self._contains(candidates)
+        keep = np.zeros(len(frame), dtype=bool)
+        keep[order[new]] = True
+        self._add(candidates[new])
+
+        self.rows_seen += len(frame)
+        dropped = len(frame) - int(keep.sum())
+        self.dropped += dropped
+        return frame[keep] if dropped else frame
+
+    def filter_frame(self, df: pd.DataFrame, block_rows: int = DEFAULT_BLOCK_ROWS) -> pd.DataFrame:
+        """Удаляет повторы из уже загруженного DataFrame, обрабатывая его блоками.
+
+        Args:
+            df: Загруженные данные
+            block_rows: Количество строк в блоке
+
+        Returns:
+            pd.DataFrame: Данные без повторов с последовательным индексом
+        """
+        dropped_before = self.dropped
+        blocks = [self.filter(df.iloc[start:start + block_rows]) for start in range(0, len(df), block_rows)]
+        if self.dropped == dropped_before:
+            return df
+        return pd.concat(blocks).reset_index(drop=True)
+
+    def report(self) -> str:
+        """Возвращает строку с итогами для вывода пользователю."""
+        return (f"Дубликатов удалено: {self.dropped:,} из {self.rows_seen:,} строк, "
+                f"множество хэшей: {self.memory_bytes / 2 ** 20:.1f} МБ")
@@ -0,0 +1,141 @@
+"""Модуль чтения и записи XLSX с постоянным расходом памяти.
+
+`pd.read_excel` и `to_excel(engine="openpyxl")` держат в памяти всю книгу
+в виде объектов ячеек. Здесь чтение идет через итератор строк книги,
+открытой в режиме `read_only`, а запись — через книгу `write_only`,
+которая сбрасывает строки на диск по мере добавления.
+
+Функции:
+    list_sheets: Возвращает имена листов книги.
+    iter_excel_chunks: Читает лист блоками DataFrame.
+    read_excel_streaming: Читает лист целиком через потоковый итератор.
+    write_excel_rows: Записывает блоки DataFrame в книгу `write_only`.
+"""
+
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 50_000
+EXCEL_MAX_ROWS = 1_048_576
+
+
+def list_sheets(file_path: Path) -> List[str]:
+    """Возвращает имена листов, не загружая содержимое книги."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def _header_names(row) -> List[str]:
+    """Строит имена столбцов из строки заголовка, заполняя пустые как pandas."""
+    names = []
+    for number, value in enumerate(row):
+        name = str(value) if value is not None else f"Unnamed: {number}"
+        names.append(name)
+    return names
+
+
+def iter_excel_chunks(file_path: Path, sheet: Optional[str] = None,
+                      max_rows: Optional[int] = None,
+                      chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterable[pd.DataFrame]:
+    """Читает лист книги блоками через потоковый итератор строк.
+
+    Args:
+        file_path: Путь к файлу .xlsx
+        sheet: Имя листа (None — первый лист)
+        max_rows: Максимальное количество строк данных (None — все)
+        chunk_rows: Количество строк в блоке
+
+    Yields:
+        pd.DataFrame: Очередной блок строк
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _header_names(header)
+        width = len(columns)
+
+        block, read = [], 0
+        for row in rows:
+            if max_rows is not None and read >= max_rows:
+                break
+            block.append(row[:width] if len(row) >= width else row + (None,) * (width - len(row)))
+            read += 1
+            if len(block) == chunk_rows:
+                yield pd.DataFrame.from_records(block, columns=columns)
+                block = []
+        if block or read == 0:
+            yield pd.DataFrame.from_records(block, columns=columns)
+    finally:
+        workbook.close()
+
+
+def read_excel_streaming(file_path: Path, sheet: Optional[str] = None,
+                         max_rows: Optional[int] = None) -> pd.DataFrame:
+    """Читает лист книги через потоковый итератор строк.
+
+    Args:
+        file_path: Путь к файлу .xlsx
+        sheet: Имя листа (None — первый лист)
+        max_rows: Максимальное количество строк данных (None — все)
+
+    Returns:
+        pd.DataFrame: Данные листа с типами, выведенными по значениям
+    """
+    chunks = list(iter_excel_chunks(file_path, sheet=sheet, max_rows=max_rows))
+    if not chunks:
+        return pd.DataFrame()
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    return df.infer_objects()
+
+
+def _excel_values(block: pd.DataFrame) -> Iterable[tuple]:
+    """Преобразует блок в кортежи значений, понятных openpyxl (пропуски — None)."""
+    values = block.astype(object)
+    values = values.where(block.notna().to_numpy(), None)
+    for row in values.itertuples(index=False, name=None):
+        yield tuple(value.item() if isinstance(value, np.generic) else value for value in row)
+
+
+def write_excel_rows(blocks: Iterable[pd.DataFrame], columns: List[str], file_path: Path,
+                     sheet_name: str = "Sheet1", on_block=None):
+    """Записывает блоки строк в книгу `write_only` с постоянным расходом памяти.
+
+    Args:
+        blocks: Блоки DataFrame с одинаковыми столбцами
+        columns: Заголовок листа
+        file_path: Путь к итоговому файлу .xlsx
+        sheet_name: Имя листа
+        on_block: Функция, вызываемая с количеством строк после записи каждого блока
+
+    Raises:
+        ValueError: Если строк больше, чем допускает формат XLSX
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    worksheet.append([str(column) for column in columns])
+    written = 0
+    for block in blocks:
+        written += len(block)
+        if written >= EXCEL_MAX_ROWS:
+            raise ValueError(f"XLSX вмещает не более {EXCEL_MAX_ROWS - 1} строк данных")
+        for row in _excel_values(block):
+            worksheet.append(row)
+        if on_block is not None:
+            on_block(len(block))
+    workbook.save(file_path)
@@ -0,0 +1,272 @@
+"""Модуль фонового потокового экспорта.
+
+DataFrame записывается блоками строк в отдельном потоке, поэтому меню
+возвращается сразу после запуска экспорта. CSV сжимается на лету
+(gzip, bz2, xz, zstd), Parquet и Feather пишутся по группе строк на блок,
+XLSX — через книгу openpyxl в режиме `write_only`, SQLite — пакетными
+вставками в таблицу с именем файла, секционированный Parquet — каталогами
+`столбец=значение`, которые пишутся параллельно.
+Данные сначала пишутся во временный файл, который по завершении атомарно
+переименовывается в итоговый, так что недописанный файл не появляется
+под итоговым именем. База SQLite может уже содержать другие таблицы, поэтому
+пишется на месте, а атомарность обеспечивает одна транзакция.
+
+Классы:
+    BackgroundExport: Экспорт одного DataFrame в фоновом потоке.
+
+Функции:
+    split_format: Разбирает формат вида `csv.gz` на формат и сжатие.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import pandas as pd
+
+DEFAULT_BLOCK_ROWS = 100_000
+
+COMPRESSIONS = {
+    "gz": "gzip",
+    "bz2": "bz2",
+    "xz": "xz",
+    "zst": "zstd",
+}
+STREAMING_FORMATS = ("csv", "parquet", "feather", "xlsx", "sqlite", "partitioned")
+
+
+def split_format(file_format: str) -> Tuple[str, Optional[str]]:
+    """Разбирает формат экспорта на базовый формат и сжатие.
+
+    Args:
+        file_format: Формат вида `csv`, `csv.gz`, `csv.zst`, `parquet`
+
+    Returns:
+        Tuple[str, Optional[str]]: Базовый формат и имя сжатия (None — без сжатия)
+
+    Raises:
+        ValueError: Если указано неизвестное сжатие
+    """
+    base, _, suffix = file_format.partition(".")
+    if not suffix:
+        return base, None
+    if suffix not in COMPRESSIONS:
+        raise ValueError(f"Неподдерживаемое сжатие: {suffix}")
+    return base, COMPRESSIONS[suffix]
+
+
+def _open_compressed(path: Path, compression: Optional[str]):
+    """Открывает бинарный поток записи с заданным сжатием."""
+    if compression is None:
+        return open(path, "wb")
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "bz2":
+        return bz2.open(path, "wb")
+    if compression == "xz":
+        return lzma.open(path, "wb", preset=2)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("Для сжатия zstd требуется zstandard: pip install zstandard") from e
+        return zstandard.ZstdCompressor(level=6, threads=-1).stream_writer(open(path, "wb"), closefd=True)
+    raise ValueError(f"Неподдерживаемое сжатие: {compression}")
+
+
+class BackgroundExport:
+    """Экспорт DataFrame блоками строк в фоновом потоке.
+
+    Attributes:
+        df: Экспортируемые данные (DataFrame или `LazyDataset` для CSV/XLSX/Parquet/Feather)
+        export_path: Путь к итоговому файлу
+        file_format: Базовый формат (`csv`, `parquet`, `feather`, `xlsx`, `sqlite`, `partitioned`)
+        compression: Сжатие для CSV (None — без сжатия)
+        table: Таблица для формата `sqlite` (по умолчанию — имя файла без расширения)
+        partition_by: Столбцы секционирования для формата `partitioned`
+        rows_written: Количество уже записанных строк
+        error: Исключение, прервавшее экспорт (None, если ошибок не было)
+
+    Example:
+        >>> export = BackgroundExport(df, Path("out.csv.gz"), "csv", "gzip").start()
+        >>> export.join()
+    """
+
+    def __init__(self, df: pd.DataFrame, export_path: Path, file_format: str,
+                 compression: Optional[str] = None, block_rows: int = DEFAULT_BLOCK_ROWS,
+                 on_finish=None, table: Optional[str] = None, partition_by: Sequence[str] = ()):
+        """Подготавливает экспорт.
+
+        Args:
+            df: Экспортируемые данные
+            export_path: Путь к итоговому файлу
+            file_format: Базовый формат из `STREAMING_FORMATS`
+            compression: Сжатие для CSV
+            block_rows: Количество строк в блоке
+            on_finish: Функция, вызываемая с этим объектом по завершении экспорта
+            table: Таблица для формата `sqlite`
+            partition_by: Столбцы секционирования для формата `partitioned`
+        """
+        if file_format not in STREAMING_FORMATS:
+            raise ValueError(f"Неподдерживаемый формат потокового экспорта: {file_format}")
+        if file_format == "partitioned" and not partition_by:
+            raise ValueError("Для секционированного экспорта нужны столбцы секционирования")
+        if file_format in ("sqlite", "partitioned") and not isinstance(df, pd.DataFrame):
+            # Данные вне памяти (LazyDataset) пишутся только блоками строк через iloc
+            raise ValueError(f"Формат {file_format} недоступен для данных вне памяти")
+        self.df = df
+        self.export_path = Path(export_path)
+        self.file_format = file_format
+        self.compression = compression
+        self.block_rows = block_rows
+        self.on_finish = on_finish
+        self.table = table or self.export_path.name.split(".")[0]
+        self.partition_by = list(partition_by)
+        self.rows_written = 0
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"export-{self.export_path.name}")
+
+    @property
+    def total_rows(self) -> int:
+        return len(self.df)
+
+    @property
+    def progress(self) -> float:
+        """Доля записанных строк от 0 до 1."""
+        return self.rows_written / self.total_rows if self.total_rows else 1.0
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def start(self) -> "BackgroundExport":
+        """Запускает запись в фоновом потоке и сразу возвращает управление."""
+        self.started_at = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def join(self, timeout: Optional[float] = None):
+        """Ожидает завершения экспорта."""
+        self._thread.join(timeout)
+
+    def status(self) -> str:
+        """Возвращает строку состояния для вывода пользователю."""
+        if self.error is not None:
+            return f"{self.export_path}: ошибка — {self.error}"
+        if self.done:
+            if self.export_path.is_dir():
+                size = sum(f.stat().st_size for f in self.export_path.rglob("*") if f.is_file()) / 2 ** 20
+            else:
+                size = self.export_path.stat().st_size / 2 ** 20 if self.export_path.exists() else 0
+            seconds = self.finished_at - self.started_at
+            return f"{self.export_path}: готово ({self.rows_written} строк, {size:.1f} МБ, {seconds:.1f} с)"
+        return f"{self.export_path}: {self.progress:.0%} ({self.rows_written}/{self.total_rows} строк)"
+
+    def _blocks(self):
+        for start in range(0, max(self.total_rows, 1), self.block_rows):
+            yield self.df.iloc[start:start + self.block_rows]
+
+    def _run(self):
+        tmp_path = self.export_path.with_name(f".{self.export_path.name}.part")
+        try:
+            if self.file_format == "sqlite":
+                self._write_sqlite()
+            elif self.file_format == "partitioned":
+                self._write_partitioned()
+            else:
+                if self.file_format == "csv":
+                    self._write_csv(tmp_path)
+                elif self.file_format == "xlsx":
+                    self._write_xlsx(tmp_path)
+                else:
+                    self._write_arrow(tmp_path)
+                os.replace(tmp_path, self.export_path)
+        except Exception as e:
+            self.error = e
+            tmp_path.unlink(missing_ok=True)
+        finally:
+            self.finished_at = time.perf_counter()
+            if self.on_finish is not None:
+                self.on_finish(self)
+
+    def _write_csv(self, tmp_path: Path):
+        with _open_compressed(tmp_path, self.compression) as raw:
+            with io.TextIOWrapper(raw, encoding="utf-8", newline="") as text:
+                for number, block in enumerate(self._blocks()):
+                    block.to_csv(text, index=False, header=number == 0)
+                    self.rows_written += len(block)
+
+    def _write_xlsx(self, tmp_path: Path):
+        from data_excel import write_excel_rows
+
+        def count(rows):
+            self.rows_written += rows
+
+        write_excel_rows(self._blocks(), list(self.df.columns), tmp_path, on_block=count)
+
+    def _write_sqlite(self):
+        from data_sql import write_sql_table
+
+        def count(rows):
+            self.rows_written += rows
+
+        write_sql_table(self.df, self.export_path, self.table, batch_rows=self.block_rows, on_batch=count)
+
+    def _write_partitioned(self):
+        from data_partitions import write_partitioned
+
+        def count(rows):
+            # Секции пишутся из нескольких потоков
+            with self._lock:
+                self.rows_written += rows
+
+        write_partitioned(self.df, self.export_path, self.partition_by, on_partition=count)
+
+    def _arrow_schema(self):
+        """Схема Arrow, общая для всех блоков.
+
+        По первому блоку столбец `object`, пустой в этом блоке, получает тип
+        `null`, и блоки со значениями в нем уже не записать. Тип такого
+        столбца определяется по первым непустым значениям во всех данных.
+        """
+        import pyarrow as pa
+
+        schema = pa.Schema.from_pandas(self.df.head(self.block_rows), preserve_index=False)
+        if not isinstance(self.df, pd.DataFrame):
+            # Части данных вне памяти уже записаны в Parquet с явными типами
+            return schema
+        for number, field in enumerate(schema):
+            if not pa.types.is_null(field.type):
+                continue
+            values = self.df.iloc[:, number]
+            present = values.notna().to_numpy()
+            if present.any():
+                start = int(present.argmax())
+                sample = values.iloc[start:start + self.block_rows].dropna()
+                schema = schema.set(number, field.with_type(pa.array(sample, from_pandas=True).type))
+        return schema
+
+    def _write_arrow(self, tmp_path: Path):
+        import pyarrow as pa
+
+        schema = self._arrow_schema()
+        if self.file_format == "parquet":
+            import pyarrow.parquet as pq
+            writer = pq.ParquetWriter(tmp_path, schema, compression="zstd")
+        else:
+            options = pa.ipc.IpcWriteOptions(compression="lz4")
+            writer = pa.ipc.new_file(str(tmp_path), schema, options=options)
+
+        with writer:
+            for block in self._blocks():
+                writer.write_table(pa.Table.from_pandas(block, schema=schema, preserve_index=False))
+                self.rows_written += len(block)
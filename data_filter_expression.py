@@ -0,0 +1,458 @@
+"""Модуль выражений фильтра для просмотра таблицы.
+
+Вместо нескольких раундов фильтрации по одному столбцу условие задается
+одним выражением:
+
+    Age > 60 and Cancer_Type in (Lung, Breast) and Gene ~ "TP5"
+
+Выражение разбирается один раз в дерево условий и вычисляется векторно —
+булевыми масками NumPy по столбцам. Условия внутри `and` проверяются в
+порядке оцененной избирательности (доля подходящих строк на равномерной
+выборке): сначала самое строгое, а каждое следующее — только на строках,
+прошедших предыдущие. Внутри `or` каждое следующее условие проверяется
+только на строках, еще не попавших в результат.
+
+Операторы: `=` (`==`), `!=`, `>`, `>=`, `<`, `<=`, `between ... and ...`
+(границы включаются), `~` (содержит подстроку без учета регистра), `!~`,
+`in (...)`, `not in (...)`; связки `and`, `or`, `not` и скобки. Текст
+сравнивается без учета регистра. Значения с пробелами и спецсимволами
+берутся в кавычки, имена столбцов с пробелами — в обратные кавычки.
+Пропуски не проходят ни одно условие сравнения, в том числе под `not`: строка
+с пропуском в любом из столбцов отрицаемого условия не выбирается.
+
+С индексом текстовые условия проверяются по словарю значений столбца, а
+узкие диапазоны числовых — бинарным поиском в отсортированном индексе
+(`TableIndex.range_rows`) за O(log n + k) вместо сравнения всех строк.
+
+Классы:
+    FilterExpression: Разобранное выражение фильтра.
+
+Функции:
+    parse_filter: Разбирает текст выражения.
+"""
+
+import operator
+import re
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_table_index import _REGEX_CHARS, index_for
+
+SAMPLE_ROWS = 2_000
+INDEX_MIN_SHARE = 0.125
+# Доля строк, выше которой маска диапазона быстрее получается сравнением всего столбца
+RANGE_MAX_SHARE = 0.125
+
+_TOKENS = re.compile(r"""
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | `(?P<name>[^`]+)`
+      | (?P<op>==|!=|>=|<=|!~|=|>|<|~)
+      | (?P<punct>[(),])
+      | (?P<word>[^\s(),=<>!~"'`]+)
+    )""", re.VERBOSE)
+_KEYWORDS = {"and", "or", "not", "in", "between"}
+_ORDER_OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+
+class _Token:
+    def __init__(self, kind: str, text: str, position: int):
+        self.kind = kind
+        self.text = text
+        self.position = position
+
+    def is_keyword(self, word: str) -> bool:
+        return self.kind == "word" and self.text.lower() == word
+
+
+def _tokenize(text: str) -> List[_Token]:
+    tokens, position = [], 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKENS.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Непонятный символ в позиции {position + 1}: {text[position:position + 10]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "string":
+            value = re.sub(r"\\(.)", r"\1", value[1:-1])
+        tokens.append(_Token(kind, value, match.start(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Condition:
+    """Сравнение одного столбца со значением или списком значений."""
+
+    def __init__(self, column: str, op: str, values: List[str]):
+        self.column = column
+        self.op = op
+        self.values = values
+
+    @property
+    def columns(self) -> List[str]:
+        return [self.column]
+
+    def __repr__(self):
+        if self.op == "between":
+            return f"{self.column} between {self.values[0]} and {self.values[1]}"
+        return f"{self.column} {self.op} {self.values if self.op.endswith('in') else self.values[0]}"
+
+    def _literal(self, series: pd.Series, value: str):
+        """Приводит значение из выражения к типу столбца."""
+        if pd.api.types.is_bool_dtype(series.dtype):
+            lowered = value.lower()
+            if lowered not in ("true", "false", "1", "0"):
+                raise ValueError(f"Столбец {self.column} логический, а значение — {value!r}")
+            return lowered in ("true", "1")
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            try:
+                return float(value)
+            except ValueError:
+                raise ValueError(f"Столбец {self.column} числовой, а значение — {value!r}") from None
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            stamp = pd.Timestamp(value)
+            tz = getattr(series.dtype, "tz", None)
+            if tz is not None and stamp.tz is None:
+                stamp = stamp.tz_localize(tz)
+            return stamp
+        return None
+
+    def _is_text(self, series: pd.Series) -> bool:
+        return self._literal(series, self.values[0]) is None
+
+    def evaluate(self, frame: pd.DataFrame, rows: Optional[np.ndarray], use_index: bool) -> np.ndarray:
+        """Маска для строк `rows` (None — для всех строк `frame`)."""
+        if self.column not in frame.columns:
+            raise KeyError(f"Нет столбца: {self.column}")
+        series = frame[self.column]
+        # Подстрока ищется в строковом представлении любого столбца, как в прежнем фильтре
+        text = self.op in ("~", "!~") or self._is_text(series)
+        if use_index and (rows is None or len(rows) >= INDEX_MIN_SHARE * len(frame)):
+            # Индекс дает маску сразу для всего столбца и переиспользуется следующими запросами
+            index = index_for(frame)
+            mask = self._indexed(index) if text else self._ranged(index, series)
+            if mask is not None:
+                return mask if rows is None else mask[rows]
+
+        if rows is not None:
+            series = series.iloc[rows]
+        present = series.notna().to_numpy()
+        if text:
+            return self._text_mask(series) & present
+        literals = [self._literal(series, value) for value in self.values]
+        if self.op in ("in", "not in"):
+            mask = series.isin(literals).to_numpy()
+            return (~mask if self.op == "not in" else mask) & present
+        if self.op == "between":
+            result = (series >= literals[0]) & (series <= literals[1])
+        elif self.op in ("=", "!="):
+            result = series == literals[0] if self.op == "=" else series != literals[0]
+        elif self.op in _ORDER_OPS:
+            result = _ORDER_OPS[self.op](series, literals[0])
+        else:
+            raise ValueError(f"Оператор {self.op} применим только к тексту (столбец {self.column})")
+        return np.asarray(result.to_numpy(dtype=bool, na_value=False)) & present
+
+    def _ranged(self, index, series: pd.Series) -> Optional[np.ndarray]:
+        """Маска по отсортированному индексу числового столбца (None — индекс неприменим)."""
+        if self.op in ("~", "!~") or index.sorted_keys(self.column) is None:
+            return None
+        bounds = [self._literal(series, value) for value in self.values]
+        if any(np.isnan(bound) for bound in bounds):
+            return None
+        if self.op == "between":
+            ranges = [(bounds[0], bounds[1], True, True)]
+        elif self.op in ("=", "!=", "in", "not in"):
+            ranges = [(bound, bound, True, True) for bound in bounds]
+        else:
+            ranges = [{
+                ">": (bounds[0], None, False, True),
+                ">=": (bounds[0], None, True, True),
+                "<": (None, bounds[0], True, False),
+                "<=": (None, bounds[0], True, True),
+            }[self.op]]
+        found = [index.range_rows(self.column, *bounds) for bounds in ranges]
+        if sum(len(rows) for rows in found) > RANGE_MAX_SHARE * len(series):
+            return None
+        mask = np.zeros(len(series), dtype=bool)
+        for rows in found:
+            mask[rows] = True
+        if self.op in ("!=", "not in"):
+            mask = ~mask & series.notna().to_numpy()
+        return mask
+
+    def _indexed(self, index) -> np.ndarray:
+        if self.op in ("~", "!~"):
+            mask = index.contains(self.column, self.values[0])
+        elif self.op in ("=", "!=", "in", "not in"):
+            mask = np.zeros(len(index.column(self.column).codes), dtype=bool)
+            for value in self.values:
+                mask |= index.equals(self.column, value)
+        else:
+            raise ValueError(f"Оператор {self.op} применим только к числам и датам (столбец {self.column})")
+        if self.op in ("!~", "!=", "not in"):
+            present = index.column(self.column).codes < len(index.column(self.column).values)
+            mask = ~mask & present
+        return mask
+
+    def _text_mask(self, series: pd.Series) -> np.ndarray:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Условие проверяется по категориям, а строкам достается результат по кодам (-1 — пропуск)
+            hit = self._text_mask(pd.Series(series.cat.categories))
+            return np.append(hit, False)[series.cat.codes.to_numpy()]
+        strings = series.astype(str)
+        if self.op in ("~", "!~"):
+            pattern = self.values[0]
+            found = strings.str.contains(pattern, case=False, regex=bool(_REGEX_CHARS.search(pattern)))
+            mask = found.to_numpy(dtype=bool, na_value=False)
+            return ~mask if self.op == "!~" else mask
+        if self.op in _ORDER_OPS or self.op == "between":
+            raise ValueError(f"Оператор {self.op} применим только к числам и датам (столбец {self.column})")
+        lowered = strings.str.lower()
+        mask = lowered.isin([value.lower() for value in self.values]).to_numpy()
+        return ~mask if self.op in ("!=", "not in") else mask
+
+
+class _And:
+    def __init__(self, children: list):
+        self.children = children
+
+    @property
+    def columns(self) -> List[str]:
+        return [column for child in self.children for column in child.columns]
+
+
+class _Or(_And):
+    pass
+
+
+class _Not:
+    def __init__(self, child):
+        self.child = child
+
+    @property
+    def columns(self) -> List[str]:
+        return self.child.columns
+
+
+class _Parser:
+    """Разбор с рекурсивным спуском: or → and → not → условие или скобки."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def _peek(self) -> Optional[_Token]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self, expected: str) -> _Token:
+        token = self._peek()
+        if token is None:
+            raise ValueError(f"Выражение оборвалось: ожидается {expected}")
+        self.position += 1
+        return token
+
+    def _error(self, token: _Token, expected: str):
+        return ValueError(f"Позиция {token.position + 1}: ожидается {expected}, а найдено {token.text!r}")
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Пустое выражение")
+        node = self._or()
+        token = self._peek()
+        if token is not None:
+            raise self._error(token, "and, or или конец выражения")
+        return node
+
+    def _or(self):
+        children = [self._and()]
+        while self._peek() is not None and self._peek().is_keyword("or"):
+            self.position += 1
+            children.append(self._and())
+        return children[0] if len(children) == 1 else _Or(children)
+
+    def _and(self):
+        children = [self._not()]
+        while self._peek() is not None and self._peek().is_keyword("and"):
+            self.position += 1
+            children.append(self._not())
+        return children[0] if len(children) == 1 else _And(children)
+
+    def _not(self):
+        token = self._peek()
+        if token is not None and token.is_keyword("not"):
+            self.position += 1
+            return _Not(self._not())
+        if token is not None and token.kind == "punct" and token.text == "(":
+            self.position += 1
+            node = self._or()
+            closing = self._next("«)»")
+            if closing.text != ")":
+                raise self._error(closing, "«)»")
+            return node
+        return self._condition()
+
+    def _value(self) -> str:
+        token = self._next("значение")
+        if token.kind not in ("string", "word") or token.text.lower() in _KEYWORDS and token.kind == "word":
+            raise self._error(token, "значение")
+        return token.text
+
+    def _condition(self) -> _Condition:
+        token = self._next("имя столбца")
+        if token.kind not in ("name", "word", "string") or token.kind == "word" and token.text.lower() in _KEYWORDS:
+            raise self._error(token, "имя столбца")
+        column = token.text
+
+        op_token = self._next("оператор сравнения")
+        if op_token.kind == "op":
+            return _Condition(column, "=" if op_token.text == "==" else op_token.text, [self._value()])
+        if op_token.is_keyword("between"):
+            low = self._value()
+            separator = self._next("and")
+            if not separator.is_keyword("and"):
+                raise self._error(separator, "and")
+            return _Condition(column, "between", [low, self._value()])
+        op = None
+        if op_token.is_keyword("in"):
+            op = "in"
+        elif op_token.is_keyword("not") and self._peek() is not None and self._peek().is_keyword("in"):
+            self.position += 1
+            op = "not in"
+        if op is None:
+            raise self._error(op_token, "оператор сравнения после имени столбца")
+        return _Condition(column, op, self._list())
+
+    def _list(self) -> List[str]:
+        opening = self._next("«(»")
+        if opening.text != "(":
+            raise self._error(opening, "«(»")
+        values, words = [], []
+        while True:
+            token = self._next("значение или «)»")
+            if token.kind == "punct" and token.text in ",)":
+                if not words:
+                    raise self._error(token, "значение")
+                # Значения без кавычек могут состоять из нескольких слов: (Non Small Cell, Lung)
+                values.append(" ".join(words))
+                words = []
+                if token.text == ")":
+                    return values
+            elif token.kind in ("string", "word"):
+                words.append(token.text)
+            else:
+                raise self._error(token, "значение")
+
+
+class FilterExpression:
+    """Разобранное выражение фильтра.
+
+    Attributes:
+        text: Исходный текст выражения
+        columns: Столбцы, на которые ссылается выражение
+
+    Example:
+        >>> expression = parse_filter('Age > 60 and Gene ~ "TP5"')
+        >>> cohort = df[expression.mask(df)]
+    """
+
+    def __init__(self, text: str, root):
+        self.text = text
+        self._root = root
+        self.columns = list(dict.fromkeys(root.columns))
+
+    def __repr__(self):
+        return f"FilterExpression({self.text!r})"
+
+    def _selectivity(self, node, frame: pd.DataFrame, sample: np.ndarray) -> float:
+        """Оценка доли строк, проходящих условие, по выборке строк."""
+        if isinstance(node, _Condition):
+            return float(node.evaluate(frame, sample, use_index=False).mean()) if len(sample) else 1.0
+        if isinstance(node, _Not):
+            return 1.0 - self._selectivity(node.child, frame, sample)
+        shares = [self._selectivity(child, frame, sample) for child in node.children]
+        if isinstance(node, _Or):
+            return 1.0 - float(np.prod([1.0 - share for share in shares]))
+        return float(np.prod(shares))
+
+    def _evaluate(self, node, frame: pd.DataFrame, rows: Optional[np.ndarray], sample: np.ndarray,
+                  use_index: bool) -> np.ndarray:
+        """Маска для строк `rows` (None — все строки) с проверкой условий по избирательности."""
+        if isinstance(node, _Condition):
+            return node.evaluate(frame, rows, use_index)
+        if isinstance(node, _Not):
+            # Пропуск не проходит и отрицание условия: `not Age > 60` не выбирает строки без Age
+            mask = ~self._evaluate(node.child, frame, rows, sample, use_index)
+            for column in dict.fromkeys(node.child.columns):
+                series = frame[column] if rows is None else frame[column].iloc[rows]
+                mask &= series.notna().to_numpy()
+            return mask
+
+        size = len(frame) if rows is None else len(rows)
+        shares = [self._selectivity(child, frame, sample) for child in node.children]
+        conjunction = not isinstance(node, _Or)
+        # and: сначала самые строгие условия; or: сначала самые широкие
+        order = np.argsort(shares, kind="stable")
+        if not conjunction:
+            order = order[::-1]
+
+        # Номера (внутри rows) строк, которые еще нужно проверять
+        pending = None
+        result = np.zeros(size, dtype=bool) if not conjunction else None
+        for number in order:
+            subset = rows if pending is None else (pending if rows is None else rows[pending])
+            mask = self._evaluate(node.children[number], frame, subset, sample, use_index)
+            local = np.flatnonzero(mask) if pending is None else pending[mask]
+            if conjunction:
+                pending = local
+            else:
+                result[local] = True
+                pending = np.flatnonzero(~mask) if pending is None else pending[~mask]
+            if len(pending) == 0:
+                break
+        if conjunction:
+            result = np.zeros(size, dtype=bool)
+            result[pending] = True
+        return result
+
+    def mask(self, frame: pd.DataFrame, use_index: bool = False) -> np.ndarray:
+        """Вычисляет маску строк, удовлетворяющих выражению.
+
+        Args:
+            frame: Данные (все столбцы выражения должны в них быть)
+            use_index: Использовать индексы текстовых столбцов `data_table_index`;
+                имеет смысл для DataFrame, который фильтруется многократно,
+                а не для временных частей данных
+
+        Returns:
+            np.ndarray: Булева маска длиной `len(frame)`
+
+        Raises:
+            KeyError: Если столбца нет в данных
+            ValueError: Если значение не приводится к типу столбца или
+                оператор не подходит к типу столбца
+        """
+        missing = [column for column in self.columns if column not in frame.columns]
+        if missing:
+            raise KeyError(f"Нет столбцов: {', '.join(missing)}")
+        sample = np.unique(np.linspace(0, len(frame) - 1, min(SAMPLE_ROWS, len(frame))).astype(np.int64))
+        return self._evaluate(self._root, frame, None, sample, use_index)
+
+
+def parse_filter(text: str) -> FilterExpression:
+    """Разбирает текст выражения фильтра.
+
+    Args:
+        text: Выражение, например `Age > 60 and Cancer_Type in (Lung, Breast)`
+
+    Returns:
+        FilterExpression: Выражение, готовое к вычислению
+
+    Raises:
+        ValueError: Если выражение синтаксически неверно
+    """
+    return FilterExpression(text.strip(), _Parser(text).parse())
@@ -0,0 +1,213 @@
+"""Модуль группировки для просмотра таблицы.
+
+Количество, среднее, медиана, минимум, максимум и квантили числового
+столбца по группам из одного или нескольких столбцов-ключей. Ключи
+переводятся в целые коды (для `category` — готовые коды категорий, для
+остальных — `pd.factorize` с сортировкой) и сводятся в один номер группы,
+поэтому количество и среднее считаются `np.bincount` за один проход.
+Порядковые статистики берутся из перестановки строк по значению столбца,
+которую `TableIndex` уже хранит для сортировки: после устойчивой
+перестановки по номеру группы значения каждой группы идут подряд по
+возрастанию.
+
+Результаты запоминаются по версии данных, ключам, столбцу и агрегатам,
+поэтому повторный показ той же группировки не пересчитывает ее. Для
+данных вне памяти в память читаются только столбцы ключей и значения.
+
+Функции:
+    parse_aggregations: Разбирает список агрегатов.
+    group_by: Группирует строки по ключам с запоминанием результата.
+    pivot: Разворачивает второй ключ группировки в столбцы.
+"""
+
+import re
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_lazy import LazyDataset
+from data_table_index import index_for
+
+AGGREGATIONS = ("count", "mean", "median", "min", "max")
+MEMO_SIZE = 32
+_QUANTILE = re.compile(r"^q(\d{1,2}(?:\.\d+)?|100)$")
+
+_memo: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+
+
+def parse_aggregations(text: str) -> List[str]:
+    """Разбирает агрегаты через запятую: count, mean, median, min, max и квантили q25, q90, q99.5.
+
+    Raises:
+        ValueError: Если агрегат неизвестен или список пуст
+    """
+    names = list(dict.fromkeys(name.strip().lower() for name in text.split(",") if name.strip()))
+    if not names:
+        raise ValueError("Не указаны агрегаты")
+    for name in names:
+        if name not in AGGREGATIONS and not _QUANTILE.match(name):
+            raise ValueError(f"Неизвестный агрегат {name!r}: доступны {', '.join(AGGREGATIONS)}, q25, q90 и т. п.")
+    return names
+
+
+def _key_codes(series: pd.Series) -> Tuple[np.ndarray, int]:
+    """Коды значений ключа в порядке сортировки (-1 — пропуск) и число значений."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype(np.int64), len(series.cat.categories)
+    try:
+        codes, uniques = pd.factorize(series, sort=True)
+    except TypeError:
+        # Значения разных типов не сравниваются: они упорядочиваются по имени типа, затем по тексту
+        codes, uniques = pd.factorize(series, sort=False)
+        order = sorted(range(len(uniques)), key=lambda number: (type(uniques[number]).__name__, str(uniques[number])))
+        remap = np.empty(len(uniques), dtype=np.int64)
+        remap[order] = np.arange(len(uniques))
+        codes = np.where(codes < 0, -1, remap[codes])
+    return codes.astype(np.int64), len(uniques)
+
+
+def _group_ids(frame: pd.DataFrame, keys: Sequence[str]) -> Tuple[np.ndarray, int]:
+    """Номера групп строк по порядку значений ключей (-1 — пропуск в ключе) и число групп."""
+    group = np.zeros(len(frame), dtype=np.int64)
+    size = 1
+    for key in keys:
+        codes, count = _key_codes(frame[key])
+        group = np.where((group < 0) | (codes < 0), -1, group * count + codes)
+        size *= count
+        if size > len(frame):
+            # Составной код перенумеровывается, пока произведение числа значений не переполнило int64
+            valid = group >= 0
+            group[valid], uniques = pd.factorize(group[valid], sort=True)
+            size = len(uniques)
+    # Остаются только встретившиеся сочетания ключей, пронумерованные подряд
+    valid = group >= 0
+    present = np.bincount(group[valid], minlength=size) > 0
+    remap = np.cumsum(present) - 1
+    group[valid] = remap[group[valid]]
+    return group, int(present.sum())
+
+
+def _stable_order(group: np.ndarray, groups: int) -> np.ndarray:
+    """Устойчивая перестановка по номеру группы.
+
+    При числе групп до 65 536 номера приводятся к `uint16`, и NumPy
+    сортирует их поразрядно за O(n).
+    """
+    return np.argsort(group.astype(np.uint16) if groups <= 1 << 16 else group, kind="stable")
+
+
+def _quantiles(ordered: np.ndarray, starts: np.ndarray, counts: np.ndarray, share: float) -> np.ndarray:
+    """Квантиль каждой группы с линейной интерполяцией, как `Series.quantile`."""
+    position = share * np.maximum(counts - 1, 0)
+    low = np.floor(position).astype(np.int64)
+    high = np.minimum(low + 1, np.maximum(counts - 1, 0))
+    empty = counts == 0
+    last = max(len(ordered) - 1, 0)
+    below = ordered[np.minimum(starts + low, last)] if len(ordered) else np.zeros(len(counts))
+    above = ordered[np.minimum(starts + high, last)] if len(ordered) else np.zeros(len(counts))
+    result = below + (above - below) * (position - low)
+    return np.where(empty, np.nan, result)
+
+
+def _compute(frame: pd.DataFrame, keys: List[str], column: Optional[str], aggregations: List[str]) -> pd.DataFrame:
+    group, groups = _group_ids(frame, keys)
+    rows = np.flatnonzero(group >= 0)
+    # Первая строка каждой группы дает значения ключей результата
+    by_group = rows[_stable_order(group[rows], groups)]
+    sizes = np.bincount(group[rows], minlength=groups)
+    first = by_group[np.cumsum(sizes) - sizes]
+    labels = [frame[key].iloc[first].to_numpy() for key in keys]
+    index = pd.Index(labels[0], name=keys[0]) if len(keys) == 1 else pd.MultiIndex.from_arrays(labels, names=keys)
+
+    if column is None:
+        return pd.DataFrame({"count": sizes}, index=index)
+    series = frame[column]
+    if not pd.api.types.is_numeric_dtype(series.dtype):
+        raise ValueError(f"Столбец {column} не числовой")
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = (group >= 0) & ~np.isnan(values)
+    counts = np.bincount(group[valid], minlength=groups)
+    result = {}
+    ordered = starts = None
+    for name in aggregations:
+        if name == "count":
+            result[name] = counts
+            continue
+        if name == "mean":
+            sums = np.bincount(group[valid], weights=values[valid], minlength=groups)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                result[name] = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+            continue
+        if ordered is None:
+            # Перестановка по значению общая с сортировкой в фильтре; пропуски отбрасываются
+            permutation = index_for(frame).order(column, ascending=True)
+            permutation = permutation[valid[permutation]]
+            permutation = permutation[_stable_order(group[permutation], groups)]
+            ordered = values[permutation]
+            starts = np.cumsum(counts) - counts
+        share = {"min": 0.0, "max": 1.0, "median": 0.5}.get(name)
+        if share is None:
+            share = float(_QUANTILE.match(name).group(1)) / 100
+        result[name] = _quantiles(ordered, starts, counts, share)
+    return pd.DataFrame(result, index=index)
+
+
+def group_by(df, keys: Sequence[str], column: Optional[str] = None,
+             aggregations: Sequence[str] = ("count",)) -> pd.DataFrame:
+    """Группирует строки по ключам и считает агрегаты столбца.
+
+    Строки с пропуском в любом из ключей не попадают ни в одну группу,
+    пропуски в столбце значений не учитываются. Группы упорядочены по
+    значениям ключей; ключ со значениями разных типов — по имени типа,
+    затем по тексту значения.
+
+    Args:
+        df: DataFrame или датасет вне памяти
+        keys: Столбцы группировки
+        column: Числовой столбец для агрегатов (None — только количество строк)
+        aggregations: Агрегаты из `parse_aggregations`
+
+    Returns:
+        pd.DataFrame: Индекс — значения ключей; столбец на каждый агрегат
+
+    Raises:
+        KeyError: Если столбца нет в данных
+        ValueError: Если ключи не заданы или столбец значений не числовой
+    """
+    keys = list(keys)
+    if not keys:
+        raise ValueError("Не указаны столбцы группировки")
+    aggregations = ["count"] if column is None else list(aggregations)
+    missing = [name for name in keys + ([column] if column else []) if name not in df.columns]
+    if missing:
+        raise KeyError(f"Нет столбцов: {', '.join(missing)}")
+
+    memo_key = (index_for(df).version, tuple(keys), column, tuple(aggregations))
+    result = _memo.get(memo_key)
+    if result is not None:
+        _memo.move_to_end(memo_key)
+        return result
+    frame = df
+    if isinstance(df, LazyDataset):
+        frame = df[list(dict.fromkeys(keys + ([column] if column else [])))].to_pandas()
+    result = _compute(frame, keys, column, aggregations)
+    _memo[memo_key] = result
+    if len(_memo) > MEMO_SIZE:
+        _memo.popitem(last=False)
+    return result
+
+
+def pivot(result: pd.DataFrame) -> pd.DataFrame:
+    """Разворачивает последний ключ группировки в столбцы (сводная таблица).
+
+    Отсутствующие сочетания ключей дают 0 в количестве и NaN в остальных
+    агрегатах. При нескольких агрегатах столбцы называются «агрегат значение».
+    """
+    table = result.unstack(level=-1)
+    if "count" in result.columns:
+        table["count"] = table["count"].fillna(0).astype(np.int64)
+    single = len(result.columns) == 1
+    table.columns = [str(value) if single else f"{name} {value}" for name, value in table.columns]
+    return table
@@ -2,8 +2,30 @@
 
 Поддерживает:
 - Локальный импорт из CSV/XLSX
-- Импорт с Kaggle API
-- Экспорт в CSV/XLSX
+- Автоопределение кодировки, разделителя, десятичного знака, заголовка
+  и столбцов с датами CSV по образцу байт с выбором движка разбора
+- Потоковая распаковка сжатых CSV (.csv.gz/.bz2/.xz/.zst) и чтение файлов
+  из архивов zip/tar с выбором членов архива, без распаковки на диск
+- Потоковый импорт CSV чанками с планом типов
+- Работа с данными больше оперативной памяти: CSV/Parquet открывается как
+  `LazyDataset`, строки читаются с диска по частям
+- Инкрементальная дозагрузка строк, дописанных в CSV после прошлого импорта
+- Потоковое чтение XLSX с выбором листа и ограничением числа строк
+- Импорт из Parquet/Feather с выбором столбцов и групп строк
+- Импорт среза таблицы SQLite: столбцы, условия и LIMIT выполняются в SQL
+- Импорт секционированного Parquet (`столбец=значение/part-*.parquet`) с чтением
+  только секций, подходящих под фильтр
+- Перевод текстовых столбцов в `category` или строки Arrow после импорта
+  с выводом памяти до и после
+- Удаление повторяющихся строк (целиком или по ключевым столбцам) по 64-битным
+  хэшам, при потоковом импорте — по мере чтения чанков
+- Параллельный импорт набора файлов по каталогу или glob-шаблону
+- Дисковый кэш разобранных локальных файлов
+- Импорт с Kaggle API с постоянным версионным кэшем и выбором файлов
+- Экспорт в CSV/XLSX/Parquet/Feather/SQLite и в секционированный Parquet
+  с параллельной записью секций
+- Фоновый потоковый экспорт со сжатием CSV (gzip/bz2/xz/zstd) и XLSX
+  с постоянным расходом памяти
 
 Классы:
     DataImporterExporter: Основной класс для работы с импортом/экспортом данных.
@@ -12,10 +34,24 @@
 import pandas as pd
 from pathlib import Path
 from typing import Tuple
-from kaggle.api.kaggle_api_extended import KaggleApi
-import shutil
 
-shutil.rmtree("temp", ignore_errors=True)
+from data_cache import DatasetCache
+from data_archives import ArchiveMember, inner_suffix, is_archive, list_members, read_member
+from data_kaggle import KaggleDatasetCache, create_client, data_file_label, list_data_files, parse_dataset_ref
+from data_multi_import import SOURCE_COLUMN, expand_sources, import_many, is_multi_source
+from data_columnar import COLUMNAR_SUFFIXES, PARQUET_SUFFIXES, describe_columnar, is_columnar, read_columnar
+from data_incremental import TailTracker
+from data_lazy import LazyDataset, open_lazy
+from data_dedup import RowDeduplicator
+from data_excel import list_sheets, read_excel_streaming
+from data_sniffer import read_csv_auto, sniff_csv
+from data_partitions import is_partitioned_dataset, list_partitions, parse_partition_filter, read_partitioned
+from data_strings import compact_strings
+from data_sql import SQLITE_SUFFIXES, list_tables, parse_filters, read_sql_table, table_columns
+from data_export_writer import COMPRESSIONS, BackgroundExport, split_format
+
+LOCAL_SUFFIXES = ('.csv', '.xlsx', '.xls') + COLUMNAR_SUFFIXES + SQLITE_SUFFIXES
+EXPORT_FORMATS = ('csv', 'xlsx', 'parquet', 'feather', 'sqlite', 'partitioned') + tuple(f"csv.{suffix}" for suffix in COMPRESSIONS)
 
 
 class DataImporterExporter:
@@ -24,17 +60,26 @@ class DataImporterExporter:
     Attributes:
         localizer: Объект для локализации текстов
         main_app: Ссылка на главное приложение для доступа к данным
+        cache: Дисковый кэш разобранных датасетов
+        kaggle_cache: Версионный кэш датасетов Kaggle
+        exports: Запущенные в этой сессии фоновые экспорты
+        tails: Отслеживание дописываемых CSV-файлов
     """
 
-    def __init__(self, localizer, main_app):
+    def __init__(self, localizer, main_app, kaggle_client=None):
         """Инициализирует импортер/экспортер.
 
         Args:
             localizer: Объект локализации для получения текстов интерфейса
             main_app: Ссылка на главное приложение
+            kaggle_client: Источник датасетов Kaggle (по умолчанию — `create_client()`)
         """
         self.localizer = localizer
         self.main_app = main_app
+        self.cache = DatasetCache()
+        self.kaggle_cache = KaggleDatasetCache(kaggle_client or create_client())
+        self.exports = []
+        self.tails = TailTracker()
 
     def show_menu(self) -> Tuple[bool, pd.DataFrame]:
         """Отображает меню импорта/экспорта и обрабатывает выбор пользователя.
@@ -48,33 +93,57 @@ class DataImporterExporter:
             1. Импорт с локального диска
             2. Импорт с Kaggle
             3. Экспорт данных
-            4. Вернуться
+            4. Статистика кэша
+            5. Состояние фоновых экспортов
+            6. Вернуться
         """
         print(f"\n{self.localizer.get_string(20)}")
         print("1. Импорт с локального диска")
         print("2. Импорт с Kaggle")
         print("3. Экспорт данных")
-        print("4. Вернуться")
+        print("4. Статистика кэша")
+        print("5. Состояние фоновых экспортов")
+        print("6. Вернуться")
 
         try:
             choice = int(input("Выберите действие: "))
             if choice == 1:
-                return self._local_import()
+                return self._compact(*self._local_import())
             elif choice == 2:
-                return self._kaggle_import()
+                return self._compact(*self._kaggle_import())
             elif choice == 3:
                 return self._export_data()
+            elif choice == 4:
+                self._show_cache_stats()
+            elif choice == 5:
+                self._show_exports()
             return False, pd.DataFrame()
         except ValueError:
             print(self.localizer.get_string(9))
             return False, pd.DataFrame()
 
+    def _compact(self, success: bool, df: pd.DataFrame) -> Tuple[bool, pd.DataFrame]:
+        """Переводит текстовые столбцы импортированных данных в компактные типы."""
+        if success and not isinstance(df, LazyDataset):
+            compaction = compact_strings(df)
+            if compaction is not None and compaction.converted:
+                print(compaction.report())
+        return success, df
+
     def _local_import(self) -> Tuple[bool, pd.DataFrame]:
         """Загружает данные из локального файла.
 
         Supported Formats:
-            - CSV (.csv)
-            - Excel (.xlsx, .xls)
+            - CSV (.csv), в том числе потоковый импорт чанками и сжатый CSV
+              (.csv.gz, .csv.bz2, .csv.xz, .csv.zst)
+            - Архивы (.zip, .tar, .tar.gz, .tar.bz2, .tar.xz) с выбором файлов
+            - Excel (.xlsx, .xls); .xlsx читается потоково с выбором листа
+            - Parquet (.parquet, .pq) и Feather (.feather, .arrow, .ipc)
+              с выбором столбцов и групп строк
+            - SQLite (.db, .sqlite, .sqlite3): выбор таблицы, столбцов, условий и LIMIT
+            - Каталог секционированного Parquet (`столбец=значение/...`):
+              читаются только секции, подходящие под фильтр
+            - Каталог или glob-шаблон: все подходящие файлы читаются параллельно
 
         Returns:
             Tuple[bool, pd.DataFrame]:
@@ -85,23 +154,48 @@ class DataImporterExporter:
             KeyboardInterrupt: При отмене операции пользователем
         """
         try:
-            path = input(f"{self.localizer.get_string(21)} (с именем файла): ").strip()
+            path = input(f"{self.localizer.get_string(21)} (с именем файла, каталог или шаблон *.csv): ").strip()
+            if is_partitioned_dataset(path):
+                return self._partitioned_import(Path(path))
+            if is_multi_source(path):
+                return self._multi_import(path)
             file_path = Path(path)
 
             if not file_path.exists():
                 print(self.localizer.get_string(22).format(file_path))
                 return False, pd.DataFrame()
 
-            try:
-                if file_path.suffix == '.csv':
-                    df = pd.read_csv(file_path)
-                elif file_path.suffix in ('.xlsx', '.xls'):
-                    df = pd.read_excel(file_path)
-                else:
-                    print(self.localizer.get_string(23))
-                    return False, pd.DataFrame()
+            if is_archive(file_path):
+                return self._archive_import(file_path)
+            suffix = inner_suffix(file_path)
+            if suffix not in LOCAL_SUFFIXES or (suffix != file_path.suffix.lower() and suffix != '.csv'):
+                print(self.localizer.get_string(23))
+                return False, pd.DataFrame()
 
-                return True, df
+            if file_path.suffix.lower() in ('.csv',) + PARQUET_SUFFIXES:
+                if input("Работать с данными вне памяти (файл больше ОЗУ)? (y/N): ").strip().lower() == "y":
+                    return self._lazy_import(file_path)
+
+            options = {}
+            if file_path.suffix.lower() == '.csv':
+                state = self.tails.state_for(file_path)
+                if state is not None and state.tracks(getattr(self.main_app, "df", None)):
+                    if input("Файл уже загружен. Дочитать только новые строки? (Y/n): ").strip().lower() != "n":
+                        return self._tail_import(file_path)
+                if input("Отслеживать дозапись в файл (инкрементальный режим)? (y/N): ").strip().lower() == "y":
+                    return self._tail_import(file_path)
+            if suffix == '.csv':
+                options["streaming"] = input("Потоковый импорт с планом типов? (y/N): ").strip().lower() == "y"
+
+            try:
+                if is_columnar(file_path):
+                    options.update(self._ask_projection(file_path))
+                elif file_path.suffix.lower() in SQLITE_SUFFIXES:
+                    options.update(self._ask_sql_query(file_path))
+                elif file_path.suffix.lower() == '.xlsx':
+                    options.update(self._ask_sheet(file_path))
+                options["deduplicator"] = self._ask_dedup()
+                return True, self.load_local_file(file_path, **options)
             except Exception as e:
                 print(f"{self.localizer.get_string(25)}: {str(e)}")
                 return False, pd.DataFrame()
@@ -109,14 +203,386 @@ class DataImporterExporter:
             print("\nОперация отменена.")
             return False, pd.DataFrame()
 
+    def _lazy_import(self, file_path: Path) -> Tuple[bool, LazyDataset]:
+        """Открывает файл как датасет на диске без загрузки строк в память.
+
+        CSV при первом открытии перекладывается в части Parquet по чанкам.
+
+        Args:
+            file_path: Путь к CSV или Parquet
+
+        Returns:
+            Tuple[bool, LazyDataset]:
+                - bool: Успешность операции
+                - LazyDataset: Датасет на диске (пустой DataFrame при ошибке)
+        """
+        try:
+            read_options = {}
+            if file_path.suffix.lower() == '.csv':
+                dialect = sniff_csv(file_path)
+                print(dialect.describe(chunked=True))
+                read_options = dialect.read_options(chunked=True)
+            dataset = open_lazy(file_path, **read_options)
+            print(f"Данные вне памяти: строк {len(dataset)}, частей {dataset.part_count}, "
+                  f"на диске {dataset.disk_bytes / 2 ** 20:.1f} МБ")
+            return True, dataset
+        except Exception as e:
+            print(f"{self.localizer.get_string(25)}: {str(e)}")
+            return False, pd.DataFrame()
+
+    def _multi_import(self, path: str) -> Tuple[bool, pd.DataFrame]:
+        """Параллельно загружает все файлы каталога или glob-шаблона.
+
+        Args:
+            path: Каталог или шаблон вида `data/site_*.csv`
+
+        Returns:
+            Tuple[bool, pd.DataFrame]:
+                - bool: Успешность операции
+                - pd.DataFrame: Объединенные данные со столбцом `Source_File`
+        """
+        files = expand_sources(path)
+        if not files:
+            print(self.localizer.get_string(22).format(path))
+            return False, pd.DataFrame()
+
+        print(f"Найдено файлов: {len(files)}")
+        streaming = False
+        if any(f.suffix.lower() == '.csv' for f in files):
+            streaming = input("Потоковый импорт с планом типов? (y/N): ").strip().lower() == "y"
+
+        try:
+            deduplicator = self._ask_dedup()
+            df, seconds = import_many(files, streaming=streaming, deduplicator=deduplicator)
+        except Exception as e:
+            print(f"{self.localizer.get_string(25)}: {str(e)}")
+            return False, pd.DataFrame()
+        print(f"Файлов: {len(files)}, строк: {len(df)}, время: {seconds:.2f} с")
+        if deduplicator is not None:
+            print(deduplicator.report())
+        return True, df
+
+    def _partitioned_import(self, root: Path) -> Tuple[bool, pd.DataFrame]:
+        """Загружает секционированный датасет, читая только подходящие секции.
+
+        Args:
+            root: Корневой каталог датасета
+
+        Returns:
+            Tuple[bool, pd.DataFrame]:
+                - bool: Успешность операции
+                - pd.DataFrame: Данные выбранных секций со столбцами секционирования
+        """
+        try:
+            partitions = list_partitions(root)
+            if not partitions:
+                print(self.localizer.get_string(31))
+                return False, pd.DataFrame()
+            values = {}
+            for partition in partitions:
+                for column, value in partition.values.items():
+                    values.setdefault(column, set()).add(value)
+            print(f"Секций: {len(partitions)}")
+            for column, column_values in values.items():
+                print(f"  {column}: {', '.join(sorted(column_values))}")
+
+            text = input("Фильтр секций, например Cancer_Type=Lung,Breast (Enter — все): ").strip()
+            selected = input("Столбцы через запятую (Enter — все): ").strip()
+            deduplicator = self._ask_dedup()
+            df, stats = read_partitioned(root, parse_partition_filter(text) if text else None,
+                                         [col.strip() for col in selected.split(',')] if selected else None)
+            print(stats.report())
+            return True, self._deduplicate(df, deduplicator)
+        except Exception as e:
+            print(f"{self.localizer.get_string(25)}: {str(e)}")
+            return False, pd.DataFrame()
+
+    def _archive_import(self, archive_path: Path) -> Tuple[bool, pd.DataFrame]:
+        """Загружает выбранные файлы из архива без распаковки на диск.
+
+        Args:
+            archive_path: Путь к архиву zip или tar
+
+        Returns:
+            Tuple[bool, pd.DataFrame]:
+                - bool: Успешность операции
+                - pd.DataFrame: Загруженные данные (несколько файлов объединяются)
+        """
+        try:
+            members = list_members(archive_path)
+            if not members:
+                print(self.localizer.get_string(31))
+                return False, pd.DataFrame()
+            selected = self._select_files(members, lambda member: f"{member.name} ({member.size / 2 ** 20:.1f} МБ)")
+            streaming = False
+            if any(member.suffix == '.csv' for member in selected):
+                streaming = input("Потоковый импорт с планом типов? (y/N): ").strip().lower() == "y"
+            deduplicator = self._ask_dedup()
+            if len(selected) == 1:
+                return True, self.load_local_file(selected[0], streaming=streaming, deduplicator=deduplicator)
+            df, seconds = import_many(selected, streaming=streaming, deduplicator=deduplicator)
+            print(f"Файлов: {len(selected)}, строк: {len(df)}, время: {seconds:.2f} с")
+            if deduplicator is not None:
+                print(deduplicator.report())
+            return True, df
+        except Exception as e:
+            print(f"{self.localizer.get_string(25)}: {str(e)}")
+            return False, pd.DataFrame()
+
+    def _show_cache_stats(self):
+        """Выводит статистику дискового кэша и предлагает очистить его."""
+        stats = self.cache.stats()
+        print(f"\nКаталог кэша: {self.cache.cache_dir}")
+        print(f"Записей: {stats['entries']}")
+        print(f"Занято: {stats['bytes'] / 2 ** 20:.1f} из {stats['max_bytes'] / 2 ** 20:.0f} МБ")
+        print(f"Попаданий/промахов за сессию: {stats['hits']}/{stats['misses']}")
+        if stats['entries'] and input("Очистить кэш? (y/N): ").strip().lower() == "y":
+            self.cache.clear()
+            print("Кэш очищен.")
+
+    def _tail_import(self, file_path: Path) -> Tuple[bool, pd.DataFrame]:
+        """Импортирует CSV в инкрементальном режиме.
+
+        При первом вызове файл читается целиком и начинается отслеживание,
+        при последующих — дочитываются только дописанные строки.
+
+        Args:
+            file_path: Путь к CSV-файлу
+
+        Returns:
+            Tuple[bool, pd.DataFrame]:
+                - bool: Успешность операции
+                - pd.DataFrame: Данные с добавленными строками
+        """
+        current = getattr(self.main_app, "df", None)
+        state = self.tails.state_for(file_path)
+        try:
+            if state is not None and state.tracks(current):
+                df, added = self.tails.append_new_rows(file_path, current)
+                print(f"Новых строк: {added} (смещение {state.offset} байт)")
+                return True, df
+            dialect = sniff_csv(file_path)
+            print(dialect.describe(chunked=True))
+            return True, self.tails.start(file_path, **dialect.read_options(chunked=True))
+        except Exception as e:
+            print(f"{self.localizer.get_string(25)}: {str(e)}")
+            return False, pd.DataFrame()
+
+    def _ask_dedup(self):
+        """Спрашивает, нужно ли удалять повторяющиеся строки и по каким столбцам.
+
+        Returns:
+            RowDeduplicator: Фильтр повторов или None, если удалять не нужно
+        """
+        if input("Удалить повторяющиеся строки? (y/N): ").strip().lower() != "y":
+            return None
+        keys = input("Ключевые столбцы через запятую (Enter — вся строка): ").strip()
+        return RowDeduplicator([key.strip() for key in keys.split(',')] if keys else None,
+                               exclude=[SOURCE_COLUMN])
+
+    def _ask_sheet(self, file_path: Path) -> dict:
+        """Запрашивает лист и ограничение числа строк для чтения XLSX.
+
+        Args:
+            file_path: Путь к файлу .xlsx
+
+        Returns:
+            dict: Параметры `sheet` и `max_rows` для `load_local_file`
+        """
+        sheets = list_sheets(file_path)
+        sheet = None
+        if len(sheets) > 1:
+            for number, name in enumerate(sheets, 1):
+                print(f"{number}. {name}")
+            selected = input("Номер листа (Enter — 1): ").strip()
+            sheet = sheets[int(selected) - 1] if selected else None
+        limit = input("Максимум строк (Enter — все): ").strip()
+        return {"sheet": sheet, "max_rows": int(limit) if limit else None}
+
+    def _ask_projection(self, file_path: Path) -> dict:
+        """Запрашивает столбцы и группы строк для чтения колоночного файла.
+
+        Args:
+            file_path: Путь к файлу Parquet/Feather
+
+        Returns:
+            dict: Параметры `columns` и `row_groups` для `load_local_file`
+        """
+        columns, groups_count = describe_columnar(file_path)
+        print(f"Доступные столбцы: {', '.join(columns)}")
+        print(f"Групп строк в файле: {groups_count}")
+
+        selected = input("Столбцы через запятую (Enter — все): ").strip()
+        groups = input(f"Номера групп строк 0-{max(groups_count - 1, 0)} через запятую (Enter — все): ").strip()
+        return {
+            "columns": [col.strip() for col in selected.split(',')] if selected else None,
+            "row_groups": [int(group) for group in groups.split(',')] if groups else None,
+        }
+
+    def _ask_sql_query(self, file_path: Path) -> dict:
+        """Запрашивает таблицу, столбцы, условия и LIMIT для чтения из SQLite.
+
+        Args:
+            file_path: Путь к файлу базы SQLite
+
+        Returns:
+            dict: Параметры `table`, `columns`, `where` и `max_rows` для `load_local_file`
+        """
+        tables = list_tables(file_path)
+        if not tables:
+            raise ValueError("В базе нет таблиц")
+        table = tables[0]
+        if len(tables) > 1:
+            for number, name in enumerate(tables, 1):
+                print(f"{number}. {name}")
+            selected = input("Номер таблицы (Enter — 1): ").strip()
+            table = tables[int(selected) - 1] if selected else table
+        print(f"Доступные столбцы: {', '.join(table_columns(file_path, table))}")
+
+        selected = input("Столбцы через запятую (Enter — все): ").strip()
+        where = input("Условия через ';', например Age > 60; Cancer_Type = Lung (Enter — без условий): ").strip()
+        limit = input("Максимум строк (Enter — все): ").strip()
+        return {
+            "table": table,
+            "columns": [col.strip() for col in selected.split(',')] if selected else None,
+            "where": where or None,
+            "max_rows": int(limit) if limit else None,
+        }
+
+    def load_local_file(self, file_path: Path, streaming: bool = False,
+                        columns=None, row_groups=None, sheet=None, max_rows=None,
+                        table=None, where=None, deduplicator=None, use_cache: bool = True) -> pd.DataFrame:
+        """Читает локальный файл без диалога с пользователем.
+
+        Разобранные CSV/XLSX сохраняются в дисковый кэш; повторный импорт
+        неизмененного файла с теми же параметрами читается из кэша. Член
+        архива кэшируется по содержимому архива и имени члена.
+
+        Args:
+            file_path: Путь к файлу CSV/XLSX/Parquet/Feather/SQLite или член архива
+            streaming: Читать CSV чанками по плану типов, построенному по первым строкам
+            columns: Столбцы для чтения из Parquet/Feather/SQLite (None — все)
+            row_groups: Группы строк для чтения из Parquet/Feather (None — все)
+            sheet: Лист книги XLSX (None — первый)
+            max_rows: Максимум строк данных для XLSX/SQLite (None — все)
+            table: Таблица SQLite (None — единственная таблица базы)
+            where: Условия для SQLite через `;`, например `Age > 60; Cancer_Type = Lung`
+            deduplicator: `RowDeduplicator` для удаления повторяющихся строк (None — не удалять)
+            use_cache: Использовать дисковый кэш разобранных файлов
+
+        Returns:
+            pd.DataFrame: Загруженные данные
+
+        Raises:
+            ValueError: Если формат файла не поддерживается
+        """
+        if isinstance(file_path, ArchiveMember):
+            cache_path, cache_options = file_path.archive, {"streaming": streaming, "member": file_path.name}
+            options = {"streaming": streaming}
+        else:
+            file_path = Path(file_path)
+            if is_columnar(file_path):
+                df = read_columnar(file_path, columns=columns, row_groups=row_groups)
+                return self._deduplicate(df, deduplicator)
+            if file_path.suffix.lower() in SQLITE_SUFFIXES:
+                return self._deduplicate(self._read_sql(file_path, table, columns, where, max_rows), deduplicator)
+            options = {"streaming": streaming, "sheet": sheet, "max_rows": max_rows}
+            cache_path, cache_options = file_path, dict(options)
+        if deduplicator is not None:
+            cache_options["dedup"] = deduplicator.spec
+        if not use_cache:
+            return self._parse_local_file(file_path, deduplicator=deduplicator, **options)
+
+        try:
+            df = self.cache.get(cache_path, cache_options)
+        except Exception as e:
+            print(f"Кэш недоступен: {str(e)}")
+            return self._parse_local_file(file_path, deduplicator=deduplicator, **options)
+        if df is not None:
+            print("Данные загружены из кэша.")
+            return df
+
+        df = self._parse_local_file(file_path, deduplicator=deduplicator, **options)
+        try:
+            self.cache.put(cache_path, cache_options, df)
+        except Exception as e:
+            print(f"Не удалось сохранить данные в кэш: {str(e)}")
+        return df
+
+    def _read_sql(self, file_path: Path, table=None, columns=None, where=None, max_rows=None) -> pd.DataFrame:
+        """Читает срез таблицы SQLite, передавая столбцы, условия и LIMIT в запрос.
+
+        Raises:
+            ValueError: Если таблица не указана, а в базе их несколько
+        """
+        if table is None:
+            tables = list_tables(file_path)
+            if len(tables) != 1:
+                raise ValueError(f"Укажите таблицу: {', '.join(tables) or 'в базе нет таблиц'}")
+            table = tables[0]
+        filters = parse_filters(where) if where else ()
+        return read_sql_table(file_path, table, columns=columns, filters=filters, limit=max_rows)
+
+    def _deduplicate(self, df: pd.DataFrame, deduplicator) -> pd.DataFrame:
+        """Удаляет повторяющиеся строки из загруженных данных и выводит итог."""
+        if deduplicator is None:
+            return df
+        df = deduplicator.filter_frame(df)
+        print(deduplicator.report())
+        return df
+
+    def _parse_local_file(self, file_path: Path, streaming: bool = False,
+                          sheet=None, max_rows=None, deduplicator=None) -> pd.DataFrame:
+        """Разбирает CSV/XLSX-файл или член архива.
+
+        Args:
+            file_path: Путь к файлу CSV/XLSX (CSV может быть сжатым) или член архива
+            streaming: Читать CSV чанками по плану типов
+            sheet: Лист книги XLSX (None — первый)
+            max_rows: Максимум строк данных для XLSX (None — все)
+            deduplicator: `RowDeduplicator`; при потоковом чтении CSV повторы
+                удаляются из каждого чанка до сборки DataFrame
+
+        Returns:
+            pd.DataFrame: Загруженные данные
+
+        Raises:
+            ValueError: Если формат файла не поддерживается
+        """
+        if isinstance(file_path, ArchiveMember):
+            if file_path.suffix != '.csv':
+                return self._deduplicate(read_member(file_path), deduplicator)
+            source, compression = file_path.open, file_path.compression
+        else:
+            if inner_suffix(file_path) != '.csv':
+                return self._deduplicate(self._parse_other_file(file_path, sheet, max_rows), deduplicator)
+            source, compression = file_path, None
+
+        df, dialect, stats = read_csv_auto(source, compression, streaming, deduplicator=deduplicator)
+        print(dialect.describe(chunked=streaming))
+        if stats is not None:
+            print(stats.report())
+        if deduplicator is not None:
+            print(deduplicator.report())
+        return df
+
+    def _parse_other_file(self, file_path: Path, sheet=None, max_rows=None) -> pd.DataFrame:
+        """Разбирает XLSX/XLS-файл."""
+        suffix = file_path.suffix.lower()
+        if suffix == '.xlsx':
+            return read_excel_streaming(file_path, sheet=sheet, max_rows=max_rows)
+        if suffix == '.xls':
+            return pd.read_excel(file_path, sheet_name=sheet or 0, nrows=max_rows)
+        raise ValueError(self.localizer.get_string(23))
+
     def _kaggle_import(self) -> Tuple[bool, pd.DataFrame]:
         """Загружает датасет с Kaggle через API.
 
         Workflow:
-            1. Запрашивает URL датасета
-            2. Аутентифицируется в Kaggle API
-            3. Скачивает и распаковывает архив
-            4. Загружает первый найденный CSV-файл
+            1. Запрашивает URL датасета (можно с `/versions/N`)
+            2. Берет версию из локального кэша или скачивает ее
+            3. Предлагает выбрать файлы внутри датасета
+            4. Загружает выбранные файлы (несколько файлов объединяются)
 
         Returns:
             Tuple[bool, pd.DataFrame]:
@@ -132,33 +598,77 @@ class DataImporterExporter:
         dataset_url = input(f"{self.localizer.get_string(28)}: ").strip()
 
         try:
-            api = KaggleApi()
-            api.authenticate()
+            owner, slug, version = parse_dataset_ref(dataset_url)
+        except ValueError:
+            print(self.localizer.get_string(29))
+            return False, pd.DataFrame()
 
-            parts = dataset_url.split('/')
-            dataset_name = parts[-1]
-            user = parts[-2]
+        refresh = False
+        cached = None if version else self.kaggle_cache.latest_cached(owner, slug)
+        if cached:
+            answer = input(f"В кэше есть версия {cached}. Проверить новую версию на Kaggle? (y/n): ")
+            refresh = answer.strip().lower() == "y"
 
+        try:
             print(self.localizer.get_string(30))
-            api.dataset_download_files(f"{user}/{dataset_name}", path="temp", unzip=True)
-
-            csv_files = list(Path("temp").glob("*.csv"))
+            dataset_dir, from_cache = self.kaggle_cache.fetch(owner, slug, version, refresh=refresh)
+            if from_cache:
+                print(f"Датасет {owner}/{slug} (версия {dataset_dir.name}) взят из кэша.")
+
+            files = self._select_files(list_data_files(dataset_dir),
+                                       lambda source: data_file_label(source, dataset_dir))
+            if not files:
+                print(self.localizer.get_string(31))
+                return False, pd.DataFrame()
 
-            if csv_files:
-                df = pd.read_csv(csv_files[0])
-                shutil.rmtree("temp")
-                return True, df
-            return False, pd.DataFrame()
+            deduplicator = self._ask_dedup()
+            if len(files) == 1:
+                return True, self.load_local_file(files[0], deduplicator=deduplicator)
+            df, _ = import_many(files, deduplicator=deduplicator)
+            if deduplicator is not None:
+                print(deduplicator.report())
+            return True, df
         except Exception as e:
             print(f"{self.localizer.get_string(33)}: {str(e)}")
             return False, pd.DataFrame()
 
+    def _select_files(self, files, label):
+        """Предлагает выбрать файлы датасета или архива для загрузки.
+
+        Args:
+            files: Файлы данных или члены архива
+            label: Функция, возвращающая отображаемое имя файла
+
+        Returns:
+            list: Выбранные файлы (по умолчанию — первый)
+        """
+        if len(files) <= 1:
+            return files
+
+        print("Доступные файлы:")
+        for number, file in enumerate(files, 1):
+            print(f"{number}. {label(file)}")
+        selected = input("Номера файлов через запятую (Enter — 1, * — все): ").strip()
+        if selected == "*":
+            return files
+        if not selected:
+            return files[:1]
+        return [files[int(number) - 1] for number in selected.split(',')]
+
     def _export_data(self) -> Tuple[bool, pd.DataFrame]:
         """Экспортирует данные в файл с проверкой пути.
 
         Supported Formats:
-            - CSV (.csv)
+            - CSV (.csv), в том числе сжатый (.csv.gz, .csv.bz2, .csv.xz, .csv.zst)
             - Excel (.xlsx)
+            - Parquet (.parquet)
+            - Feather (.feather)
+            - SQLite (.sqlite): таблица с именем файла, пакетная вставка в одной транзакции
+            - Секционированный Parquet (partitioned): каталог с подкаталогами
+              `столбец=значение`, секции пишутся параллельно
+
+        Все форматы пишутся блоками в фоновом потоке: меню возвращается
+        сразу, а о завершении сообщается отдельно.
 
         Returns:
             Tuple[bool, pd.DataFrame]:
@@ -169,7 +679,7 @@ class DataImporterExporter:
             Exception: При ошибках сохранения файла
         """
 
-        if self.main_app.df.empty:
+        if self.main_app.df is None or self.main_app.df.empty:
             print(self.localizer.get_string(10))
             return False, self.main_app.df
 
@@ -178,31 +688,86 @@ class DataImporterExporter:
             filename = input(f"{self.localizer.get_string(35)}: ").strip()
             file_format = input(f"{self.localizer.get_string(36)}: ").lower().strip()
 
-            required_columns = ['Mutation_Type', 'Cancer_Type'] + self.main_app.predictor.feature_names
+            predictor = getattr(self.main_app, "predictor", None)
+            feature_names = list(predictor.feature_names or []) if predictor else []
+            required_columns = ['Mutation_Type', 'Cancer_Type'] + feature_names
             if not all(col in self.main_app.df.columns for col in required_columns):
                 print("Отсутствуют обязательные колонки для экспорта!")
                 return False, self.main_app.df
 
-            export_path = Path(path) / f"{filename}.{file_format}"
+            partition_by = []
+            if file_format == 'partitioned':
+                export_path = Path(path) / filename
+                selected = input("Столбцы секционирования через запятую (например Cancer_Type): ").strip()
+                partition_by = [col.strip() for col in selected.split(',') if col.strip()]
+                if export_path.exists():
+                    print(f"Ошибка: каталог '{export_path}' уже существует!")
+                    return False, self.main_app.df
+            else:
+                export_path = Path(path) / f"{filename}.{file_format}"
             if not export_path.parent.exists():
                 print(f"Ошибка: путь '{export_path.parent}' не существует!")
                 return False, self.main_app.df
 
-            export_path.parent.mkdir(parents=True, exist_ok=True)
-            if file_format == "csv":
-                self.main_app.df.to_csv(export_path, index=False)
-            elif file_format == "xlsx":
-                self.main_app.df.to_excel(export_path, index=False, engine="openpyxl")
-            else:
+            if file_format not in EXPORT_FORMATS:
                 print(self.localizer.get_string(37))
                 return False, self.main_app.df
 
-            if export_path.exists():
-                print(self.localizer.get_string(38).format(export_path))
-                return True, self.main_app.df
-
-            print("Ошибка: файл не был сохранен!")
-            return False, self.main_app.df
+            export_path.parent.mkdir(parents=True, exist_ok=True)
+            export = self.start_export(self.main_app.df, export_path, file_format, partition_by=partition_by,
+                                       on_finish=lambda job: print(f"\nФоновый экспорт: {job.status()}"))
+            print(f"Экспорт запущен в фоне: {export.export_path}")
+            return True, self.main_app.df
         except Exception as e:
             print(f"{self.localizer.get_string(39)}: {str(e)}")
-            return False, self.main_app.df    
\ No newline at end of file
+            return False, self.main_app.df
+
+    def export_frame(self, df: pd.DataFrame, export_path: Path, file_format: str, partition_by=()):
+        """Записывает DataFrame в файл без диалога с пользователем.
+
+        Args:
+            df: Данные для экспорта
+            export_path: Путь к итоговому файлу (для `partitioned` — к каталогу)
+            file_format: Один из форматов `EXPORT_FORMATS`
+            partition_by: Столбцы секционирования для формата `partitioned`
+
+        Raises:
+            ValueError: Если формат не поддерживается
+        """
+        export = self.start_export(df, export_path, file_format, partition_by=partition_by)
+        export.join()
+        if export.error is not None:
+            raise export.error
+
+    def start_export(self, df: pd.DataFrame, export_path: Path, file_format: str,
+                     on_finish=None, partition_by=()) -> BackgroundExport:
+        """Запускает потоковый экспорт в фоновом потоке.
+
+        Args:
+            df: Данные для экспорта
+            export_path: Путь к итоговому файлу
+            file_format: Формат CSV/XLSX/Parquet/Feather/SQLite/partitioned, для CSV — со сжатием (`csv.gz`)
+            on_finish: Функция, вызываемая по завершении экспорта
+            partition_by: Столбцы секционирования для формата `partitioned`
+
+        Returns:
+            BackgroundExport: Запущенный экспорт
+
+        Raises:
+            ValueError: Если формат не поддерживается
+        """
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(self.localizer.get_string(37))
+        base_format, compression = split_format(file_format)
+        export = BackgroundExport(df, export_path, base_format, compression, on_finish=on_finish,
+                                  partition_by=partition_by)
+        self.exports.append(export)
+        return export.start()
+
+    def _show_exports(self):
+        """Выводит состояние фоновых экспортов текущей сессии."""
+        if not self.exports:
+            print("Фоновых экспортов не было.")
+            return
+        for export in self.exports:
+            print(export.status())
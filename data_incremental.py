@@ -0,0 +1,222 @@
+"""Модуль инкрементального импорта дописываемых CSV-файлов.
+
+При первом импорте запоминаются смещение конца последней полной строки и
+заголовок файла. При повторном импорте того же файла читаются только байты,
+дописанные после запомненного смещения, и новые строки добавляются к уже
+загруженному DataFrame одним блоком, без повторного разбора старых данных.
+Незавершенная последняя строка (файл еще пишется) откладывается до
+следующего импорта.
+
+Классы:
+    TailState: Состояние отслеживаемого файла.
+    TailTracker: Начальный импорт и дочитывание новых строк.
+
+Функции:
+    append_block: Добавляет блок строк к DataFrame с согласованием типов.
+"""
+
+import hashlib
+import io
+import weakref
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_FINGERPRINT_BYTES = 4096
+
+
+class _LimitedReader(io.RawIOBase):
+    """Бинарный поток, отдающий не больше `limit` байт исходного файла."""
+
+    def __init__(self, raw, limit: int):
+        self._raw = raw
+        self._left = limit
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._left <= 0:
+            return 0
+        view = memoryview(buffer)[:self._left]
+        read = self._raw.readinto(view)
+        self._left -= read or 0
+        return read
+
+
+def _complete_end(f, size: int) -> int:
+    """Возвращает смещение сразу после последнего перевода строки не дальше `size`."""
+    position = size
+    while position > 0:
+        start = max(0, position - 64 * 1024)
+        f.seek(start)
+        block = f.read(position - start)
+        newline = block.rfind(b"\n")
+        if newline != -1:
+            return start + newline + 1
+        position = start
+    return 0
+
+
+def _fingerprint(f, end: int) -> str:
+    """Хэш последних байт перед смещением — признак того, что начало файла не переписано."""
+    start = max(0, end - _FINGERPRINT_BYTES)
+    f.seek(start)
+    return hashlib.blake2b(f.read(end - start), digest_size=16).hexdigest()
+
+
+class TailState:
+    """Состояние отслеживаемого файла.
+
+    Attributes:
+        path: Путь к файлу
+        offset: Смещение конца последней прочитанной полной строки
+        header: Первая строка файла (заголовок)
+        columns: Имена столбцов
+        fingerprint: Хэш байт перед `offset`
+        read_options: Параметры `pd.read_csv`, использованные при импорте
+    """
+
+    def __init__(self, path: Path, offset: int, header: bytes, columns, fingerprint: str,
+                 frame: pd.DataFrame, read_options: dict):
+        self.path = path
+        self.offset = offset
+        self.header = header
+        self.columns = list(columns)
+        self.fingerprint = fingerprint
+        self.read_options = read_options
+        self._frame = weakref.ref(frame)
+
+    def tracks(self, df: Optional[pd.DataFrame]) -> bool:
+        """Проверяет, что `df` — результат последнего импорта этого файла."""
+        return df is not None and self._frame() is df
+
+    def advance(self, offset: int, fingerprint: str, frame: pd.DataFrame):
+        """Сдвигает смещение после дочитывания и привязывает новый DataFrame."""
+        self.offset = offset
+        self.fingerprint = fingerprint
+        self._frame = weakref.ref(frame)
+
+
+def _cast_block(new: pd.Series, dtype) -> pd.Series:
+    """Приводит столбец блока к типу DataFrame, если числа сохраняются без потерь.
+
+    Дробные значения для целого столбца и значения вне диапазона его типа
+    остаются как есть, и при конкатенации столбец расширяется.
+    """
+    try:
+        cast = new.astype(dtype)
+    except (TypeError, ValueError):
+        return new
+    if pd.api.types.is_numeric_dtype(new.dtype) and pd.api.types.is_numeric_dtype(dtype):
+        before = new.to_numpy(dtype=np.float64, na_value=np.nan)
+        after = cast.to_numpy(dtype=np.float64, na_value=np.nan)
+        if not np.array_equal(before, after, equal_nan=True):
+            return new
+    return cast
+
+
+def append_block(df: pd.DataFrame, block: pd.DataFrame) -> pd.DataFrame:
+    """Добавляет блок строк к DataFrame одной конкатенацией.
+
+    Типы блока приводятся к типам DataFrame, если значения не теряются, иначе
+    столбец расширяется (целый до дробного); у категориальных столбцов
+    объединяются категории, чтобы столбец не превратился в `object`.
+
+    Args:
+        df: Уже загруженные данные
+        block: Новые строки с теми же столбцами
+
+    Returns:
+        pd.DataFrame: Объединенные данные
+    """
+    if block.empty:
+        return df
+    base_columns = {}
+    block_columns = {}
+    for column in df.columns:
+        base, new = df[column], block[column]
+        if isinstance(base.dtype, pd.CategoricalDtype):
+            categories = base.cat.categories.union(pd.Index(new.dropna().unique()))
+            base = base.cat.set_categories(categories)
+            new = pd.Series(pd.Categorical(new, categories=categories), index=new.index)
+        else:
+            new = _cast_block(new, base.dtype)
+        base_columns[column] = base
+        block_columns[column] = new
+    return pd.concat([pd.DataFrame(base_columns), pd.DataFrame(block_columns)], ignore_index=True)
+
+
+class TailTracker:
+    """Начальный импорт дописываемых CSV и дочитывание новых строк."""
+
+    def __init__(self):
+        self._states = {}
+
+    def state_for(self, file_path: Path) -> Optional[TailState]:
+        """Возвращает состояние файла или None, если файл не отслеживается."""
+        return self._states.get(Path(file_path).resolve())
+
+    def start(self, file_path: Path, **read_options) -> pd.DataFrame:
+        """Импортирует файл целиком до последней полной строки и начинает отслеживание.
+
+        Args:
+            file_path: Путь к CSV-файлу
+            **read_options: Дополнительные параметры `pd.read_csv`
+
+        Returns:
+            pd.DataFrame: Загруженные данные
+        """
+        file_path = Path(file_path).resolve()
+        with open(file_path, "rb") as f:
+            size = f.seek(0, io.SEEK_END)
+            end = _complete_end(f, size)
+            f.seek(0)
+            header = f.readline()
+            f.seek(0)
+            df = pd.read_csv(io.BufferedReader(_LimitedReader(f, end)), **read_options)
+            fingerprint = _fingerprint(f, end)
+
+        self._states[file_path] = TailState(file_path, end, header, df.columns, fingerprint, df, read_options)
+        return df
+
+    def append_new_rows(self, file_path: Path, df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+        """Дочитывает строки, дописанные после последнего импорта.
+
+        Args:
+            file_path: Путь к отслеживаемому CSV-файлу
+            df: Данные последнего импорта этого файла
+
+        Returns:
+            Tuple[pd.DataFrame, int]: Объединенные данные и количество новых строк
+
+        Raises:
+            ValueError: Если файл не отслеживается или был перезаписан
+        """
+        state = self.state_for(file_path)
+        if state is None or not state.tracks(df):
+            raise ValueError("Файл не отслеживается: выполните полный импорт")
+
+        with open(state.path, "rb") as f:
+            size = f.seek(0, io.SEEK_END)
+            if size < state.offset or _fingerprint(f, state.offset) != state.fingerprint:
+                raise ValueError("Файл был перезаписан: выполните полный импорт")
+            f.seek(0)
+            if f.readline() != state.header:
+                raise ValueError("Заголовок файла изменился: выполните полный импорт")
+
+            end = _complete_end(f, size)
+            if end <= state.offset:
+                return df, 0
+            f.seek(state.offset)
+            data = f.read(end - state.offset)
+            fingerprint = _fingerprint(f, end)
+
+        options = {key: value for key, value in state.read_options.items() if key not in ("header", "names")}
+        block = pd.read_csv(io.BytesIO(data), header=None, names=state.columns, **options)
+        combined = append_block(df, block)
+
+        state.advance(end, fingerprint, combined)
+        return combined, len(block)
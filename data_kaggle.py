@@ -0,0 +1,246 @@
+"""Модуль загрузки датасетов Kaggle с постоянным версионным кэшем.
+
+Датасет скачивается один раз в каталог `<кэш>/<owner>/<slug>/<версия>` и при
+повторном импорте той же версии берется с диска. Если версия не указана,
+берется последняя версия из кэша без обращения к сети; источник
+опрашивается, только когда кэш пуст или запрошено обновление. Скачанный архив не
+распаковывается: файлы данных читаются прямо из него. Доступ к Kaggle скрыт за
+интерфейсом `KaggleClient`: `KaggleApiClient` работает через официальный API,
+а `LocalDirectoryClient` отдает датасеты из локального каталога для работы
+без сети и для тестов.
+
+Классы:
+    KaggleClient: Интерфейс источника датасетов.
+    KaggleApiClient: Источник на основе `KaggleApi`.
+    LocalDirectoryClient: Источник на основе локального каталога.
+    KaggleDatasetCache: Версионный кэш скачанных датасетов.
+
+Функции:
+    parse_dataset_ref: Разбирает URL или ссылку `owner/slug[/версия]`.
+    create_client: Создает источник по переменным окружения.
+    list_data_files: Перечисляет файлы данных внутри датасета.
+    data_file_label: Возвращает имя файла данных относительно каталога датасета.
+"""
+
+import os
+import shutil
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+
+from data_archives import ArchiveMember
+from data_cache import CACHE_ROOT
+from data_multi_import import collect_sources
+
+DEFAULT_KAGGLE_CACHE_DIR = CACHE_ROOT / "kaggle"
+OFFLINE_DIR_ENV = "DATALYZE_KAGGLE_DIR"
+UNVERSIONED = "latest"
+_COMPLETE_MARKER = ".complete"
+
+
+def parse_dataset_ref(dataset_url: str) -> Tuple[str, str, Optional[str]]:
+    """Разбирает ссылку на датасет.
+
+    Args:
+        dataset_url: URL вида `https://www.kaggle.com/datasets/owner/slug[/versions/N]`
+            или ссылка `owner/slug[/N]`
+
+    Returns:
+        Tuple[str, str, Optional[str]]: Владелец, имя датасета и версия (если указана)
+
+    Raises:
+        ValueError: Если ссылка не содержит владельца и имя датасета
+    """
+    path = urlparse(dataset_url).path if "://" in dataset_url else dataset_url
+    parts = [part for part in path.strip("/").split("/") if part]
+    if parts and parts[0] == "datasets":
+        parts = parts[1:]
+
+    version = None
+    if len(parts) >= 4 and parts[2] == "versions":
+        version = parts[3]
+    elif len(parts) == 3 and parts[2].isdigit():
+        version = parts[2]
+    if len(parts) < 2:
+        raise ValueError(f"Некорректная ссылка на датасет: {dataset_url}")
+    return parts[0], parts[1], version
+
+
+class KaggleClient(ABC):
+    """Интерфейс источника датасетов Kaggle."""
+
+    @abstractmethod
+    def latest_version(self, owner: str, slug: str) -> Optional[str]:
+        """Возвращает номер последней версии датасета или None, если он неизвестен."""
+
+    @abstractmethod
+    def download(self, owner: str, slug: str, version: Optional[str], target_dir: Path):
+        """Скачивает файлы датасета в `target_dir`."""
+
+
+class KaggleApiClient(KaggleClient):
+    """Источник датасетов через официальный `KaggleApi`.
+
+    Клиент аутентифицируется при первом обращении, поэтому создание объекта
+    не требует сети и учетных данных.
+    """
+
+    def __init__(self):
+        self._api = None
+
+    @property
+    def api(self):
+        if self._api is None:
+            from kaggle.api.kaggle_api_extended import KaggleApi
+            self._api = KaggleApi()
+            self._api.authenticate()
+        return self._api
+
+    def latest_version(self, owner: str, slug: str) -> Optional[str]:
+        ref = f"{owner}/{slug}"
+        for dataset in self.api.dataset_list(user=owner, search=slug) or []:
+            if dataset is None or str(getattr(dataset, "ref", "")) != ref:
+                continue
+            for attr in ("current_version_number", "currentVersionNumber"):
+                version = getattr(dataset, attr, None)
+                if version:
+                    return str(version)
+        return None
+
+    def download(self, owner: str, slug: str, version: Optional[str], target_dir: Path):
+        ref = f"{owner}/{slug}" + (f"/{version}" if version and version != UNVERSIONED else "")
+        self.api.dataset_download_files(ref, path=str(target_dir), unzip=False, quiet=True)
+
+
+class LocalDirectoryClient(KaggleClient):
+    """Источник датасетов из локального каталога `<root>/<owner>/<slug>/<версия>/`.
+
+    Используется для работы без сети и в тестах.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _versions(self, owner: str, slug: str) -> List[str]:
+        dataset_dir = self.root / owner / slug
+        if not dataset_dir.is_dir():
+            return []
+        return sorted((p.name for p in dataset_dir.iterdir() if p.is_dir() and p.name.isdigit()), key=int)
+
+    def latest_version(self, owner: str, slug: str) -> Optional[str]:
+        versions = self._versions(owner, slug)
+        return versions[-1] if versions else None
+
+    def download(self, owner: str, slug: str, version: Optional[str], target_dir: Path):
+        version = version if version and version != UNVERSIONED else self.latest_version(owner, slug)
+        source = self.root / owner / slug / version if version else self.root / owner / slug
+        if not source.is_dir():
+            raise FileNotFoundError(f"Датасет {owner}/{slug} не найден в {self.root}")
+        shutil.copytree(source, target_dir, dirs_exist_ok=True)
+
+
+def create_client() -> KaggleClient:
+    """Создает источник датасетов.
+
+    Если задана переменная окружения `DATALYZE_KAGGLE_DIR`, датасеты берутся
+    из указанного локального каталога, иначе — через Kaggle API.
+    """
+    offline_dir = os.environ.get(OFFLINE_DIR_ENV)
+    if offline_dir:
+        return LocalDirectoryClient(Path(offline_dir))
+    return KaggleApiClient()
+
+
+class KaggleDatasetCache:
+    """Постоянный версионный кэш скачанных датасетов.
+
+    Attributes:
+        client: Источник датасетов
+        root: Корневой каталог кэша
+    """
+
+    def __init__(self, client: KaggleClient, root: Path = DEFAULT_KAGGLE_CACHE_DIR):
+        self.client = client
+        self.root = Path(root)
+
+    def _cached_versions(self, owner: str, slug: str) -> List[str]:
+        dataset_dir = self.root / owner / slug
+        if not dataset_dir.is_dir():
+            return []
+        return sorted(
+            (p.name for p in dataset_dir.iterdir() if (p / _COMPLETE_MARKER).exists()),
+            key=lambda name: (name.isdigit(), int(name) if name.isdigit() else 0),
+        )
+
+    def latest_cached(self, owner: str, slug: str) -> Optional[str]:
+        """Возвращает последнюю полностью скачанную версию датасета или None."""
+        cached = self._cached_versions(owner, slug)
+        return cached[-1] if cached else None
+
+    def _resolve_version(self, owner: str, slug: str, version: Optional[str], refresh: bool) -> str:
+        """Определяет версию: указанная, последняя в кэше или последняя у источника.
+
+        Источник опрашивается, только если кэш пуст или `refresh` истинно;
+        при ошибке источника используется кэш.
+        """
+        if version:
+            return version
+        cached = self.latest_cached(owner, slug)
+        if cached and not refresh:
+            return cached
+        try:
+            latest = self.client.latest_version(owner, slug)
+        except Exception:
+            latest = None
+        return latest or cached or UNVERSIONED
+
+    def fetch(self, owner: str, slug: str, version: Optional[str] = None, force: bool = False,
+              refresh: bool = False) -> Tuple[Path, bool]:
+        """Возвращает каталог с файлами датасета, скачивая его при необходимости.
+
+        Args:
+            owner: Владелец датасета
+            slug: Имя датасета
+            version: Версия (None — последняя в кэше, а при пустом кэше — у источника)
+            force: Скачать заново, даже если версия уже в кэше
+            refresh: Узнать последнюю версию у источника, даже если в кэше есть версия
+
+        Returns:
+            Tuple[Path, bool]: Каталог версии и признак того, что она взята из кэша
+        """
+        version = self._resolve_version(owner, slug, version, refresh)
+        version_dir = self.root / owner / slug / version
+        if (version_dir / _COMPLETE_MARKER).exists() and not force:
+            return version_dir, True
+
+        tmp_dir = version_dir.with_name(f".{version}.download")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        try:
+            self.client.download(owner, slug, version, tmp_dir)
+            (tmp_dir / _COMPLETE_MARKER).touch()
+            shutil.rmtree(version_dir, ignore_errors=True)
+            os.replace(tmp_dir, version_dir)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return version_dir, False
+
+
+def list_data_files(dataset_dir: Path) -> list:
+    """Возвращает поддерживаемые файлы данных внутри каталога датасета.
+
+    Архив, скачанный с Kaggle, не распаковывается: вместо него возвращаются
+    его члены (`ArchiveMember`), которые читаются прямо из архива.
+    """
+    return collect_sources(Path(dataset_dir).rglob("*"))
+
+
+def data_file_label(source, dataset_dir: Path) -> str:
+    """Возвращает имя файла данных относительно каталога датасета.
+
+    Для члена архива — `<архив>/<член>`, например `cancer.zip/data/train.csv`.
+    """
+    if isinstance(source, ArchiveMember):
+        return f"{source.archive.relative_to(dataset_dir).as_posix()}/{source.name}"
+    return Path(source).relative_to(dataset_dir).as_posix()
@@ -0,0 +1,499 @@
+"""Модуль работы с датасетом, не помещающимся в оперативную память.
+
+Данные хранятся на диске частями Parquet (группами строк), а в памяти
+находятся только метаданные частей и, после фильтрации или сортировки,
+массив номеров строк (8 байт на строку). Каждая операция приложения
+проходит по частям потоково:
+
+- страница таблицы читает только части, в которые попадают ее строки;
+- фильтр читает только нужный столбец и запоминает номера подходящих строк;
+- сортировка читает только ключевой столбец и хранит перестановку;
+- первые K строк по столбцу отбираются по частям без общей сортировки;
+- агрегация для графиков складывает частичные суммы по частям;
+- признаки для нейросети выдаются пакетами строк.
+
+CSV перед работой один раз перекладывается в Parquet по чанкам с планом
+типов; результат хранится в `~/.datalyze_cache/lazy` и переиспользуется,
+пока исходный файл не изменится. Перед новой записью удаляются прежние
+части того же файла, а при превышении общего размера каталога — части,
+дольше всего не открывавшиеся, как в `DatasetCache`.
+
+Классы:
+    LazyDataset: Датасет на диске с потоковыми операциями.
+
+Функции:
+    open_lazy: Открывает CSV или Parquet как `LazyDataset`.
+"""
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_cache import CACHE_ROOT, DEFAULT_MAX_BYTES
+from data_columnar import PARQUET_SUFFIXES, _require_pyarrow
+from data_table_index import select_top, sort_keys
+
+DEFAULT_LAZY_DIR = CACHE_ROOT / "lazy"
+DEFAULT_CHUNK_ROWS = 100_000
+DEFAULT_SAMPLE_ROWS = 100_000
+
+
+class _Part:
+    """Группа строк файла Parquet — единица чтения."""
+
+    def __init__(self, path: Path, row_group: int, rows: int):
+        self.path = path
+        self.row_group = row_group
+        self.rows = rows
+
+
+class _ILoc:
+    """Срез строк `dataset.iloc[start:stop]`, как у DataFrame."""
+
+    def __init__(self, dataset: "LazyDataset"):
+        self._dataset = dataset
+
+    def __getitem__(self, key) -> pd.DataFrame:
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("Поддерживаются только срезы строк вида iloc[start:stop]")
+        start, stop, _ = key.indices(len(self._dataset))
+        return self._dataset.page(start, stop)
+
+
+class LazyDataset:
+    """Датасет из частей Parquet на диске.
+
+    Объект неизменяем: фильтрация, сортировка и выбор столбцов возвращают
+    новое представление над теми же файлами. Для совместимости с кодом,
+    работающим с DataFrame, поддерживаются `len`, `columns`, `empty`,
+    `head` и `iloc[start:stop]`.
+
+    Attributes:
+        source: Исходный файл (для вывода пользователю)
+    """
+
+    def __init__(self, parts: List[_Part], schema, columns: Optional[Sequence[str]] = None,
+                 source=None, rows: Optional[np.ndarray] = None):
+        self._parts = parts
+        self._schema = schema
+        self._columns = list(columns) if columns is not None else list(schema.names)
+        self._offsets = np.concatenate([[0], np.cumsum([part.rows for part in parts])]).astype(np.int64)
+        self._rows = rows
+        self._files = {}
+        self.source = source
+
+    # Свойства, совместимые с DataFrame
+
+    @property
+    def columns(self) -> pd.Index:
+        return pd.Index(self._columns)
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0 or not self._columns
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self), len(self._columns)
+
+    @property
+    def iloc(self) -> _ILoc:
+        return _ILoc(self)
+
+    @property
+    def dtypes(self) -> pd.Series:
+        return self.page(0, 0).dtypes
+
+    @property
+    def part_count(self) -> int:
+        """Количество частей (групп строк), по которым идут потоковые операции."""
+        return len(self._parts)
+
+    @property
+    def disk_bytes(self) -> int:
+        """Размер файлов частей на диске."""
+        return sum(path.stat().st_size for path in {part.path for part in self._parts})
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1]) if self._rows is None else len(self._rows)
+
+    def __getitem__(self, columns) -> "LazyDataset":
+        """Возвращает представление с выбранными столбцами."""
+        if isinstance(columns, str):
+            raise TypeError("Для данных вне памяти выберите список столбцов: dataset[['A', 'B']]")
+        missing = [column for column in columns if column not in self._columns]
+        if missing:
+            raise KeyError(f"Нет столбцов: {', '.join(map(str, missing))}")
+        return self._view(columns=columns)
+
+    def __repr__(self):
+        return f"LazyDataset({self.source}, строк={len(self)}, столбцов={len(self._columns)})"
+
+    def _view(self, columns=None, rows=None) -> "LazyDataset":
+        view = LazyDataset(self._parts, self._schema, columns if columns is not None else self._columns,
+                           self.source, rows if rows is not None else self._rows)
+        view._files = self._files
+        return view
+
+    # Чтение частей
+
+    def _read_part(self, number: int, columns: Optional[Sequence[str]] = None):
+        import pyarrow.parquet as pq
+
+        part = self._parts[number]
+        parquet = self._files.get(part.path)
+        if parquet is None:
+            parquet = self._files[part.path] = pq.ParquetFile(part.path, memory_map=True)
+        return parquet.read_row_group(part.row_group, columns=list(columns or self._columns))
+
+    def _to_pandas(self, tables, columns) -> pd.DataFrame:
+        pa = _require_pyarrow()
+        if not tables:
+            return self._schema.empty_table().select(list(columns)).to_pandas()
+        return pa.concat_tables(tables, promote_options="permissive").to_pandas()
+
+    def _gather(self, positions: np.ndarray, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Читает строки по глобальным номерам в заданном порядке."""
+        columns = columns or self._columns
+        part_of = np.searchsorted(self._offsets, positions, side="right") - 1
+        order = np.argsort(part_of, kind="stable")
+        sorted_positions, sorted_parts = positions[order], part_of[order]
+        numbers, starts = np.unique(sorted_parts, return_index=True)
+        tables = []
+        for number, begin, end in zip(numbers, starts, np.append(starts[1:], len(order))):
+            local = sorted_positions[begin:end] - self._offsets[number]
+            tables.append(self._read_part(number, columns).take(local))
+        df = self._to_pandas(tables, columns)
+        if len(df):
+            # Строки прочитаны сгруппированными по частям; возвращаем исходный порядок
+            inverse = np.empty_like(order)
+            inverse[order] = np.arange(len(order))
+            df = df.iloc[inverse]
+        return df.set_index(pd.Index(positions))
+
+    def page(self, start: int, stop: int, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Читает строки представления с `start` по `stop` (не включая).
+
+        Returns:
+            pd.DataFrame: Строки с индексом, равным их номерам в исходных данных
+        """
+        stop = min(stop, len(self))
+        start = min(start, stop)
+        if self._rows is not None:
+            return self._gather(self._rows[start:stop], columns)
+
+        columns = columns or self._columns
+        first = int(np.searchsorted(self._offsets, start, side="right") - 1)
+        tables = []
+        number = first
+        while number < len(self._parts) and self._offsets[number] < stop:
+            table = self._read_part(number, columns)
+            begin = max(start - self._offsets[number], 0)
+            end = min(stop - self._offsets[number], table.num_rows)
+            tables.append(table.slice(begin, end - begin))
+            number += 1
+        df = self._to_pandas(tables, columns)
+        return df.set_index(pd.RangeIndex(start, start + len(df)))
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        return self.page(0, n)
+
+    def sample(self, n: int, seed: int = 42) -> pd.DataFrame:
+        """Читает случайную выборку строк (все строки, если их не больше `n`)."""
+        if n >= len(self):
+            return self.page(0, len(self))
+        chosen = np.sort(np.random.default_rng(seed).choice(len(self), n, replace=False))
+        positions = chosen if self._rows is None else self._rows[chosen]
+        return self._gather(positions)
+
+    def iter_batches(self, columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+        """Потоково выдает строки представления по частям в порядке хранения.
+
+        Yields:
+            pd.DataFrame: Строки очередной части с индексом, равным их номерам
+        """
+        selected = None if self._rows is None else np.sort(self._rows)
+        for number in range(len(self._parts)):
+            begin, end = self._offsets[number], self._offsets[number + 1]
+            if selected is None:
+                df = self._read_part(number, columns).to_pandas()
+                yield df.set_index(pd.RangeIndex(begin, end))
+                continue
+            lo, hi = np.searchsorted(selected, [begin, end])
+            if lo == hi:
+                continue
+            positions = selected[lo:hi]
+            df = self._read_part(number, columns).take(positions - begin).to_pandas()
+            yield df.set_index(pd.Index(positions))
+
+    # Потоковые операции
+
+    def filter(self, predicate: Callable[[pd.DataFrame], np.ndarray],
+               columns: Optional[Sequence[str]] = None) -> "LazyDataset":
+        """Оставляет строки, для которых `predicate` вернул True.
+
+        Args:
+            predicate: Функция, возвращающая булеву маску для части данных
+            columns: Столбцы, которые нужны предикату (читаются только они)
+
+        Returns:
+            LazyDataset: Представление с подходящими строками в текущем порядке
+        """
+        matched = [batch.index.to_numpy() for batch in self.iter_filter(predicate, columns)]
+        matched = np.concatenate(matched) if matched else np.array([], dtype=np.int64)
+        if self._rows is not None:
+            # Отсортированное представление сохраняет свой порядок
+            matched = self._rows[np.isin(self._rows, matched, assume_unique=True)]
+        return self._view(rows=matched.astype(np.int64))
+
+    def iter_filter(self, predicate: Callable[[pd.DataFrame], np.ndarray],
+                    columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+        """Потоково выдает подходящие строки по частям, не дожидаясь просмотра всех данных.
+
+        Args:
+            predicate: Функция, возвращающая булеву маску для части данных
+            columns: Читаемые столбцы (нужные предикату и для вывода)
+
+        Yields:
+            pd.DataFrame: Подходящие строки очередной части с индексом, равным их номерам
+        """
+        for batch in self.iter_batches(columns):
+            yield batch[np.asarray(predicate(batch), dtype=bool)]
+
+    def contains(self, column: str, value: str) -> "LazyDataset":
+        """Фильтр подстроки без учета регистра, как в просмотре таблицы."""
+        return self.filter(lambda batch: batch[column].astype(str).str.contains(value, case=False).to_numpy(),
+                           columns=[column])
+
+    def sort_values(self, by: str, ascending: bool = True) -> "LazyDataset":
+        """Сортирует представление, читая только ключевой столбец.
+
+        В памяти хранятся ключи и перестановка, сами строки читаются при
+        показе страниц. Пропуски идут в конце, как у `DataFrame.sort_values`.
+        """
+        batches = list(self.iter_batches([by]))
+        if not batches:
+            return self
+        keys = pd.concat([batch[by] for batch in batches])
+        positions = keys.index.to_numpy()
+        order = keys.reset_index(drop=True).sort_values(ascending=ascending, kind="stable",
+                                                        na_position="last").index.to_numpy()
+        return self._view(rows=positions[order].astype(np.int64))
+
+    def top_k(self, by: str, k: int, ascending: bool = True) -> "LazyDataset":
+        """Первые `k` строк порядка `sort_values(by, ascending)` без сортировки всех строк.
+
+        Части читаются по одной, и из каждой вместе с уже отобранными
+        строками оставляются лучшие `k` (через `np.partition`). Для текстовых
+        столбцов выполняется обычная сортировка.
+        """
+        best_positions, best_keys = np.array([], dtype=np.int64), None
+        missing_positions = []
+        for batch in self.iter_batches([by]):
+            keys = sort_keys(batch[by], categorical=False)
+            if keys is None:
+                return self._view(rows=self.sort_values(by, ascending)._rows[:k])
+            values, missing = keys
+            positions = batch.index.to_numpy().astype(np.int64)
+            if sum(len(chunk) for chunk in missing_positions) < k:
+                missing_positions.append(positions[missing][:k])
+            values = values[~missing] if best_keys is None else np.concatenate([best_keys, values[~missing]])
+            positions = np.concatenate([best_positions, positions[~missing]])
+            best_positions, best_keys = select_top(positions, values, k, largest=not ascending)
+        if len(best_positions) < k and missing_positions:
+            # Пропуски идут в конце, как при сортировке
+            best_positions = np.concatenate([best_positions, np.concatenate(missing_positions)])[:k]
+        return self._view(rows=best_positions)
+
+    def aggregate(self, by: str, column: Optional[str] = None) -> pd.DataFrame:
+        """Потоково группирует строки по столбцу.
+
+        Args:
+            by: Столбец группировки
+            column: Числовой столбец для суммы, среднего, минимума и максимума
+                (None — только количество строк)
+
+        Returns:
+            pd.DataFrame: Индекс — значения `by`; столбцы `count` и, при
+            заданном `column`, `mean`, `min`, `max`
+        """
+        columns = [by] if column is None or column == by else [by, column]
+        partials = []
+        for batch in self.iter_batches(columns):
+            groups = batch.groupby(by, observed=True, sort=False)
+            if column is None:
+                partials.append(groups.size().to_frame("count"))
+            else:
+                partials.append(groups[column].agg(["count", "sum", "min", "max"]))
+        if not partials:
+            return pd.DataFrame(columns=["count"])
+        combined = pd.concat(partials).groupby(level=0, observed=True)
+        if column is None:
+            return combined.sum()
+        result = combined.agg({"count": "sum", "sum": "sum", "min": "min", "max": "max"})
+        result.insert(1, "mean", result["sum"] / result["count"])
+        return result.drop(columns="sum")
+
+    def unique(self, column: str) -> np.ndarray:
+        """Различные непустые значения столбца."""
+        values = [pd.unique(batch[column].dropna()) for batch in self.iter_batches([column])]
+        return pd.unique(np.concatenate(values)) if values else np.array([])
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Загружает представление в память целиком."""
+        return self.page(0, len(self)).reset_index(drop=True)
+
+
+def _parquet_parts(files: Sequence[Path]):
+    """Перечисляет группы строк файлов и возвращает их вместе со схемой первого файла."""
+    import pyarrow.parquet as pq
+
+    parts, schema = [], None
+    for path in files:
+        parquet = pq.ParquetFile(path)
+        if schema is None:
+            schema = parquet.schema_arrow
+        parts.extend(_Part(path, number, parquet.metadata.row_group(number).num_rows)
+                     for number in range(parquet.metadata.num_row_groups))
+    return parts, schema
+
+
+def _source_key(file_path: Path) -> str:
+    return hashlib.blake2b(str(file_path.resolve()).encode("utf-8"), digest_size=6).hexdigest()
+
+
+def _spill_key(file_path: Path, read_options: dict) -> str:
+    stat = file_path.stat()
+    text = f"{file_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{sorted(read_options.items())}"
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=10).hexdigest()
+
+
+def _write_chunk(chunk: pd.DataFrame, path: Path):
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    try:
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Столбцы со смешанными значениями после расширения плана сохраняются строками
+        mixed = {name: chunk[name].astype(str).where(chunk[name].notna())
+                 for name in chunk.columns if chunk[name].dtype == object}
+        table = pa.Table.from_pandas(chunk.assign(**mixed), preserve_index=False)
+    pq.write_table(table, path, compression="zstd")
+
+
+def _spills(lazy_dir: Path) -> List[Path]:
+    if not lazy_dir.is_dir():
+        return []
+    return [path for path in lazy_dir.iterdir() if path.is_dir() and not path.name.startswith(".")]
+
+
+def _spill_bytes(path: Path) -> int:
+    return sum(part.stat().st_size for part in path.glob("part-*.parquet"))
+
+
+def _evict_spills(lazy_dir: Path, keep: Path, max_bytes: int):
+    """Удаляет части, дольше всего не открывавшиеся, пока каталог больше `max_bytes`.
+
+    Время последнего открытия — время изменения каталога частей;
+    каталог `keep` не удаляется.
+    """
+    spills = _spills(lazy_dir)
+    sizes = {path: _spill_bytes(path) for path in spills}
+    total = sum(sizes.values())
+    for path in sorted(spills, key=lambda path: path.stat().st_mtime_ns):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= sizes[path]
+
+
+def spill_csv(file_path: Path, lazy_dir: Path = DEFAULT_LAZY_DIR,
+              chunk_rows: int = DEFAULT_CHUNK_ROWS, max_bytes: int = DEFAULT_MAX_BYTES,
+              **read_options) -> Path:
+    """Перекладывает CSV в каталог частей Parquet, читая его чанками.
+
+    Если для неизмененного файла с теми же параметрами части уже записаны,
+    они переиспользуются. Перед записью новых частей удаляются прежние части
+    того же файла, после записи — части других файлов, дольше всего не
+    открывавшиеся, пока общий размер каталога больше `max_bytes`.
+
+    Args:
+        file_path: Путь к CSV-файлу
+        lazy_dir: Каталог для частей
+        chunk_rows: Количество строк в части
+        max_bytes: Ограничение суммарного размера частей в `lazy_dir`
+        **read_options: Параметры `pd.read_csv`
+
+    Returns:
+        Path: Каталог с частями `part-00000.parquet`, ...
+    """
+    from data_streaming import build_dtype_plan, iter_csv_chunks
+
+    file_path = Path(file_path)
+    lazy_dir = Path(lazy_dir)
+    prefix = f"{file_path.name.split('.')[0]}-{_source_key(file_path)}-"
+    target = lazy_dir / f"{prefix}{_spill_key(file_path, read_options)}"
+    if target.is_dir():
+        os.utime(target)
+        return target
+
+    # Части прежней версии файла или с другими параметрами чтения больше не нужны
+    for stale in _spills(lazy_dir):
+        if stale.name.startswith(prefix):
+            shutil.rmtree(stale, ignore_errors=True)
+    tmp_dir = target.with_name(f".{target.name}.part")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    try:
+        plan = build_dtype_plan(pd.read_csv(file_path, nrows=10_000, **read_options))
+        for number, chunk in enumerate(iter_csv_chunks(file_path, plan, chunksize=chunk_rows, **read_options)):
+            _write_chunk(chunk, tmp_dir / f"part-{number:05d}.parquet")
+        os.replace(tmp_dir, target)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    os.utime(target)
+    _evict_spills(lazy_dir, target, max_bytes)
+    return target
+
+
+def open_lazy(file_path: Path, lazy_dir: Path = DEFAULT_LAZY_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+              **read_options) -> LazyDataset:
+    """Открывает CSV, файл Parquet или каталог файлов Parquet как `LazyDataset`.
+
+    Args:
+        file_path: Путь к данным
+        lazy_dir: Каталог для частей, получаемых из CSV
+        max_bytes: Ограничение суммарного размера частей в `lazy_dir`
+        **read_options: Параметры `pd.read_csv` для CSV
+
+    Returns:
+        LazyDataset: Датасет без загрузки строк в память
+
+    Raises:
+        ValueError: Если формат не поддерживается
+    """
+    _require_pyarrow()
+    file_path = Path(file_path)
+    if file_path.is_dir():
+        files = sorted(f for f in file_path.iterdir() if f.suffix.lower() in PARQUET_SUFFIXES)
+    elif file_path.suffix.lower() in PARQUET_SUFFIXES:
+        files = [file_path]
+    elif file_path.suffix.lower() == ".csv":
+        spilled = spill_csv(file_path, lazy_dir, max_bytes=max_bytes, **read_options)
+        files = sorted(spilled.glob("part-*.parquet"))
+    else:
+        raise ValueError(f"Неподдерживаемый формат для работы вне памяти: {file_path.suffix}")
+    if not files:
+        raise ValueError(f"Нет файлов Parquet: {file_path}")
+    parts, schema = _parquet_parts(files)
+    columns = [name for name in schema.names if not name.startswith("__index_level_")]
+    return LazyDataset(parts, schema, columns, source=file_path)
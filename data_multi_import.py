@@ -0,0 +1,226 @@
+"""Модуль параллельного импорта набора файлов по каталогу или glob-шаблону.
+
+Файлы разбираются одновременно в пуле процессов, после чего схемы
+согласуются (объединение столбцов, общий тип для каждого столбца), и данные
+собираются один раз: по одному копированию на столбец без повторных
+`pd.concat` всего DataFrame. Каждая строка помечается именем исходного файла.
+Сжатые CSV читаются напрямую, а архивы раскрываются в список своих файлов данных.
+
+Функции:
+    collect_sources: Отбирает файлы данных и раскрывает архивы.
+    expand_sources: Раскрывает каталог или glob-шаблон в список файлов.
+    harmonize_frames: Согласует схемы и собирает DataFrame.
+    import_many: Параллельно читает файлы и собирает общий DataFrame.
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from data_archives import ArchiveMember, inner_suffix, is_archive, list_members, read_member
+from data_columnar import is_columnar, read_columnar
+from data_sniffer import read_csv_auto
+
+SOURCE_COLUMN = "Source_File"
+MULTI_SUFFIXES = ('.csv', '.xlsx', '.xls', '.parquet', '.pq', '.feather', '.arrow', '.ipc')
+
+
+def is_multi_source(path: str) -> bool:
+    """Проверяет, задает ли строка каталог или glob-шаблон."""
+    return Path(path).is_dir() or glob.has_magic(path)
+
+
+def collect_sources(candidates: Iterable[Path]) -> list:
+    """Отбирает файлы поддерживаемых форматов и заменяет архивы их содержимым.
+
+    Args:
+        candidates: Пути к файлам
+
+    Returns:
+        list: Пути к файлам и члены архивов (`ArchiveMember`) в порядке имен
+    """
+    sources = []
+    for path in sorted(p for p in candidates if p.is_file()):
+        if is_archive(path):
+            sources.extend(list_members(path))
+        elif inner_suffix(path) in MULTI_SUFFIXES:
+            sources.append(path)
+    return sources
+
+
+def expand_sources(path: str) -> list:
+    """Раскрывает каталог или glob-шаблон в отсортированный список файлов.
+
+    Args:
+        path: Каталог (берутся все поддерживаемые файлы) или шаблон вида `data/*.csv`
+
+    Returns:
+        list: Найденные файлы поддерживаемых форматов и члены найденных архивов
+    """
+    if Path(path).is_dir():
+        candidates = Path(path).iterdir()
+    else:
+        candidates = (Path(match) for match in glob.glob(path, recursive=True))
+    return collect_sources(candidates)
+
+
+def _read_one(file_path, streaming: bool) -> pd.DataFrame:
+    """Читает один файл или член архива в процессе пула."""
+    if isinstance(file_path, ArchiveMember):
+        return read_member(file_path, streaming)
+    suffix = inner_suffix(file_path)
+    if is_columnar(file_path):
+        return read_columnar(file_path)
+    if suffix == '.csv':
+        return read_csv_auto(file_path, streaming=streaming, track_memory=False)[0]
+    return pd.read_excel(file_path)
+
+
+def _common_datetime(dtypes: list):
+    """Общий тип дат: самая мелкая единица и общий часовой пояс (разные пояса — UTC).
+
+    Returns:
+        Тип дат либо None, если наивные даты смешаны с датами с часовым поясом
+    """
+    zones = {getattr(dtype, "tz", None) for dtype in dtypes}
+    unit = np.result_type(*[np.dtype(f"M8[{np.datetime_data(dtype)[0] if isinstance(dtype, np.dtype) else dtype.unit}]")
+                            for dtype in dtypes])
+    if zones == {None}:
+        return unit
+    if None in zones:
+        return None
+    return pd.DatetimeTZDtype(unit=np.datetime_data(unit)[0], tz=zones.pop() if len(zones) == 1 else "UTC")
+
+
+def _common_dtype(parts: List[pd.Series], has_gaps: bool):
+    """Выбирает общий тип столбца по типам во всех файлах.
+
+    Даты, строки и типы pandas с пропусками (`Int64`, `boolean`, `string`)
+    сохраняются; к `object` приводятся только несовместимые типы.
+
+    Returns:
+        Тип numpy/pandas либо строка "category" для объединения категорий
+    """
+    dtypes = [part.dtype for part in parts]
+    if all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+        # Категории с разными типами значений (текст и числа) не объединяются
+        if all(dtype.categories.dtype == dtypes[0].categories.dtype for dtype in dtypes):
+            return "category"
+        return np.dtype("object")
+    if all(dtype == dtypes[0] for dtype in dtypes) and pd.api.types.is_extension_array_dtype(dtypes[0]):
+        return dtypes[0]
+    if all(pd.api.types.is_datetime64_any_dtype(dtype) for dtype in dtypes):
+        common = _common_datetime(dtypes)
+        if common is not None:
+            return common
+    if all(isinstance(dtype, pd.StringDtype) for dtype in dtypes):
+        return dtypes[0]
+    if all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) for dtype in dtypes) \
+            and any(pd.api.types.is_extension_array_dtype(dtype) for dtype in dtypes):
+        # Целые с пропусками остаются целыми в Int64, иначе — Float64
+        return pd.Int64Dtype() if all(pd.api.types.is_integer_dtype(dtype) for dtype in dtypes) else pd.Float64Dtype()
+    if all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+           and isinstance(dtype, np.dtype) for dtype in dtypes):
+        common = np.result_type(*dtypes)
+        if has_gaps and common.kind in "iu":
+            return np.dtype("float64")
+        return common
+    if all(pd.api.types.is_bool_dtype(dtype) for dtype in dtypes):
+        if has_gaps or not all(isinstance(dtype, np.dtype) for dtype in dtypes):
+            return pd.BooleanDtype()
+        return np.dtype("bool")
+    return np.dtype("object")
+
+
+def harmonize_frames(frames: Sequence[pd.DataFrame], names: Sequence[str]) -> pd.DataFrame:
+    """Согласует схемы и собирает DataFrame с меткой исходного файла.
+
+    Args:
+        frames: DataFrame каждого файла
+        names: Пути файлов в том же порядке (уникальные)
+
+    Returns:
+        pd.DataFrame: Объединение столбцов всех файлов и столбец `Source_File`
+    """
+    lengths = [len(frame) for frame in frames]
+    total = sum(lengths)
+
+    column_order = []
+    for frame in frames:
+        column_order.extend(col for col in frame.columns if col not in column_order)
+
+    columns = {}
+    for column in column_order:
+        present = [frame[column] for frame in frames if column in frame.columns]
+        has_gaps = len(present) < len(frames)
+        dtype = _common_dtype(present, has_gaps)
+
+        if dtype == "category":
+            # Пропуски отсутствующего столбца — пустые категории того же типа, иначе объединение не сработает
+            empty = present[0].cat.categories[:0]
+            parts = [
+                frame[column] if column in frame.columns
+                else pd.Series(pd.Categorical.from_codes(np.full(len(frame), -1), categories=empty))
+                for frame in frames
+            ]
+            columns[column] = pd.Series(union_categoricals(parts, ignore_order=True))
+            continue
+        if not isinstance(dtype, np.dtype) or dtype.kind == "M":
+            # Даты и типы pandas собираются через concat: он хранит пропуски в их собственном виде
+            parts = [
+                frame[column].astype(dtype) if column in frame.columns
+                else pd.Series(index=pd.RangeIndex(len(frame)), dtype=dtype)
+                for frame in frames
+            ]
+            columns[column] = pd.concat(parts, ignore_index=True)
+            continue
+
+        values = np.empty(total, dtype=dtype)
+        if has_gaps and dtype.kind == "f":
+            values.fill(np.nan)
+        offset = 0
+        for frame, length in zip(frames, lengths):
+            if column in frame.columns:
+                values[offset:offset + length] = frame[column].to_numpy(dtype=dtype)
+            offset += length
+        columns[column] = values
+
+    columns[SOURCE_COLUMN] = pd.Categorical.from_codes(
+        np.repeat(np.arange(len(names)), lengths), categories=list(names)
+    )
+    return pd.DataFrame(columns)
+
+
+def import_many(files: Sequence, streaming: bool = False, max_workers: int = None, deduplicator=None):
+    """Параллельно читает файлы и собирает общий DataFrame.
+
+    Args:
+        files: Файлы для импорта (пути или члены архивов `ArchiveMember`)
+        streaming: Читать CSV чанками по плану типов
+        max_workers: Количество процессов (по умолчанию — число ядер)
+        deduplicator: `RowDeduplicator` для удаления повторов между всеми файлами
+            (столбец `Source_File` стоит исключить из сравнения)
+
+    Returns:
+        Tuple[pd.DataFrame, float]: Собранные данные и время импорта в секундах
+    """
+    started = time.perf_counter()
+    files = [f if isinstance(f, ArchiveMember) else Path(f) for f in files]
+    if len(files) == 1:
+        frames = [_read_one(files[0], streaming)]
+    else:
+        workers = min(len(files), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(_read_one, files, [streaming] * len(files)))
+
+    df = harmonize_frames(frames, [str(f) for f in files])
+    if deduplicator is not None:
+        df = deduplicator.filter_frame(df)
+    return df, time.perf_counter() - started
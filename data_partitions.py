@@ -0,0 +1,290 @@
+"""Модуль секционированного (Hive-style) хранения датасета в Parquet.
+
+При экспорте строки раскладываются по каталогам вида
+`<корень>/Cancer_Type=Lung/part-00000.parquet` по значениям выбранных
+столбцов, и секции записываются параллельно. При импорте фильтр по
+секциям применяется к именам каталогов до открытия файлов, поэтому с диска
+читаются только подходящие секции, а не весь датасет.
+
+Классы:
+    Partition: Одна секция датасета.
+    PartitionedImport: Итоги чтения секционированного датасета.
+
+Функции:
+    is_partitioned_dataset: Проверяет, является ли каталог секционированным датасетом.
+    list_partitions: Перечисляет секции датасета.
+    parse_partition_filter: Разбирает фильтр вида `Cancer_Type=Lung,Breast`.
+    write_partitioned: Записывает DataFrame по секциям.
+    read_partitioned: Читает секции, подходящие под фильтр.
+"""
+
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+from data_columnar import PARQUET_SUFFIXES, _require_pyarrow
+
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+DEFAULT_ROW_GROUP_SIZE = 256_000
+
+
+class Partition:
+    """Одна секция датасета.
+
+    Attributes:
+        values: Значения столбцов секционирования по именам (строки)
+        files: Файлы Parquet секции
+    """
+
+    def __init__(self, values: Dict[str, str], files: List[Path]):
+        self.values = values
+        self.files = files
+
+    @property
+    def bytes(self) -> int:
+        return sum(f.stat().st_size for f in self.files)
+
+    def matches(self, filters: Dict[str, Sequence[str]]) -> bool:
+        """Проверяет, проходит ли секция фильтр (значения внутри столбца — через ИЛИ)."""
+        return all(self.values.get(column) in allowed for column, allowed in filters.items())
+
+
+class PartitionedImport:
+    """Итоги чтения секционированного датасета.
+
+    Attributes:
+        partitions_read: Количество прочитанных секций
+        partitions_total: Всего секций
+        bytes_read: Прочитано байт
+        bytes_total: Размер всего датасета
+        seconds: Время чтения
+    """
+
+    def __init__(self, partitions_read: int, partitions_total: int, bytes_read: int,
+                 bytes_total: int, seconds: float):
+        self.partitions_read = partitions_read
+        self.partitions_total = partitions_total
+        self.bytes_read = bytes_read
+        self.bytes_total = bytes_total
+        self.seconds = seconds
+
+    def report(self) -> str:
+        share = self.bytes_read / self.bytes_total if self.bytes_total else 1.0
+        return (f"Секций прочитано: {self.partitions_read} из {self.partitions_total}, "
+                f"{self.bytes_read / 2 ** 20:.1f} из {self.bytes_total / 2 ** 20:.1f} МБ ({share:.1%}), "
+                f"время: {self.seconds:.2f} с")
+
+
+def _partition_dir_name(column: str, value) -> str:
+    text = NULL_PARTITION if pd.isna(value) else str(value)
+    return f"{quote(str(column), safe='')}={quote(text, safe='')}"
+
+
+def is_partitioned_dataset(path) -> bool:
+    """Проверяет, что каталог содержит подкаталоги секций вида `столбец=значение`."""
+    path = Path(path)
+    if not path.is_dir():
+        return False
+    return any(child.is_dir() and "=" in child.name for child in path.iterdir())
+
+
+def list_partitions(root: Path) -> List[Partition]:
+    """Перечисляет секции датасета, не открывая файлы данных.
+
+    Args:
+        root: Корневой каталог датасета
+
+    Returns:
+        List[Partition]: Секции с непустым списком файлов Parquet
+    """
+    partitions = []
+
+    def walk(directory: Path, values: Dict[str, str]):
+        files = []
+        for child in sorted(directory.iterdir()):
+            if child.is_dir() and "=" in child.name:
+                column, _, value = child.name.partition("=")
+                walk(child, {**values, unquote(column): unquote(value)})
+            elif child.is_file() and child.suffix.lower() in PARQUET_SUFFIXES:
+                files.append(child)
+        if files and values:
+            partitions.append(Partition(values, files))
+
+    walk(Path(root), {})
+    return partitions
+
+
+def parse_partition_filter(text: str) -> Dict[str, List[str]]:
+    """Разбирает фильтр по секциям.
+
+    Args:
+        text: Условия через `;`, значения через запятую:
+            `Cancer_Type=Lung,Breast; Site=Moscow`
+
+    Returns:
+        Dict[str, List[str]]: Допустимые значения по столбцам
+
+    Raises:
+        ValueError: Если условие не содержит `=`
+    """
+    filters = {}
+    for part in filter(None, (chunk.strip() for chunk in text.split(";"))):
+        column, sep, values = part.partition("=")
+        if not sep:
+            raise ValueError(f"Не удалось разобрать условие: {part}")
+        filters[column.strip()] = [value.strip() for value in values.split(",")]
+    return filters
+
+
+def write_partitioned(df: pd.DataFrame, root: Path, partition_by: Sequence[str],
+                      max_workers: Optional[int] = None, on_partition=None,
+                      row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> int:
+    """Записывает DataFrame в каталоги секций, по секции на поток.
+
+    Данные пишутся во временный каталог, который по завершении
+    переименовывается в `root`, так что недописанный датасет не появляется
+    под итоговым именем.
+
+    Args:
+        df: Данные для записи
+        root: Корневой каталог датасета (не должен существовать)
+        partition_by: Столбцы секционирования
+        max_workers: Количество потоков (по умолчанию — число ядер)
+        on_partition: Функция, вызываемая с количеством строк после записи секции
+        row_group_size: Количество строк в группе Parquet
+
+    Returns:
+        int: Количество записанных секций
+
+    Raises:
+        FileExistsError: Если каталог `root` уже существует
+        KeyError: Если столбца секционирования нет в данных
+    """
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    root = Path(root)
+    if root.exists():
+        raise FileExistsError(f"Каталог уже существует: {root}")
+    partition_by = list(partition_by)
+    missing = [column for column in partition_by if column not in df.columns]
+    if missing:
+        raise KeyError(f"Нет столбцов для секционирования: {', '.join(missing)}")
+
+    data_columns = [column for column in df.columns if column not in partition_by]
+    groups = df.groupby(partition_by, observed=True, dropna=False, sort=False).indices
+    tmp_root = root.with_name(f".{root.name}.part")
+    shutil.rmtree(tmp_root, ignore_errors=True)
+
+    def write(item):
+        key, positions = item
+        key = key if isinstance(key, tuple) else (key,)
+        directory = tmp_root.joinpath(*(_partition_dir_name(c, v) for c, v in zip(partition_by, key)))
+        directory.mkdir(parents=True, exist_ok=True)
+        part = df.iloc[np.sort(positions)][data_columns]
+        table = pa.Table.from_pandas(part, preserve_index=False)
+        pq.write_table(table, directory / "part-00000.parquet",
+                       row_group_size=row_group_size, compression="zstd")
+        if on_partition is not None:
+            on_partition(len(part))
+
+    try:
+        workers = max(1, min(len(groups), max_workers or os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(write, groups.items()))
+        os.replace(tmp_root, root)
+    except BaseException:
+        shutil.rmtree(tmp_root, ignore_errors=True)
+        raise
+    return len(groups)
+
+
+def _is_numeric_partition(values: List[str]) -> bool:
+    """Проверяет, что все значения столбца секционирования — числа."""
+    present = [value for value in values if value != NULL_PARTITION]
+    numeric = pd.to_numeric(pd.Series(present, dtype=object), errors="coerce")
+    return bool(present) and numeric.notna().all()
+
+
+def read_partitioned(root: Path, filters: Optional[Dict[str, Sequence[str]]] = None,
+                     columns: Optional[Sequence[str]] = None,
+                     max_workers: Optional[int] = None):
+    """Читает только секции, подходящие под фильтр.
+
+    Args:
+        root: Корневой каталог датасета
+        filters: Допустимые значения по столбцам секционирования (None — все секции)
+        columns: Столбцы для чтения, в том числе столбцы секционирования (None — все)
+        max_workers: Количество потоков чтения
+
+    Returns:
+        Tuple[pd.DataFrame, PartitionedImport]: Данные со столбцами секционирования
+        и итоги чтения
+
+    Raises:
+        KeyError: Если фильтр ссылается на столбец, по которому нет секций
+    """
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    started = time.perf_counter()
+    partitions = list_partitions(root)
+    known = {column for partition in partitions for column in partition.values}
+    unknown = [column for column in (filters or {}) if column not in known]
+    if unknown:
+        raise KeyError(f"Нет секций по столбцам: {', '.join(unknown)}")
+    selected = [p for p in partitions if p.matches(filters)] if filters else partitions
+
+    files = [(partition, f) for partition in selected for f in partition.files]
+    partition_columns = list(dict.fromkeys(c for p in partitions for c in p.values))
+    columns = list(columns) if columns else None
+    # Столбцы секционирования есть только в именах каталогов: из файлов читаются остальные
+    file_columns = None if columns is None else [c for c in columns if c not in partition_columns]
+    if columns is not None:
+        partition_columns = [c for c in partition_columns if c in columns]
+
+    def read(item):
+        partition, file = item
+        table = pq.read_table(file, columns=file_columns, memory_map=True)
+        return partition, table
+
+    workers = max(1, min(len(files), max_workers or os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(read, files))
+
+    if not parts:
+        df = pd.DataFrame(columns=columns if columns is not None else partition_columns)
+    else:
+        lengths = [table.num_rows for _, table in parts]
+        if file_columns == []:
+            df = pd.DataFrame(index=pd.RangeIndex(sum(lengths)))
+        else:
+            df = pa.concat_tables([table for _, table in parts], promote_options="default").to_pandas()
+        for column in partition_columns:
+            values = [partition.values.get(column, NULL_PARTITION) for partition, _ in parts]
+            if _is_numeric_partition([p.values.get(column, NULL_PARTITION) for p in partitions]):
+                numbers = pd.to_numeric(pd.Series([None if v == NULL_PARTITION else v for v in values], dtype=object))
+                repeated = np.repeat(numbers.to_numpy(), lengths)
+            else:
+                categories = sorted(set(values) - {NULL_PARTITION})
+                codes = np.repeat([categories.index(v) if v != NULL_PARTITION else -1 for v in values], lengths)
+                repeated = pd.Categorical.from_codes(codes, categories=categories)
+            df[column] = repeated
+        if columns is not None:
+            df = df[columns]
+
+    stats = PartitionedImport(
+        partitions_read=len(selected),
+        partitions_total=len(partitions),
+        bytes_read=sum(f.stat().st_size for _, f in files),
+        bytes_total=sum(partition.bytes for partition in partitions),
+        seconds=time.perf_counter() - started,
+    )
+    return df, stats
@@ -0,0 +1,196 @@
+"""Модуль профилирования датасета при импорте.
+
+Профиль считается один раз сразу после импорта: для каждого столбца
+векторизованно вычисляются тип, число пропусков, min/max/mean, оценка
+количества различных значений и самые частые значения. Столбцы
+обрабатываются параллельно. Профиль привязывается к DataFrame и затем
+переиспользуется просмотрщиком, визуализатором и `CancerPredictor`
+вместо повторных вычислений.
+
+Классы:
+    ColumnProfile: Статистика одного столбца.
+    DatasetProfile: Профиль всего датасета.
+
+Функции:
+    column_kind: Определяет вид столбца по типу данных.
+    profile_dataframe: Строит профиль DataFrame.
+    attach_profile: Привязывает профиль к DataFrame.
+    get_profile: Возвращает привязанный профиль или None.
+"""
+
+import os
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+TOP_VALUES = 5
+EXACT_DISTINCT_LIMIT = 200_000
+KMV_SIZE = 4096
+
+NUMERIC = "numeric"
+CATEGORICAL = "categorical"
+BOOLEAN = "boolean"
+DATETIME = "datetime"
+
+
+def column_kind(series: pd.Series) -> str:
+    """Определяет вид столбца по типу данных.
+
+    Returns:
+        str: `numeric`, `boolean`, `datetime` или `categorical` (строки и категории)
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return BOOLEAN
+    if pd.api.types.is_numeric_dtype(series):
+        return NUMERIC
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return DATETIME
+    return CATEGORICAL
+
+
+def _estimate_distinct(series: pd.Series) -> int:
+    """Оценивает количество различных непустых значений.
+
+    Для небольших столбцов считается точно, для больших — по 64-битным хэшам
+    методом k минимальных значений (KMV): `np.partition` за O(n) отбирает
+    наименьшие хэши, и без повторов сортируются только они, а не весь
+    столбец. Относительная ошибка оценки — около 1/√k (1,6 %).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        return int(np.count_nonzero(np.bincount(codes[codes >= 0], minlength=1)))
+    values = series.dropna()
+    if len(values) <= EXACT_DISTINCT_LIMIT:
+        return int(values.nunique())
+
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+    # Среди k наименьших хэшей бывают повторы: окно расширяется, пока в нем не наберется k различных
+    window = KMV_SIZE
+    while True:
+        smallest = np.unique(np.partition(hashes, window - 1)[:window])
+        if len(smallest) >= KMV_SIZE:
+            break
+        if window >= len(hashes):
+            return len(smallest)
+        # Следующее окно — по доле повторов в текущем, с запасом
+        window = min(len(hashes), max(window * 2, int(window * KMV_SIZE / max(len(smallest), 1) * 1.25)))
+    kth = smallest[KMV_SIZE - 1]
+    return int((KMV_SIZE - 1) / (float(kth) / 2.0 ** 64))
+
+
+class ColumnProfile:
+    """Статистика одного столбца.
+
+    Attributes:
+        name: Имя столбца
+        dtype: Тип данных в виде строки
+        kind: Вид столбца (`numeric`, `categorical`, `boolean`, `datetime`)
+        count: Количество непустых значений
+        nulls: Количество пропусков
+        distinct: Оценка количества различных значений
+        minimum: Минимальное значение (для числовых столбцов и дат)
+        maximum: Максимальное значение (для числовых столбцов и дат)
+        mean: Среднее (для числовых столбцов)
+        top_values: Самые частые значения и их количество
+    """
+
+    def __init__(self, series: pd.Series):
+        self.name = series.name
+        self.dtype = str(series.dtype)
+        self.kind = column_kind(series)
+        self.count = int(series.count())
+        self.nulls = int(len(series) - self.count)
+        self.distinct = _estimate_distinct(series)
+        self.minimum = self.maximum = self.mean = None
+
+        if self.kind in (NUMERIC, DATETIME) and self.count:
+            self.minimum = series.min()
+            self.maximum = series.max()
+        if self.kind == NUMERIC and self.count:
+            self.mean = float(series.mean())
+
+        counts = series.value_counts(sort=True, dropna=True).head(TOP_VALUES)
+        self.top_values = list(zip(counts.index.tolist(), counts.tolist()))
+
+    def as_row(self) -> list:
+        """Возвращает строку для табличного вывода."""
+        top = ", ".join(f"{value} ({count})" for value, count in self.top_values[:3])
+        mean = f"{self.mean:.4g}" if self.mean is not None else ""
+        return [self.name, self.dtype, self.nulls, self.distinct,
+                "" if self.minimum is None else self.minimum,
+                "" if self.maximum is None else self.maximum,
+                mean, top]
+
+
+class DatasetProfile:
+    """Профиль датасета.
+
+    Attributes:
+        rows: Количество строк
+        columns: Профили столбцов по именам (в порядке столбцов DataFrame)
+        seconds: Время построения профиля
+    """
+
+    HEADERS = ["Столбец", "Тип", "Пропуски", "Различных", "Min", "Max", "Среднее", "Частые значения"]
+
+    def __init__(self, rows: int, columns: Dict[str, ColumnProfile], seconds: float):
+        self.rows = rows
+        self.columns = columns
+        self.seconds = seconds
+
+    def columns_of_kind(self, *kinds: str) -> List[str]:
+        """Возвращает имена столбцов указанных видов."""
+        return [name for name, column in self.columns.items() if column.kind in kinds]
+
+    def numeric_columns(self) -> List[str]:
+        return self.columns_of_kind(NUMERIC)
+
+    def categorical_columns(self) -> List[str]:
+        return self.columns_of_kind(CATEGORICAL)
+
+    def rows_for_table(self) -> List[list]:
+        """Возвращает строки профиля для вывода через tabulate."""
+        return [column.as_row() for column in self.columns.values()]
+
+
+def profile_dataframe(df: pd.DataFrame, max_workers: Optional[int] = None) -> DatasetProfile:
+    """Строит профиль DataFrame, обрабатывая столбцы параллельно.
+
+    Args:
+        df: Данные для профилирования
+        max_workers: Количество потоков (по умолчанию — число ядер)
+
+    Returns:
+        DatasetProfile: Профиль датасета
+    """
+    started = time.perf_counter()
+    names = list(df.columns)
+    workers = max(1, min(len(names), max_workers or os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        profiles = list(pool.map(lambda name: ColumnProfile(df[name]), names))
+    return DatasetProfile(len(df), dict(zip(names, profiles)), time.perf_counter() - started)
+
+
+_profiles = {}
+
+
+def attach_profile(df: pd.DataFrame, profile: DatasetProfile):
+    """Привязывает профиль к объекту DataFrame.
+
+    Профиль хранится, пока жив сам DataFrame; новый DataFrame, полученный
+    фильтрацией или конкатенацией, профиля не наследует.
+    """
+    key = id(df)
+    _profiles[key] = (weakref.ref(df, lambda _: _profiles.pop(key, None)), profile)
+
+
+def get_profile(df: pd.DataFrame) -> Optional[DatasetProfile]:
+    """Возвращает профиль, привязанный к этому объекту DataFrame, или None."""
+    entry = _profiles.get(id(df))
+    if entry is None or entry[0]() is not df:
+        return None
+    return entry[1]
@@ -0,0 +1,260 @@
+"""Модуль определения параметров CSV по образцу байт.
+
+Выгрузки клинических систем часто приходят в cp1251 с разделителем `;` и
+десятичной запятой, и `pd.read_csv` с параметрами по умолчанию либо падает,
+либо медленно декодирует строки. Здесь по первым килобайтам файла
+определяются кодировка, разделитель, десятичный знак, наличие строки
+заголовка и столбцы с датами, а затем выбирается самый быстрый движок
+разбора, поддерживающий найденные параметры.
+
+Классы:
+    CsvDialect: Найденные параметры CSV.
+
+Функции:
+    sniff_csv: Определяет параметры CSV по образцу байт.
+    read_csv_auto: Читает CSV с найденными параметрами.
+"""
+
+import bz2
+import csv
+import gzip
+import lzma
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from data_archives import COMPRESSIONS
+from data_streaming import ImportStats, read_csv_chunked
+
+SAMPLE_BYTES = 64 * 1024
+DELIMITERS = (",", ";", "\t", "|")
+DATE_FORMATS = (
+    "%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%Y/%m/%d",
+    "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%d.%m.%Y %H:%M:%S", "%d.%m.%Y %H:%M",
+)
+
+_NUMBER = re.compile(r"^[-+]?(\d+([.,]\d*)?|[.,]\d+)([eE][-+]?\d+)?$")
+_DECIMAL_COMMA = re.compile(r"^[-+]?\d*,\d+$")
+_DATE_LIKE = re.compile(r"^\d{1,4}[-./]\d{1,2}[-./]\d{1,4}")
+
+
+class CsvDialect:
+    """Параметры CSV, найденные по образцу.
+
+    Attributes:
+        encoding: Кодировка (`utf-8`, `utf-8-sig`, `cp1251`, `latin-1`, ...)
+        delimiter: Разделитель полей
+        decimal: Десятичный знак
+        header: Номер строки заголовка (None — заголовка нет)
+        date_formats: Форматы столбцов с датами по именам (или номерам) столбцов
+    """
+
+    def __init__(self, encoding: str = "utf-8", delimiter: str = ",", decimal: str = ".",
+                 header: Optional[int] = 0, date_formats: Optional[Dict] = None):
+        self.encoding = encoding
+        self.delimiter = delimiter
+        self.decimal = decimal
+        self.header = header
+        self.date_formats = date_formats or {}
+
+    def engine(self, chunked: bool = False) -> str:
+        """Выбирает самый быстрый движок, поддерживающий эти параметры.
+
+        Движок pyarrow разбирает файл в несколько потоков и сам перекодирует
+        строки, но не умеет читать чанками; тогда используется движок C.
+        """
+        if not chunked and len(self.delimiter) == 1:
+            try:
+                import pyarrow  # noqa: F401
+                return "pyarrow"
+            except ImportError:
+                pass
+        return "c" if len(self.delimiter) == 1 else "python"
+
+    def read_options(self, chunked: bool = False) -> dict:
+        """Возвращает параметры `pd.read_csv` для этих настроек.
+
+        Args:
+            chunked: Параметры для чтения чанками (`chunksize`, `nrows`)
+        """
+        options = {
+            "encoding": self.encoding,
+            "sep": self.delimiter,
+            "decimal": self.decimal,
+            "header": self.header,
+            "engine": self.engine(chunked),
+        }
+        if self.date_formats:
+            options["parse_dates"] = list(self.date_formats)
+            options["date_format"] = dict(self.date_formats)
+        return options
+
+    def describe(self, chunked: bool = False) -> str:
+        """Возвращает описание параметров для вывода пользователю."""
+        delimiter = {"\t": "табуляция"}.get(self.delimiter, self.delimiter)
+        header = "есть" if self.header is not None else "нет"
+        dates = ", ".join(map(str, self.date_formats)) or "нет"
+        return (f"Кодировка: {self.encoding}, разделитель: '{delimiter}', десятичный знак: '{self.decimal}', "
+                f"заголовок: {header}, даты: {dates}, движок: {self.engine(chunked)}")
+
+
+def _open_raw(source, compression: Optional[str]):
+    """Открывает распакованный бинарный поток источника."""
+    if callable(source):
+        raw = source()
+    else:
+        raw = open(source, "rb")
+        if compression is None:
+            compression = COMPRESSIONS.get(Path(source).suffix.lower())
+    return raw, compression
+
+
+def _read_sample(source, compression: Optional[str], size: int) -> bytes:
+    """Читает первые `size` байт распакованных данных."""
+    raw, compression = _open_raw(source, compression)
+    with raw as stream:
+        if compression == "gzip":
+            stream = gzip.GzipFile(fileobj=stream)
+        elif compression == "bz2":
+            stream = bz2.BZ2File(stream)
+        elif compression == "xz":
+            stream = lzma.LZMAFile(stream)
+        elif compression == "zstd":
+            import zstandard
+            stream = zstandard.ZstdDecompressor().stream_reader(stream)
+        return stream.read(size)
+
+
+def _detect_encoding(sample: bytes) -> str:
+    if sample.startswith(b"\xef\xbb\xbf"):
+        return "utf-8-sig"
+    if sample.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "utf-16"
+    try:
+        sample.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # Образец мог оборваться посреди многобайтового символа
+        if e.start >= len(sample) - 3:
+            return "utf-8"
+    # Однобайтовая кириллица: в cp1251 буквы занимают 0xC0-0xFF
+    high = sum(1 for byte in sample if byte >= 0x80)
+    cyrillic = sum(1 for byte in sample if byte >= 0xC0 or byte in (0xA8, 0xB8))
+    return "cp1251" if high and cyrillic / high > 0.7 else "latin-1"
+
+
+def _detect_delimiter(lines: List[str]) -> str:
+    """Выбирает разделитель, дающий одинаковое число полей во всех строках образца."""
+    best, best_score = ",", (0.0, 0)
+    for delimiter in DELIMITERS:
+        widths = [len(row) for row in csv.reader(lines, delimiter=delimiter)]
+        width, count = Counter(widths).most_common(1)[0]
+        if width < 2:
+            continue
+        score = (count / len(widths), width)
+        if score > best_score:
+            best, best_score = delimiter, score
+    return best
+
+
+def _is_number(value: str) -> bool:
+    return bool(_NUMBER.match(value.strip()))
+
+
+def _detect_date_format(values: List[str]) -> Optional[str]:
+    values = [value.strip() for value in values if value.strip()]
+    if not values or not all(_DATE_LIKE.match(value) for value in values):
+        return None
+    for date_format in DATE_FORMATS:
+        parsed = pd.to_datetime(pd.Series(values), format=date_format, errors="coerce")
+        if parsed.notna().all():
+            return date_format
+    return None
+
+
+def sniff_csv(source, compression: Optional[str] = None, sample_bytes: int = SAMPLE_BYTES) -> CsvDialect:
+    """Определяет параметры CSV по первым байтам данных.
+
+    Args:
+        source: Путь к CSV-файлу (сжатие определяется по расширению) или функция,
+            открывающая бинарный поток
+        compression: Сжатие потока в терминах pandas (`gzip`, `bz2`, `xz`, `zstd`)
+        sample_bytes: Размер образца в байтах
+
+    Returns:
+        CsvDialect: Найденные параметры
+    """
+    sample = _read_sample(source, compression, sample_bytes)
+    if len(sample) == sample_bytes:
+        sample = sample[:sample.rfind(b"\n") + 1] or sample
+    encoding = _detect_encoding(sample)
+    text = sample.decode(encoding, errors="ignore")
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return CsvDialect(encoding=encoding)
+
+    delimiter = _detect_delimiter(lines[:200])
+    rows = list(csv.reader(lines, delimiter=delimiter))
+    first, data = rows[0], rows[1:] or rows
+    width = len(first)
+    columns = [[row[i] for row in data if i < len(row)] for i in range(width)]
+
+    numeric = [bool(col) and all(_is_number(value) for value in col if value.strip()) for col in columns]
+    decimal = "."
+    if delimiter != "," and any(
+            is_num and any(_DECIMAL_COMMA.match(value.strip()) for value in col)
+            for is_num, col in zip(numeric, columns)):
+        decimal = ","
+
+    # Заголовок есть, если в первой строке нет чисел там, где в данных числа,
+    # или в ней вообще нет чисел
+    header_numeric = [_is_number(value) for value in first]
+    has_header = any(is_num and not first_num for is_num, first_num in zip(numeric, header_numeric)) \
+        or not any(header_numeric)
+    header = 0 if has_header else None
+    if header is None:
+        columns = [[row[i] for row in rows if i < len(row)] for i in range(width)]
+
+    date_formats = {}
+    for number, (values, is_num) in enumerate(zip(columns, numeric)):
+        if is_num:
+            continue
+        date_format = _detect_date_format(values[:500])
+        if date_format is not None:
+            date_formats[first[number] if has_header else number] = date_format
+
+    return CsvDialect(encoding, delimiter, decimal, header, date_formats)
+
+
+def read_csv_auto(source, compression: Optional[str] = None, streaming: bool = False,
+                  track_memory: bool = False, deduplicator=None) -> Tuple[pd.DataFrame, CsvDialect, Optional[ImportStats]]:
+    """Определяет параметры CSV и читает его самым быстрым подходящим движком.
+
+    Args:
+        source: Путь к CSV-файлу или функция, открывающая бинарный поток
+        compression: Сжатие потока (для пути определяется по расширению)
+        streaming: Читать чанками по плану типов
+        track_memory: Замерять пиковую память при потоковом чтении (медленнее)
+        deduplicator: `RowDeduplicator` для удаления повторов (при потоковом
+            чтении — в каждом чанке, иначе — после чтения)
+
+    Returns:
+        Tuple[pd.DataFrame, CsvDialect, Optional[ImportStats]]: Данные, найденные
+        параметры и статистика потокового импорта (None при обычном чтении)
+    """
+    dialect = sniff_csv(source, compression)
+    if streaming:
+        df, stats = read_csv_chunked(source, track_memory=track_memory, deduplicator=deduplicator,
+                                     compression=compression or "infer", **dialect.read_options(chunked=True))
+        return df, dialect, stats
+    if callable(source):
+        with source() as stream:
+            df = pd.read_csv(stream, compression=compression, **dialect.read_options())
+    else:
+        df = pd.read_csv(source, **dialect.read_options())
+    if deduplicator is not None:
+        df = deduplicator.filter_frame(df)
+    return df, dialect, None
@@ -0,0 +1,243 @@
+"""Модуль импорта и экспорта через встроенную базу SQLite.
+
+Большой реестр хранится в файле базы данных, а в pandas загружается только
+нужный срез: выбор столбцов, условия фильтрации и `LIMIT` передаются в SQL,
+поэтому строки, не прошедшие фильтр, не материализуются в памяти. Экспорт
+выполняется пакетными `executemany` внутри одной транзакции.
+
+Классы:
+    SqlFilter: Условие фильтрации, передаваемое в SQL.
+
+Функции:
+    list_tables: Возвращает таблицы базы.
+    table_columns: Возвращает столбцы таблицы.
+    parse_filters: Разбирает условия вида `Age > 60; Cancer_Type = Lung`.
+    build_select: Строит параметризованный SELECT.
+    read_sql_table: Читает срез таблицы.
+    write_sql_table: Записывает DataFrame в таблицу.
+"""
+
+import re
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+DEFAULT_BATCH_ROWS = 50_000
+
+_FILTER_PATTERN = re.compile(r"^\s*(.+?)\s*(<=|>=|!=|=|<|>|\blike\b|\bin\b)\s*(.+?)\s*$", re.IGNORECASE)
+
+
+def quote_identifier(name: str) -> str:
+    """Экранирует имя таблицы или столбца для SQLite."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class SqlFilter:
+    """Условие фильтрации, передаваемое в WHERE.
+
+    Attributes:
+        column: Имя столбца
+        operator: Оператор (`=`, `!=`, `<`, `<=`, `>`, `>=`, `LIKE`, `IN`)
+        value: Значение или список значений для `IN`
+    """
+
+    def __init__(self, column: str, operator: str, value):
+        self.column = column
+        self.operator = operator.strip().upper()
+        self.value = value
+
+    def to_sql(self) -> Tuple[str, list]:
+        """Возвращает фрагмент SQL с плейсхолдерами и параметры."""
+        column = quote_identifier(self.column)
+        if self.operator == "IN":
+            values = list(self.value)
+            return f"{column} IN ({', '.join('?' * len(values))})", values
+        return f"{column} {self.operator} ?", [self.value]
+
+
+def _coerce(value: str):
+    """Преобразует значение условия без кавычек в число, если это возможно.
+
+    Значение в кавычках остается строкой: `'0123'` сравнивается как текст.
+    """
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def parse_filters(text: str) -> List[SqlFilter]:
+    """Разбирает условия, разделенные `;`.
+
+    Args:
+        text: Условия вида `Age > 60; Cancer_Type in Lung, Breast; Gene like TP5%`;
+            значение в кавычках (`Code = '0123'`) сравнивается как текст
+
+    Returns:
+        List[SqlFilter]: Условия фильтрации
+
+    Raises:
+        ValueError: Если условие не удалось разобрать
+    """
+    filters = []
+    for part in filter(None, (chunk.strip() for chunk in text.split(";"))):
+        match = _FILTER_PATTERN.match(part)
+        if match is None:
+            raise ValueError(f"Не удалось разобрать условие: {part}")
+        column, operator, value = match.groups()
+        if operator.lower() == "in":
+            value = [_coerce(item) for item in value.strip("()").split(",")]
+        else:
+            value = _coerce(value)
+        filters.append(SqlFilter(column, operator, value))
+    return filters
+
+
+def _connect_readonly(db_path: Path):
+    """Открывает базу только для чтения; соединение закрывается при выходе из `with`.
+
+    Контекст самого соединения sqlite3 лишь завершает транзакцию, а не
+    закрывает его, и в Windows файл оставался бы заблокированным. Путь
+    передается URI с экранированием, поэтому `?`, `#` и `%` в имени не
+    ломают его, а отсутствующая база не создается.
+    """
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    return closing(sqlite3.connect(uri, uri=True))
+
+
+def list_tables(db_path: Path) -> List[str]:
+    """Возвращает имена таблиц базы данных."""
+    with _connect_readonly(db_path) as conn:
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name").fetchall()
+    return [row[0] for row in rows]
+
+
+def table_columns(db_path: Path, table: str) -> List[str]:
+    """Возвращает имена столбцов таблицы."""
+    with _connect_readonly(db_path) as conn:
+        rows = conn.execute(f"PRAGMA table_info({quote_identifier(table)})").fetchall()
+    return [row[1] for row in rows]
+
+
+def build_select(table: str, columns: Optional[Sequence[str]] = None,
+                 filters: Sequence[SqlFilter] = (), limit: Optional[int] = None) -> Tuple[str, list]:
+    """Строит параметризованный запрос SELECT.
+
+    Args:
+        table: Имя таблицы
+        columns: Столбцы (None — все)
+        filters: Условия, объединяемые через AND
+        limit: Максимальное количество строк
+
+    Returns:
+        Tuple[str, list]: Текст запроса и параметры
+    """
+    selected = ", ".join(quote_identifier(col) for col in columns) if columns else "*"
+    sql = f"SELECT {selected} FROM {quote_identifier(table)}"
+    params = []
+    if filters:
+        clauses = []
+        for condition in filters:
+            clause, values = condition.to_sql()
+            clauses.append(clause)
+            params.extend(values)
+        sql += " WHERE " + " AND ".join(clauses)
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    return sql, params
+
+
+def read_sql_table(db_path: Path, table: str, columns: Optional[Sequence[str]] = None,
+                   filters: Sequence[SqlFilter] = (), limit: Optional[int] = None) -> pd.DataFrame:
+    """Читает срез таблицы, выполняя фильтрацию и LIMIT на стороне SQLite.
+
+    Args:
+        db_path: Путь к файлу базы
+        table: Имя таблицы
+        columns: Столбцы (None — все)
+        filters: Условия фильтрации
+        limit: Максимальное количество строк
+
+    Returns:
+        pd.DataFrame: Прочитанные строки
+    """
+    sql, params = build_select(table, columns, filters, limit)
+    with _connect_readonly(db_path) as conn:
+        return pd.read_sql_query(sql, conn, params=params)
+
+
+def _sql_type(series: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(series):
+        return "REAL"
+    return "TEXT"
+
+
+def _column_values(series: pd.Series) -> list:
+    """Преобразует столбец в список значений Python, понятных sqlite3 (пропуски — None)."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.dt.strftime("%Y-%m-%d %H:%M:%S").to_numpy(dtype=object)
+    else:
+        values = series.to_numpy(dtype=object)
+    mask = series.isna().to_numpy()
+    if mask.any():
+        values = values.copy()
+        values[mask] = None
+    return [value.item() if isinstance(value, np.generic) else value for value in values]
+
+
+def _batches(df: pd.DataFrame, batch_rows: int) -> Iterable[list]:
+    for start in range(0, len(df), batch_rows):
+        block = df.iloc[start:start + batch_rows]
+        yield list(zip(*(_column_values(block[column]) for column in block.columns)))
+
+
+def write_sql_table(df: pd.DataFrame, db_path: Path, table: str, if_exists: str = "replace",
+                    index_columns: Sequence[str] = (), batch_rows: int = DEFAULT_BATCH_ROWS,
+                    on_batch=None):
+    """Записывает DataFrame в таблицу пакетными вставками в одной транзакции.
+
+    Args:
+        df: Данные для записи
+        db_path: Путь к файлу базы (создается при отсутствии)
+        table: Имя таблицы
+        if_exists: `replace` — пересоздать таблицу, `append` — дописать строки
+        index_columns: Столбцы, по которым создаются индексы для быстрых фильтров
+        batch_rows: Количество строк в одном `executemany`
+        on_batch: Функция, вызываемая с количеством строк после каждого пакета
+    """
+    name = quote_identifier(table)
+    columns = ", ".join(f"{quote_identifier(col)} {_sql_type(df[col])}" for col in df.columns)
+    placeholders = ", ".join("?" * len(df.columns))
+
+    # Модуль sqlite3 не открывает транзакцию перед DROP и CREATE, поэтому она
+    # начинается явно: при ошибке старая таблица остается нетронутой
+    with closing(sqlite3.connect(db_path, isolation_level=None)) as conn:
+        conn.execute("BEGIN")
+        try:
+            if if_exists == "replace":
+                conn.execute(f"DROP TABLE IF EXISTS {name}")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {name} ({columns})")
+            for batch in _batches(df, batch_rows):
+                conn.executemany(f"INSERT INTO {name} VALUES ({placeholders})", batch)
+                if on_batch is not None:
+                    on_batch(len(batch))
+            for column in index_columns:
+                index_name = quote_identifier(f"idx_{table}_{column}")
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {name} ({quote_identifier(column)})")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
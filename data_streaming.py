@@ -0,0 +1,296 @@
+"""Модуль потокового импорта CSV с фиксированным планом типов.
+
+Импорт выполняется в два прохода:
+1. Первые N строк читаются целиком, и по ним строится план типов:
+   понижение разрядности int/float и `category` для столбцов
+   с небольшим числом различных значений (`Cancer_Type`, `Mutation_Type`).
+2. Файл читается чанками с зафиксированным планом. Чанки сразу
+   раскладываются по столбцам, а при сборке каждый столбец склеивается
+   одним копированием, и его части тут же освобождаются: пиковая память
+   — около размера данных плюс один столбец, а не двойной размер.
+
+Вместо пути можно передать функцию, открывающую бинарный поток (например,
+член архива): поток открывается заново для каждого прохода, а первый проход
+читает только начало данных.
+
+Классы:
+    ImportStats: Статистика импорта (строки, скорость, пиковая память).
+    MemoryTracker: Замер пиковой памяти блока кода через tracemalloc.
+
+Функции:
+    build_dtype_plan: Строит план типов по выборке строк.
+    read_csv_chunked: Читает CSV чанками по плану типов.
+"""
+
+import time
+import tracemalloc
+from contextlib import nullcontext
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+DEFAULT_SAMPLE_ROWS = 10_000
+DEFAULT_CHUNK_SIZE = 100_000
+DEFAULT_MAX_CATEGORIES = 1_000
+DEFAULT_CATEGORY_RATIO = 0.5
+
+
+class ImportStats:
+    """Статистика одного импорта.
+
+    Attributes:
+        rows: Количество прочитанных строк
+        seconds: Длительность импорта в секундах
+        peak_bytes: Пиковый объем памяти, выделенной во время импорта
+            (None, если отслеживание памяти отключено)
+        result_bytes: Объем памяти итогового DataFrame
+    """
+
+    def __init__(self, rows: int, seconds: float, peak_bytes: Optional[int], result_bytes: int):
+        self.rows = rows
+        self.seconds = seconds
+        self.peak_bytes = peak_bytes
+        self.result_bytes = result_bytes
+
+    @property
+    def rows_per_second(self) -> float:
+        """Скорость импорта в строках в секунду."""
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+    def report(self) -> str:
+        """Возвращает строку отчета для вывода пользователю."""
+        parts = [
+            f"Строк: {self.rows}",
+            f"время: {self.seconds:.2f} с",
+            f"скорость: {self.rows_per_second:,.0f} строк/с",
+            f"размер в памяти: {self.result_bytes / 2 ** 20:.1f} МБ",
+        ]
+        if self.peak_bytes is not None:
+            parts.append(f"пиковая память: {self.peak_bytes / 2 ** 20:.1f} МБ")
+        return ", ".join(parts)
+
+
+class MemoryTracker:
+    """Контекст для замера пиковой памяти через tracemalloc."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.peak_bytes = None
+        self._started_here = False
+
+    def __enter__(self):
+        if self.enabled:
+            self._started_here = not tracemalloc.is_tracing()
+            if self._started_here:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        return self
+
+    def __exit__(self, *exc):
+        if self.enabled:
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            if self._started_here:
+                tracemalloc.stop()
+        return False
+
+
+def _downcast_numeric(series: pd.Series) -> str:
+    """Подбирает наименьший тип для числового столбца выборки."""
+    if pd.api.types.is_bool_dtype(series):
+        return "bool"
+    if pd.api.types.is_integer_dtype(series):
+        return str(pd.to_numeric(series, downcast="integer").dtype)
+    # pandas сужает до float32 с допуском, а план должен хранить значения точно
+    return "float32" if _fits_float(series, "float32") else "float64"
+
+
+def build_dtype_plan(sample: pd.DataFrame,
+                     max_categories: int = DEFAULT_MAX_CATEGORIES,
+                     category_ratio: float = DEFAULT_CATEGORY_RATIO) -> Dict[str, str]:
+    """Строит план типов по выборке строк.
+
+    Args:
+        sample: Первые строки файла, прочитанные с автоопределением типов
+        max_categories: Максимум различных значений для типа `category`
+        category_ratio: Максимальная доля различных значений среди непустых
+
+    Returns:
+        Dict[str, str]: Отображение "столбец -> тип". Строковые столбцы
+            с высокой кардинальностью в план не попадают.
+    """
+    plan = {}
+    for column in sample.columns:
+        series = sample[column]
+        if pd.api.types.is_numeric_dtype(series):
+            plan[column] = _downcast_numeric(series)
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            non_null = series.count()
+            unique = series.nunique(dropna=True)
+            if non_null and unique <= max_categories and unique / non_null <= category_ratio:
+                plan[column] = "category"
+    return plan
+
+
+def _parse_dtypes(plan: Dict[str, str]) -> Dict[str, str]:
+    """Возвращает типы, передаваемые парсеру при чтении чанков.
+
+    Числовые столбцы парсятся с автоопределением, чтобы пропуски или грязные
+    значения в последующих чанках не прерывали импорт; сужение выполняется
+    в `_apply_plan`. Категориальные столбцы парсятся сразу в `category`.
+    """
+    return {column: dtype for column, dtype in plan.items() if dtype == "category"}
+
+
+def _fits(values: pd.Series, dtype: str) -> bool:
+    """Проверяет, помещаются ли значения в целочисленный тип без потерь."""
+    if not pd.api.types.is_integer_dtype(values) or pd.api.types.is_bool_dtype(values):
+        return False
+    if values.empty:
+        return True
+    info = np.iinfo(dtype)
+    return info.min <= values.min() and values.max() <= info.max
+
+
+def _fits_float(values: pd.Series, dtype: str) -> bool:
+    """Проверяет, сохраняются ли значения в вещественном типе без потерь."""
+    if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+        return False
+    original = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    narrowed = original.astype(dtype).astype(np.float64)
+    return bool(np.array_equal(original, narrowed, equal_nan=True))
+
+
+def _widen(values: pd.Series, dtype: str) -> str:
+    """Возвращает тип из плана или его безопасное расширение для значений чанка."""
+    is_number = pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+    if dtype == "bool":
+        return dtype if pd.api.types.is_bool_dtype(values) else "object"
+    if dtype.startswith(("int", "uint")):
+        if _fits(values, dtype):
+            return dtype
+        if not is_number:
+            return "object"
+        promoted = _downcast_numeric(values)
+        if promoted.startswith(("int", "uint")):
+            return str(np.promote_types(dtype, promoted))
+        return "float64"
+    if dtype.startswith("float"):
+        if not is_number:
+            return "object"
+        return dtype if _fits_float(values, dtype) else "float64"
+    return dtype
+
+
+def _apply_plan(chunk: pd.DataFrame, plan: Dict[str, str]) -> pd.DataFrame:
+    """Приводит чанк к плану, расширяя план там, где данные в него не помещаются."""
+    for column, dtype in plan.items():
+        if column not in chunk.columns or dtype == "category":
+            continue
+        values = chunk[column]
+        dtype = plan[column] = _widen(values, dtype)
+        if str(values.dtype) != dtype:
+            chunk[column] = values.astype(dtype)
+    return chunk
+
+
+def _collect(chunks: Iterable[pd.DataFrame]) -> Dict[str, List[pd.Series]]:
+    """Раскладывает чанки по столбцам по мере чтения, не удерживая сами чанки."""
+    columns: Dict[str, List[pd.Series]] = {}
+    for chunk in chunks:
+        for column, values in chunk.items():
+            columns.setdefault(column, []).append(values)
+    return columns
+
+
+def _assemble(columns: Dict[str, List[pd.Series]], plan: Dict[str, str]) -> pd.DataFrame:
+    """Собирает столбцы за одно копирование на столбец, освобождая части сразу после склейки."""
+    if not columns:
+        return pd.DataFrame()
+    assembled = {}
+    for column in list(columns):
+        # Части столбца больше не нужны, как только он склеен
+        parts = columns.pop(column)
+        if len(parts) == 1:
+            assembled[column] = parts[0].reset_index(drop=True)
+        elif plan.get(column) == "category":
+            assembled[column] = pd.Series(union_categoricals(parts, ignore_order=True), name=column)
+        else:
+            target = plan.get(column)
+            if target and target != "category":
+                parts = [part.astype(target) for part in parts]
+            assembled[column] = pd.concat(parts, ignore_index=True)
+        del parts
+    return pd.DataFrame(assembled, copy=False)
+
+
+def _open_source(source):
+    """Открывает источник: функция-открыватель вызывается, путь передается как есть."""
+    return source() if callable(source) else nullcontext(source)
+
+
+def iter_csv_chunks(file_path, plan: Dict[str, str],
+                    chunksize: int = DEFAULT_CHUNK_SIZE, **read_options) -> Iterable[pd.DataFrame]:
+    """Читает CSV чанками с зафиксированным планом типов.
+
+    Args:
+        file_path: Путь к CSV-файлу или функция, открывающая бинарный поток
+        plan: План типов, построенный `build_dtype_plan`; дополняется при расширении типов
+        chunksize: Количество строк в чанке
+        **read_options: Дополнительные параметры `pd.read_csv`
+
+    Yields:
+        pd.DataFrame: Очередной чанк, приведенный к плану
+    """
+    with _open_source(file_path) as source:
+        reader = pd.read_csv(source, dtype=_parse_dtypes(plan), chunksize=chunksize, **read_options)
+        with reader:
+            for chunk in reader:
+                yield _apply_plan(chunk, plan)
+
+
+def read_csv_chunked(file_path,
+                     sample_rows: int = DEFAULT_SAMPLE_ROWS,
+                     chunksize: int = DEFAULT_CHUNK_SIZE,
+                     track_memory: bool = False,
+                     deduplicator=None,
+                     **read_options):
+    """Импортирует CSV в два прохода: выборка для плана типов, затем чтение чанками.
+
+    Args:
+        file_path: Путь к CSV-файлу (сжатие определяется по расширению) или
+            функция, открывающая бинарный поток
+        sample_rows: Количество строк выборки для построения плана
+        chunksize: Количество строк в чанке
+        track_memory: Замерять пиковую память через tracemalloc (замедляет
+            импорт: отслеживается каждое выделение памяти)
+        deduplicator: `RowDeduplicator`, удаляющий повторы из каждого чанка до сборки
+        **read_options: Дополнительные параметры `pd.read_csv`
+
+    Returns:
+        Tuple[pd.DataFrame, ImportStats]: Компактный DataFrame и статистика импорта
+
+    Example:
+        >>> df, stats = read_csv_chunked("cohort.csv")
+        >>> print(stats.report())
+    """
+    started = time.perf_counter()
+    with MemoryTracker(track_memory) as memory:
+        with _open_source(file_path) as source:
+            sample = pd.read_csv(source, nrows=sample_rows, **read_options)
+        plan = build_dtype_plan(sample)
+        del sample
+
+        chunks = iter_csv_chunks(file_path, plan, chunksize=chunksize, **read_options)
+        if deduplicator is not None:
+            chunks = (deduplicator.filter(chunk) for chunk in chunks)
+        df = _assemble(_collect(chunks), plan)
+
+    stats = ImportStats(
+        rows=len(df),
+        seconds=time.perf_counter() - started,
+        peak_bytes=memory.peak_bytes,
+        result_bytes=int(df.memory_usage(deep=True).sum()),
+    )
+    return df, stats
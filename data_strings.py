@@ -0,0 +1,127 @@
+"""Модуль компактного хранения текстовых столбцов.
+
+Текстовый столбец типа `object` хранит по Python-объекту `str` на ячейку
+(50+ байт служебных данных на значение), и на типичных клинических
+выгрузках такие столбцы занимают большую часть памяти. После импорта
+столбцы с малым числом различных значений (тип рака, тип мутации, пол)
+переводятся в `category` с отсортированными категориями, а остальные —
+в строки Arrow, которые хранят все значения столбца в одном буфере.
+
+Категории сортируются, поэтому сортировка по такому столбцу дает тот же
+порядок, что и по исходным строкам.
+
+Классы:
+    StringCompaction: Итоги преобразования.
+
+Функции:
+    arrow_string_dtype: Возвращает тип строк Arrow или None без pyarrow.
+    compact_strings: Переводит текстовые столбцы DataFrame в компактные типы.
+"""
+
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_MAX_RATIO = 0.5
+SAMPLE_ROWS = 100_000
+
+
+class StringCompaction:
+    """Итоги преобразования текстовых столбцов.
+
+    Attributes:
+        converted: Новый тип по именам преобразованных столбцов
+        bytes_before: Память DataFrame до преобразования
+        bytes_after: Память DataFrame после преобразования
+        seconds: Время преобразования
+    """
+
+    def __init__(self, converted: Dict[str, str], bytes_before: int, bytes_after: int, seconds: float):
+        self.converted = converted
+        self.bytes_before = bytes_before
+        self.bytes_after = bytes_after
+        self.seconds = seconds
+
+    def report(self) -> str:
+        """Возвращает строку с итогами для вывода пользователю."""
+        categories = sum(1 for dtype in self.converted.values() if dtype == "category")
+        return (f"Текстовые столбцы: {categories} в category, {len(self.converted) - categories} в строки Arrow; "
+                f"память {self.bytes_before / 2 ** 20:.1f} → {self.bytes_after / 2 ** 20:.1f} МБ "
+                f"({self.seconds:.2f} с)")
+
+
+def arrow_string_dtype():
+    """Тип строк Arrow с пропусками NaN, как у обычных столбцов pandas, или None без pyarrow."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:
+        # pandas < 2.3: пропуски в строках Arrow представлены pd.NA
+        return pd.StringDtype("pyarrow")
+
+
+def _is_text(series: pd.Series) -> bool:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    if pd.api.types.is_string_dtype(series.dtype) and series.dtype != object:
+        return True
+    return series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == "string"
+
+
+def _category_codes(series: pd.Series, max_ratio: float):
+    """Коды и отсортированные категории столбца или None, если различных значений слишком много."""
+    # Уникальные строки в начале столбца отсекают его без хэширования всех значений
+    head = series.iloc[:SAMPLE_ROWS]
+    if len(series) > SAMPLE_ROWS and head.nunique() > max_ratio * len(head):
+        return None
+    codes, uniques = pd.factorize(series)
+    if len(uniques) > max_ratio * len(series):
+        return None
+    # Категории сортируются, а коды перенумеровываются по их новому порядку
+    order = np.argsort(np.asarray(uniques), kind="stable")
+    rank = np.empty(len(order), dtype=codes.dtype)
+    rank[order] = np.arange(len(order), dtype=codes.dtype)
+    codes = np.where(codes >= 0, rank[codes], -1)
+    return codes, uniques[order]
+
+
+def compact_strings(df: pd.DataFrame, max_category_ratio: float = CATEGORY_MAX_RATIO) -> Optional[StringCompaction]:
+    """Переводит текстовые столбцы в `category` или строки Arrow на месте.
+
+    Столбцы заменяются в том же объекте DataFrame, поэтому ссылки на него
+    (отслеживание дозаписи, привязанный профиль) остаются действительными.
+
+    Args:
+        df: Загруженные данные
+        max_category_ratio: Наибольшая доля различных значений от числа строк,
+            при которой столбец хранится как `category`
+
+    Returns:
+        Optional[StringCompaction]: Итоги преобразования или None, если текстовых
+        столбцов нет
+    """
+    started = time.perf_counter()
+    text_columns = [name for name in df.columns if _is_text(df[name])]
+    if not text_columns:
+        return None
+
+    arrow_dtype = arrow_string_dtype()
+    bytes_before = int(df.memory_usage(deep=True, index=False).sum())
+    converted = {}
+    for name in text_columns:
+        series = df[name]
+        codes = _category_codes(series, max_category_ratio)
+        if codes is not None:
+            df[name] = pd.Categorical.from_codes(*codes)
+            converted[name] = "category"
+        elif arrow_dtype is not None and series.dtype != arrow_dtype:
+            df[name] = series.astype(arrow_dtype)
+            converted[name] = str(arrow_dtype)
+
+    bytes_after = int(df.memory_usage(deep=True, index=False).sum())
+    return StringCompaction(converted, bytes_before, bytes_after, time.perf_counter() - started)
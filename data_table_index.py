@@ -0,0 +1,399 @@
+"""Модуль индексов для фильтрации в просмотре таблицы.
+
+Фильтр `_filter_data` раньше при каждом запросе приводил весь столбец к
+строкам и сканировал его регулярным выражением. Здесь для столбца один раз
+строится словарь различных значений в нижнем регистре и коды строк (для
+`category` коды уже есть), а для словаря — инвертированный индекс триграмм
+байт UTF-8. Подстрока ищется так:
+
+1. по индексу берутся значения словаря, содержащие все триграммы запроса;
+2. кандидаты проверяются точным поиском подстроки;
+3. маска строк получается выборкой по кодам: `hit[codes]`.
+
+Для сортировки результатов фильтра здесь же хранятся перестановки
+строк (`argsort`) по столбцам: отфильтрованные строки упорядочиваются
+выборкой из готовой перестановки без повторной сортировки. Первые K строк
+по столбцу выбираются через `np.partition`, без сортировки всех строк.
+Для числовых столбцов по той же перестановке строится отсортированный
+индекс: диапазон значений находится через `np.searchsorted` за
+O(log n + k) вместо просмотра всего столбца.
+
+Индексы привязываются к объекту DataFrame, как профиль данных, и
+сбрасываются, если у него меняются число строк, столбцы, их типы или
+хеш выборки строк. Выборка (до `FINGERPRINT_ROWS` строк через равный шаг)
+замечает правку на месте в небольшой таблице, но в большой может ее
+пропустить, поэтому после изменения значений на месте вызывайте
+`invalidate`.
+
+Классы:
+    ColumnIndex: Словарь значений и индекс триграмм одного столбца.
+    TableIndex: Индексы столбцов одного DataFrame.
+
+Функции:
+    sort_keys: Числовые ключи, упорядоченные как значения столбца.
+    select_top: Выбирает K первых строк порядка сортировки по ключам.
+    index_for: Возвращает индексы DataFrame, создавая их при первом обращении.
+    invalidate: Сбрасывает индексы DataFrame после правки на месте.
+"""
+
+import itertools
+import re
+import weakref
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_strings import arrow_string_dtype
+
+NGRAM = 3
+VERIFY_LIMIT = 1_000
+_SEPARATOR = b"\x00"
+_REGEX_CHARS = re.compile(r"[.^$*+?{}\[\]\\|()]")
+SORT_CACHE_SHARE = 1 / 16
+_versions = itertools.count(1)
+
+
+def _trigram_keys(data: np.ndarray) -> np.ndarray:
+    """Кодирует каждые три подряд идущих байта одним числом."""
+    data = data.astype(np.uint32)
+    return (data[:-2] << 16) | (data[1:-1] << 8) | data[2:]
+
+
+class ColumnIndex:
+    """Словарь значений столбца в нижнем регистре и индекс триграмм по нему.
+
+    Attributes:
+        codes: Номер значения словаря для каждой строки (пропуск — `len(values)`)
+        values: Различные значения столбца в виде строк в нижнем регистре
+    """
+
+    def __init__(self, series: pd.Series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            uniques = series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        # Строковое представление — то же, что дает `astype(str)` для всего столбца;
+        # пропуски, как и в `str.contains`, ни с чем не совпадают
+        self.values = pd.Series(pd.Index(uniques).astype(str).str.lower(), dtype=arrow_string_dtype() or object)
+        self.codes = np.where(codes < 0, len(self.values), codes)
+        self._lookup: Optional[Dict[str, np.ndarray]] = None
+        self._postings = None
+
+    def _mask(self, hit: np.ndarray) -> np.ndarray:
+        """Переводит отметки значений словаря в маску строк."""
+        return np.append(hit, False)[self.codes]
+
+    def _build_postings(self):
+        """Строит индекс триграмм: отсортированные ключи и списки значений по ним."""
+        encoded = [value.encode("utf-8") for value in self.values]
+        lengths = np.fromiter((len(value) + 1 for value in encoded), dtype=np.int64, count=len(encoded))
+        data = np.frombuffer(_SEPARATOR.join(encoded) + _SEPARATOR, dtype=np.uint8)
+        owners = np.repeat(np.arange(len(encoded), dtype=np.uint64), lengths)
+        # Триграммы, захватывающие разделитель, принадлежат двум значениям — отбрасываем
+        valid = (data[:-2] != 0) & (data[1:-1] != 0) & (data[2:] != 0)
+        # Пара (триграмма, значение) в одном числе: одна сортировка вместо lexsort
+        pairs = np.sort((_trigram_keys(data)[valid].astype(np.uint64) << 32) | owners[:-2][valid])
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]]
+        keys, owners = (pairs >> 32).astype(np.uint32), (pairs & 0xFFFFFFFF).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        self._postings = (keys[starts], np.r_[starts, len(keys)], owners)
+
+    def _candidates(self, needle: bytes) -> Optional[np.ndarray]:
+        """Значения словаря, содержащие все триграммы запроса (None — индекс неприменим)."""
+        if len(needle) < NGRAM:
+            return None
+        if self._postings is None:
+            self._build_postings()
+        unique_keys, bounds, owners = self._postings
+        lists = []
+        for key in np.unique(_trigram_keys(np.frombuffer(needle, dtype=np.uint8))):
+            position = np.searchsorted(unique_keys, key)
+            if position == len(unique_keys) or unique_keys[position] != key:
+                return np.array([], dtype=np.int32)
+            lists.append(owners[bounds[position]:bounds[position + 1]])
+        lists.sort(key=len)
+        candidates = lists[0]
+        for other in lists[1:]:
+            if len(candidates) <= VERIFY_LIMIT:
+                # Мало кандидатов: дешевле проверить их подстрокой, чем пересекать длинные списки
+                break
+            # Списки отсортированы: пересечение — бинарным поиском кандидатов в следующем списке
+            positions = np.minimum(np.searchsorted(other, candidates), len(other) - 1)
+            candidates = candidates[other[positions] == candidates]
+        return candidates
+
+    def contains(self, pattern: str) -> np.ndarray:
+        """Маска строк, содержащих `pattern` без учета регистра, как `str.contains(case=False)`.
+
+        Запрос без спецсимволов регулярных выражений ищется по индексу,
+        остальные проверяются регулярным выражением по словарю значений.
+        """
+        if _REGEX_CHARS.search(pattern):
+            return self._mask(self.values.str.contains(pattern, case=False, regex=True).to_numpy(dtype=bool))
+
+        needle = pattern.lower()
+        candidates = self._candidates(needle.encode("utf-8"))
+        if candidates is None:
+            return self._mask(self.values.str.contains(needle, regex=False).to_numpy(dtype=bool))
+        hit = np.zeros(len(self.values), dtype=bool)
+        hit[candidates] = self.values.iloc[candidates].str.contains(needle, regex=False).to_numpy(dtype=bool)
+        return self._mask(hit)
+
+    def equals(self, value: str) -> np.ndarray:
+        """Маска строк, значение которых совпадает с `value` без учета регистра."""
+        if self._lookup is None:
+            lookup = {}
+            for number, text in enumerate(self.values):
+                lookup.setdefault(text, []).append(number)
+            self._lookup = {text: np.array(numbers) for text, numbers in lookup.items()}
+        hit = np.zeros(len(self.values), dtype=bool)
+        hit[self._lookup.get(value.lower(), [])] = True
+        return self._mask(hit)
+
+
+def sort_keys(series: pd.Series, categorical: bool = True) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Числовые ключи, упорядоченные как значения столбца, и маска пропусков.
+
+    Args:
+        series: Столбец
+        categorical: Использовать коды категорий (порядок категорий — порядок
+            сортировки); для частей данных с разными категориями — False
+
+    Returns:
+        Optional[Tuple[np.ndarray, np.ndarray]]: Ключи и маска пропусков или None
+        для текстовых столбцов
+    """
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        if not categorical:
+            return None
+        codes = series.cat.codes.to_numpy()
+        return codes, codes < 0
+    missing = series.isna().to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return pd.DatetimeIndex(series).asi8, missing
+    if pd.api.types.is_bool_dtype(dtype):
+        return series.to_numpy(dtype=np.int8, na_value=0), missing
+    if pd.api.types.is_numeric_dtype(dtype):
+        if pd.api.types.is_extension_array_dtype(dtype):
+            return series.to_numpy(dtype=np.float64, na_value=np.nan), missing
+        return series.to_numpy(), missing
+    return None
+
+
+def _search(keys: np.ndarray, value, side: str) -> int:
+    """Позиция границы в отсортированных ключах.
+
+    Граница приводится к типу ключей: иначе NumPy привел бы к float весь
+    массив целых ключей и поиск стал бы линейным.
+    """
+    if keys.dtype.kind in "iu":
+        limits = np.iinfo(keys.dtype)
+        if value < limits.min:
+            return 0
+        if value > limits.max:
+            return len(keys)
+        if value != np.floor(value):
+            # Дробная граница между целыми: обе стороны дают первый ключ больше нее
+            value, side = np.ceil(value), "left"
+        value = keys.dtype.type(value)
+    return int(np.searchsorted(keys, value, side=side))
+
+
+def select_top(positions: np.ndarray, keys: np.ndarray, k: int, largest: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Выбирает K первых строк порядка сортировки по ключам без сортировки всех строк.
+
+    Результат совпадает с устойчивой сортировкой и `head(k)`: при равных
+    ключах на границе берутся строки с меньшими номерами.
+
+    Args:
+        positions: Номера строк (ключи без пропусков)
+        keys: Ключи строк
+        k: Количество строк
+        largest: Брать наибольшие ключи (сортировка по убыванию)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Номера и ключи выбранных строк в порядке сортировки
+    """
+    if k < len(keys):
+        kth = len(keys) - k if largest else k - 1
+        threshold = np.partition(keys, kth)[kth]
+        better = np.flatnonzero(keys > threshold if largest else keys < threshold)
+        equal = np.flatnonzero(keys == threshold)
+        equal = equal[np.argsort(positions[equal], kind="stable")[:k - len(better)]]
+        chosen = np.concatenate([better, equal])
+        positions, keys = positions[chosen], keys[chosen]
+    if largest:
+        # По убыванию ключа, а при равных ключах — по возрастанию номера строки
+        order = np.lexsort((-positions, keys))[::-1]
+    else:
+        order = np.lexsort((positions, keys))
+    return positions[order], keys[order]
+
+
+class TableIndex:
+    """Индексы столбцов одного DataFrame, создаваемые по первому запросу.
+
+    Attributes:
+        version: Номер версии данных; меняется при каждом сбросе индексов
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.version = next(_versions)
+        self._df = weakref.ref(df)
+        self._columns: Dict[str, ColumnIndex] = {}
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._sorted: Dict[str, Optional[Tuple[np.ndarray, np.ndarray]]] = {}
+
+    def column(self, name: str) -> ColumnIndex:
+        index = self._columns.get(name)
+        if index is None:
+            index = self._columns[name] = ColumnIndex(self._df()[name])
+        return index
+
+    def contains(self, column: str, pattern: str) -> np.ndarray:
+        """Маска строк, в которых столбец содержит подстроку без учета регистра."""
+        return self.column(column).contains(pattern)
+
+    def equals(self, column: str, value: str) -> np.ndarray:
+        """Маска строк, в которых значение столбца равно `value` без учета регистра."""
+        return self.column(column).equals(value)
+
+    def order(self, column: str, ascending: bool = True) -> np.ndarray:
+        """Перестановка всех строк по столбцу, как у `sort_values(kind="stable")`.
+
+        Вычисляется один раз для версии данных; пропуски идут в конце.
+        """
+        key = (column, ascending)
+        permutation = self._orders.get(key)
+        if permutation is None:
+            values = self._df()[column].reset_index(drop=True)
+            permutation = values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+            self._orders[key] = permutation
+        return permutation
+
+    def sort_rows(self, column: str, rows: np.ndarray, ascending: bool = True) -> np.ndarray:
+        """Упорядочивает номера строк по столбцу.
+
+        Если перестановка столбца уже есть или строк много, номера берутся
+        из нее по маске за O(n); небольшую выборку дешевле отсортировать саму.
+        """
+        size = len(self._df())
+        if (column, ascending) not in self._orders and len(rows) < SORT_CACHE_SHARE * size:
+            values = self._df()[column].iloc[rows].reset_index(drop=True)
+            return rows[values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()]
+        permutation = self.order(column, ascending)
+        selected = np.zeros(size, dtype=bool)
+        selected[rows] = True
+        return permutation[selected[permutation]]
+
+    def sorted_keys(self, column: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Отсортированный индекс числового столбца, строится при первом запросе.
+
+        Returns:
+            Optional[Tuple[np.ndarray, np.ndarray]]: Значения без пропусков по
+            возрастанию и номера их строк или None, если столбец не числовой
+        """
+        if column not in self._sorted:
+            series = self._df()[column]
+            dtype = series.dtype
+            if not pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+                self._sorted[column] = None
+            else:
+                values, missing = sort_keys(series)
+                # Перестановка общая с сортировкой по возрастанию; пропуски в ее конце
+                rows = self.order(column, ascending=True)[:len(values) - int(missing.sum())]
+                self._sorted[column] = (values[rows], rows)
+        return self._sorted[column]
+
+    def range_rows(self, column: str, low=None, high=None,
+                   include_low: bool = True, include_high: bool = True) -> np.ndarray:
+        """Номера строк, значения которых попадают в диапазон, за O(log n + k).
+
+        Args:
+            column: Числовой столбец
+            low: Нижняя граница (None — без ограничения)
+            high: Верхняя граница (None — без ограничения)
+            include_low: Включать значения, равные `low`
+            include_high: Включать значения, равные `high`
+
+        Returns:
+            np.ndarray: Номера строк в порядке возрастания значений
+
+        Raises:
+            TypeError: Если столбец не числовой
+        """
+        index = self.sorted_keys(column)
+        if index is None:
+            raise TypeError(f"Столбец {column} не числовой")
+        keys, rows = index
+        start = 0 if low is None else _search(keys, low, "left" if include_low else "right")
+        stop = len(keys) if high is None else _search(keys, high, "right" if include_high else "left")
+        return rows[start:max(start, stop)]
+
+    def top_k(self, column: str, rows: np.ndarray, k: int, largest: bool = True) -> np.ndarray:
+        """Номера K строк из `rows` с наибольшими (наименьшими) значениями столбца.
+
+        Числовые столбцы, даты и категории выбираются через `np.partition`;
+        текстовые — по перестановке столбца.
+        """
+        keys = sort_keys(self._df()[column])
+        if keys is None or (column, not largest) in self._orders:
+            return self.sort_rows(column, rows, ascending=not largest)[:k]
+        values, missing = keys
+        present = rows[~missing[rows]]
+        top, _ = select_top(present, values[present], k, largest)
+        if len(top) < k:
+            # Пропуски идут в конце, как при сортировке
+            top = np.concatenate([top, rows[missing[rows]][:k - len(top)]])
+        return top
+
+
+_indexes = {}
+FINGERPRINT_ROWS = 2048
+
+
+def _content_hash(df: pd.DataFrame) -> Optional[int]:
+    """Сумма хешей строк выборки через равный шаг (None — данные не хешируются)."""
+    if not isinstance(df, pd.DataFrame) or not len(df):
+        return None
+    sample = df.iloc[::max(len(df) // FINGERPRINT_ROWS, 1)]
+    try:
+        return int(pd.util.hash_pandas_object(sample, index=False).sum())
+    except TypeError:
+        return None
+
+
+def _fingerprint(df: pd.DataFrame):
+    return len(df), tuple(df.columns), tuple(map(str, df.dtypes)), _content_hash(df)
+
+
+def index_for(df: pd.DataFrame) -> TableIndex:
+    """Возвращает индексы этого объекта DataFrame.
+
+    Индексы создаются заново для нового объекта и для того же объекта,
+    у которого изменились число строк, набор столбцов, их типы или хеш
+    выборки строк. Для данных вне памяти хеш не считается: части на диске
+    не меняются.
+    """
+    key = id(df)
+    entry = _indexes.get(key)
+    fingerprint = _fingerprint(df)
+    if entry is not None and entry[0]() is df and entry[1] == fingerprint:
+        return entry[2]
+    index = TableIndex(df)
+    _indexes[key] = (weakref.ref(df, lambda _: _indexes.pop(key, None)), fingerprint, index)
+    return index
+
+
+def invalidate(df: pd.DataFrame):
+    """Сбрасывает индексы DataFrame после изменения значений на месте.
+
+    Следующий `index_for` создаст индексы с новой версией, поэтому
+    запомненные по версии результаты (группировка) тоже пересчитаются.
+    """
+    entry = _indexes.get(id(df))
+    if entry is not None and entry[0]() is df:
+        del _indexes[id(df)]
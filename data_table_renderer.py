@@ -0,0 +1,201 @@
+"""Модуль вывода таблиц в стиле psql для просмотра данных.
+
+`tabulate` обходит каждую ячейку в Python, определяя ее тип и ширину, и
+делает это заново для каждой страницы. Здесь столбец форматируется целиком
+строковыми операциями NumPy (`%g` для дробных чисел, как в `tabulate`),
+а ширина, выравнивание по десятичной точке и обрезка длинного текста
+запоминаются для столбца и переиспользуются на следующих страницах. Вид
+таблицы совпадает с `tablefmt="psql"`: числа выровнены вправо по точке,
+текст — влево, первой идет колонка индекса.
+
+Классы:
+    TableRenderer: Форматирует страницы DataFrame с общими ширинами столбцов.
+
+Функции:
+    render_table: Форматирует DataFrame одной таблицей.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+MAX_CELL_WIDTH = 40
+ELLIPSIS = "…"
+
+
+class _ColumnFormat:
+    """Запомненные ширины и выравнивание одного столбца."""
+
+    def __init__(self, header: str, kind: str):
+        self.header = header
+        self.kind = kind
+        # Как у tabulate: столбец не уже заголовка с двумя пробелами (MIN_PADDING)
+        self.width = len(header) + 2
+        self.int_width = 0
+        self.frac_width = 0
+
+    @property
+    def numeric(self) -> bool:
+        return self.kind != "text"
+
+
+def _lengths(cells: np.ndarray) -> int:
+    return int(np.char.str_len(cells).max(initial=0))
+
+
+@lru_cache(maxsize=None)
+def _column_kind(dtype) -> str:
+    if pd.api.types.is_bool_dtype(dtype):
+        return "text"
+    if pd.api.types.is_float_dtype(dtype):
+        return "float"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "int"
+    return "text"
+
+
+def _format_cells(values: pd.Series, kind: str) -> np.ndarray:
+    """Строки ячеек столбца: `%g` для дробных чисел, `str` для остальных."""
+    if not len(values):
+        return np.array([], dtype=str)
+    if kind == "float":
+        return np.char.mod("%g", values.to_numpy(dtype=np.float64, na_value=np.nan))
+    if kind == "int" and not pd.api.types.is_extension_array_dtype(values.dtype):
+        return values.to_numpy().astype(str)
+    cells = values.to_numpy(dtype=object, copy=True)
+    missing = pd.isna(cells)
+    if missing.any():
+        cells[missing] = "NaT" if pd.api.types.is_datetime64_any_dtype(values.dtype) else "nan"
+    cells = np.asarray(cells, dtype=str)
+    if kind == "text" and any("\n" in cell or "\r" in cell for cell in cells.tolist()):
+        # Перевод строки внутри ячейки сломал бы рамку таблицы
+        cells = np.char.replace(np.char.replace(cells, "\r", " "), "\n", " ")
+    return cells
+
+
+def _split_decimal(cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Делит числа на целую часть и дробную с точкой (или порядок `e+07`) для выравнивания."""
+    if not len(cells):
+        return cells, cells
+    parts = np.char.partition(cells, ".")
+    whole, fraction = parts[:, 0], np.char.add(parts[:, 1], parts[:, 2])
+    exponent = (parts[:, 1] == "") & (np.char.find(cells, "e") >= 0)
+    if exponent.any():
+        parts = np.char.partition(cells[exponent], "e")
+        whole, fraction = whole.astype(object), fraction.astype(object)
+        whole[exponent] = parts[:, 0]
+        fraction[exponent] = np.char.add(parts[:, 1], parts[:, 2])
+        whole, fraction = np.asarray(whole, dtype=str), np.asarray(fraction, dtype=str)
+    return whole, fraction
+
+
+class TableRenderer:
+    """Форматирует страницы DataFrame в стиле psql с общими ширинами столбцов.
+
+    Ширины берутся по первой отформатированной странице или по выборке
+    (`fit`) и только растут, поэтому страницы выводятся одинаковыми, пока
+    числа в них не оказываются длиннее уже встреченных. Текст длиннее
+    `max_width` обрезается с многоточием.
+
+    Attributes:
+        max_width: Наибольшая ширина текстовой ячейки
+        show_index: Выводить ли колонку индекса
+
+    Example:
+        >>> renderer = TableRenderer().fit(df.sample(200))
+        >>> print(renderer.render(df.iloc[0:20]))
+    """
+
+    def __init__(self, max_width: int = MAX_CELL_WIDTH, show_index: bool = True):
+        self.max_width = max_width
+        self.show_index = show_index
+        self._formats: Dict[object, _ColumnFormat] = {}
+
+    def _columns(self, frame: pd.DataFrame):
+        if self.show_index:
+            name = frame.index.name
+            yield ("index",), "" if name is None else str(name), pd.Series(frame.index, copy=False)
+        for position, (column, values) in enumerate(frame.items()):
+            # Ключ с позицией различает одноименные столбцы
+            yield ("column", position, column), str(column), values
+
+    def _measure(self, frame: pd.DataFrame) -> List[Tuple[_ColumnFormat, tuple]]:
+        """Форматирует столбцы и расширяет запомненные ширины под них."""
+        measured = []
+        for key, header, values in self._columns(frame):
+            kind = _column_kind(values.dtype)
+            cells = _format_cells(values, kind)
+            spec = self._formats.get(key)
+            if spec is None or spec.kind != kind:
+                spec = self._formats[key] = _ColumnFormat(header, kind)
+            if kind == "int":
+                spec.int_width = max(spec.int_width, _lengths(cells))
+                spec.width = max(spec.width, spec.int_width)
+                measured.append((spec, (cells,)))
+            elif kind == "float":
+                whole, fraction = _split_decimal(cells)
+                spec.int_width = max(spec.int_width, _lengths(whole))
+                spec.frac_width = max(spec.frac_width, _lengths(fraction))
+                spec.width = max(spec.width, spec.int_width + spec.frac_width)
+                measured.append((spec, (whole, fraction)))
+            else:
+                longest = _lengths(cells)
+                if longest > self.max_width:
+                    long = np.char.str_len(cells) > self.max_width
+                    # Приведение к более короткому типу строк NumPy обрезает значения
+                    cut = cells[long].astype(f"<U{self.max_width - 1}")
+                    cells = cells.astype(object)
+                    cells[long] = np.char.add(cut, ELLIPSIS)
+                    cells = np.asarray(cells, dtype=str)
+                spec.width = max(spec.width, min(longest, self.max_width))
+                measured.append((spec, (cells,)))
+        return measured
+
+    def fit(self, sample: pd.DataFrame) -> "TableRenderer":
+        """Задает ширины столбцов по выборке строк, не форматируя таблицу."""
+        self._measure(sample)
+        return self
+
+    def render(self, page: pd.DataFrame) -> str:
+        """Форматирует страницу таблицей в стиле psql.
+
+        Args:
+            page: Строки для вывода
+
+        Returns:
+            str: Таблица с рамкой, заголовком и строкой на запись (пустая
+            строка, если выводить нечего, как у `tabulate`)
+        """
+        measured = self._measure(page)
+        if not measured:
+            return ""
+        headers = [spec.header.rjust(spec.width) if spec.numeric else spec.header.ljust(spec.width)
+                   for spec, _ in measured]
+        dashes = ["-" * (spec.width + 2) for spec, _ in measured]
+        border = "+" + "+".join(dashes) + "+"
+        lines = [border, "| " + " | ".join(headers) + " |", "|" + "+".join(dashes) + "|"]
+        if len(page):
+            columns = []
+            for spec, cells in measured:
+                if spec.kind == "int":
+                    columns.append(np.char.rjust(cells[0], spec.width))
+                elif spec.kind == "float":
+                    whole, fraction = cells
+                    aligned = np.char.add(np.char.rjust(whole, spec.int_width),
+                                          np.char.ljust(fraction, spec.frac_width))
+                    columns.append(np.char.rjust(aligned, spec.width))
+                else:
+                    columns.append(np.char.ljust(cells[0], spec.width))
+            body = columns[0]
+            for column in columns[1:]:
+                body = np.char.add(np.char.add(body, " | "), column)
+            lines.extend(np.char.add(np.char.add("| ", body), " |").tolist())
+        lines.append(border)
+        return "\n".join(lines)
+
+
+def render_table(df: pd.DataFrame, max_width: int = MAX_CELL_WIDTH) -> str:
+    """Форматирует DataFrame одной таблицей в стиле psql."""
+    return TableRenderer(max_width).render(df)
@@ -1,39 +1,170 @@
+import itertools
+import re
+from typing import Iterator
+
 from tabulate import tabulate
+import numpy as np
 import pandas as pd
 
-def _show_filtered_data(filtered_df: pd.DataFrame, localizer):
-    if filtered_df.empty:
+from data_lazy import DEFAULT_SAMPLE_ROWS, LazyDataset
+from data_filter_expression import parse_filter
+from data_group_by import AGGREGATIONS, group_by, parse_aggregations, pivot
+from data_profiler import attach_profile, get_profile, profile_dataframe
+from data_table_index import index_for
+from data_table_renderer import TableRenderer
+
+WIDTH_SAMPLE_ROWS = 200
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+# Числовые условия одного столбца: >60, <=3.5, =40, 40..50
+_RANGE_VALUE = re.compile(rf"^(?:(<=|>=|<|>|!=|=)\s*({_NUMBER})|({_NUMBER})\s*\.\.\s*({_NUMBER}))$")
+
+def _width_sample(frame, rows, page_size: int):
+    if isinstance(frame, LazyDataset):
+        # С диска для оценки ширины читается только первая страница
+        return frame.iloc[:page_size]
+    total = len(frame) if rows is None else len(rows)
+    positions = np.linspace(0, total - 1, min(WIDTH_SAMPLE_ROWS, total)).astype(np.int64)
+    return frame.iloc[positions if rows is None else rows[positions]]
+
+def _show_pages(pages: Iterator[pd.DataFrame], localizer, renderer: TableRenderer):
+    """Печатает страницы по одной; возвращает число показанных строк и признак, что страницы кончились."""
+    shown = 0
+    for page in pages:
+        print(renderer.render(page))
+        shown += len(page)
+        if input(f"{localizer.get_string(43)} (y/n): ").lower() != "y":
+            return shown, False
+    return shown, True
+
+def _show_paged(frame, localizer, page_size: int = 20, rows=None):
+    # Страница формируется только перед показом: строки из rows выбираются по 20, а не копируются все сразу
+    total = len(frame) if rows is None else len(rows)
+    if rows is None:
+        pages = (frame.iloc[i:i + page_size] for i in range(0, total, page_size))
+    else:
+        pages = (frame.iloc[rows[i:i + page_size]] for i in range(0, total, page_size))
+    # Ширины столбцов задаются по выборке строк и общие для всех страниц
+    _show_pages(pages, localizer, TableRenderer().fit(_width_sample(frame, rows, page_size)))
+
+def _show_filtered_data(filtered_df: pd.DataFrame, localizer, page_size: int = 20, rows=None):
+    total = len(filtered_df) if rows is None else len(rows)
+    if total == 0:
+        print(localizer.get_string(46))
+        return
+    print(f"\n{localizer.get_string(45)} ({total})")
+    _show_paged(filtered_df, localizer, page_size, rows)
+
+def _page_stream(batches: Iterator[pd.DataFrame], page_size: int) -> Iterator[pd.DataFrame]:
+    pending, count = [], 0
+    for batch in batches:
+        if batch.empty:
+            continue
+        pending.append(batch)
+        count += len(batch)
+        while count >= page_size:
+            rows = pd.concat(pending)
+            yield rows.iloc[:page_size]
+            pending, count = [rows.iloc[page_size:]], count - page_size
+    if count:
+        yield pd.concat(pending)
+
+def _show_filtered_stream(batches: Iterator[pd.DataFrame], localizer, page_size: int = 20):
+    # Без сортировки страницы печатаются по мере нахождения строк, не дожидаясь конца просмотра
+    print("(строки выводятся по мере нахождения)")
+    pages = _page_stream(batches, page_size)
+    first = next(pages, None)
+    if first is None:
         print(localizer.get_string(46))
         return
-    print(f"\n{localizer.get_string(45)} ({len(filtered_df)})")
-    print(tabulate(filtered_df, headers="keys", tablefmt="psql"))
+    shown, finished = _show_pages(itertools.chain([first], pages), localizer, TableRenderer().fit(first))
+    if finished:
+        print(f"{localizer.get_string(45)}: {shown}")
+
+def _column_filter(df, source, filter_column: str, localizer):
+    """Условие по одному столбцу: маска строк в памяти или предикат для данных на диске."""
+    print("(значение вида =Lung — точное совпадение без учета регистра; для чисел: >60, <=3.5, 40..50)")
+    filter_value = input(localizer.get_string(63).format(filter_column)).strip()
+    match = _RANGE_VALUE.match(filter_value)
+    if match is not None and "`" not in filter_column:
+        op, bound, low, high = match.groups()
+        text = f"`{filter_column}` between {low} and {high}" if op is None else f"`{filter_column}` {op} {bound}"
+        expression = parse_filter(text)
+        # В памяти диапазон ищется бинарным поиском по отсортированному индексу столбца
+        return expression.mask if isinstance(source, LazyDataset) else expression.mask(source, use_index=True)
+    exact = filter_value.startswith("=") and len(filter_value) > 1
+    if isinstance(source, LazyDataset):
+        if exact:
+            value = filter_value[1:].lower()
+            return lambda batch: (batch[filter_column].notna()
+                                  & (batch[filter_column].astype(str).str.lower() == value)).to_numpy(dtype=bool)
+        return lambda batch: batch[filter_column].astype(str).str.contains(
+            filter_value, case=False).to_numpy(dtype=bool, na_value=False)
+    # Индекс строится по исходному DataFrame и переиспользуется следующими запросами
+    index = index_for(source)
+    if exact:
+        return index.equals(filter_column, filter_value[1:])
+    return index.contains(filter_column, filter_value)
 
 def _filter_data(df: pd.DataFrame, localizer):
     print(f"\n=== {localizer.get_string(44)} ===")
     print(f"{localizer.get_string(69)}: {', '.join(df.columns)}")
     try:
+        source = df
         columns_to_show = input(localizer.get_string(60)).strip()
         if columns_to_show:
             columns = [col.strip() for col in columns_to_show.split(',')]
             df = df[columns]
 
         print(f"\n[1/2] {localizer.get_string(44)}...")
+        print('(вместо столбца можно ввести выражение: Age > 60 and Cancer_Type in (Lung, Breast) and Gene ~ "TP5")')
         filter_column = input(localizer.get_string(61)).strip()
-        if filter_column not in df.columns:
-            print(localizer.get_string(62))
-            return
-
-        filter_value = input(localizer.get_string(63).format(filter_column)).strip()
-        filtered_df = df[df[filter_column].astype(str).str.contains(filter_value, case=False)]
+        # Условия могут ссылаться на столбцы, скрытые выбором столбцов для показа
+        if filter_column in df.columns:
+            condition = _column_filter(df, source, filter_column, localizer)
+            needed = [filter_column]
+        else:
+            try:
+                expression = parse_filter(filter_column)
+            except ValueError as e:
+                print(localizer.get_string(62) if " " not in filter_column else str(e))
+                return
+            lazy = isinstance(source, LazyDataset)
+            condition = expression.mask if lazy else expression.mask(source, use_index=True)
+            needed = expression.columns
 
         print(f"\n[2/2] {localizer.get_string(64)}...")
         sort_column = input(localizer.get_string(65)).strip()
-        if sort_column and sort_column in filtered_df.columns:
+        ascending, top = None, None
+        if sort_column and sort_column in df.columns:
             ascending = input(localizer.get_string(66)).strip().lower() == "y"
-            filtered_df = filtered_df.sort_values(by=sort_column, ascending=ascending)
+            # «50 самых старших пациентов» — первые K строк без сортировки всех найденных
+            top_text = input("Показать только первые K строк (Enter — все): ").strip()
+            if top_text and (not top_text.isdigit() or int(top_text) == 0):
+                raise ValueError("K должно быть целым положительным числом")
+            top = int(top_text) if top_text else None
 
         print(f"\n{localizer.get_string(67)}")
-        _show_filtered_data(filtered_df, localizer)
+        if isinstance(source, LazyDataset):
+            shown = list(df.columns)
+            if ascending is None:
+                batches = source.iter_filter(condition, columns=list(dict.fromkeys(shown + needed)))
+                _show_filtered_stream((batch[shown] for batch in batches), localizer)
+                return
+            filtered_df = source.filter(condition, columns=needed)[shown]
+            if top is not None:
+                filtered_df = filtered_df.top_k(sort_column, top, ascending=ascending)
+            else:
+                filtered_df = filtered_df.sort_values(by=sort_column, ascending=ascending)
+            _show_filtered_data(filtered_df, localizer)
+            return
+
+        rows = np.flatnonzero(condition)
+        if top is not None:
+            rows = index_for(source).top_k(sort_column, rows, top, largest=not ascending)
+        elif ascending is not None:
+            # Перестановка столбца вычисляется один раз и переиспользуется следующими сортировками
+            rows = index_for(source).sort_rows(sort_column, rows, ascending)
+        _show_filtered_data(df, localizer, rows=rows)
     except Exception as e:
         print(f"{localizer.get_string(47)}: {str(e)}")
 
@@ -47,13 +178,19 @@ class DataFrameViewer:
             print(f"\n{self.localizer.get_string(41)}")
             print("1. " + self.localizer.get_string(68))
             print("2. " + self.localizer.get_string(44))
-            print("3. " + self.localizer.get_string(5))
+            print("3. Профиль данных")
+            print("4. Группировка")
+            print("5. " + self.localizer.get_string(5))
             try:
                 choice = int(input(f"{self.localizer.get_string(17)}: "))
                 if choice == 1:
                     self._show_full_data(df)
                 elif choice == 2:
                     _filter_data(df, self.localizer)
+                elif choice == 3:
+                    self._show_profile(df)
+                elif choice == 4:
+                    self._show_groups(df)
                 else:
                     return
             except ValueError:
@@ -61,7 +198,34 @@ class DataFrameViewer:
 
     def _show_full_data(self, df: pd.DataFrame):
         print(f"\n{self.localizer.get_string(42)}: {len(df)}")
-        for i in range(0, len(df), self.page_size):
-            print(tabulate(df.iloc[i:i + self.page_size], headers="keys", tablefmt="psql"))
-            if input(f"{self.localizer.get_string(43)} (y/n): ").lower() != "y":
-                break
\ No newline at end of file
+        if len(df):
+            _show_paged(df, self.localizer, self.page_size)
+
+    def _show_profile(self, df: pd.DataFrame):
+        profile = get_profile(df)
+        if profile is None:
+            profile = profile_dataframe(df.sample(DEFAULT_SAMPLE_ROWS) if isinstance(df, LazyDataset) else df)
+            attach_profile(df, profile)
+        print(f"\n{self.localizer.get_string(42)}: {profile.rows}")
+        print(tabulate(profile.rows_for_table(), headers=profile.HEADERS, tablefmt="psql"))
+
+    def _show_groups(self, df: pd.DataFrame):
+        print("\n=== Группировка ===")
+        print(f"{self.localizer.get_string(69)}: {', '.join(df.columns)}")
+        try:
+            keys = [key.strip() for key in input("Столбцы группировки через запятую: ").split(",") if key.strip()]
+            column = input("Числовой столбец для агрегатов (Enter — только количество строк): ").strip() or None
+            aggregations = ["count"]
+            if column:
+                text = input(f"Агрегаты через запятую ({', '.join(AGGREGATIONS)}, квантили q25, q90; "
+                             f"Enter — все): ").strip()
+                aggregations = parse_aggregations(text) if text else list(AGGREGATIONS)
+            # Повторная группировка тех же данных берется из кэша без пересчета
+            result = group_by(df, keys, column, aggregations)
+            if len(keys) == 2 and input("Развернуть второй столбец в сводную таблицу? (y/n): ").lower() == "y":
+                result = pivot(result)
+            print(f"\nГрупп: {len(result)}")
+            if len(result):
+                _show_paged(result.reset_index(), self.localizer, self.page_size)
+        except (KeyError, ValueError, TypeError) as e:
+            print(f"{self.localizer.get_string(47)}: {e}")
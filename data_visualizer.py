@@ -2,6 +2,9 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import matplotlib as mpl
 
+from data_lazy import LazyDataset
+from data_profiler import NUMERIC, column_kind, get_profile
+
 mpl.rcParams['agg.path.chunksize'] = 10000
 
 class DataFrameVisualizer:
@@ -26,7 +29,12 @@ class DataFrameVisualizer:
                 print(self.localizer.get_string(9))
 
     def _plot_chart(self, df: pd.DataFrame, chart_type: str):
-        print(f"\n{self.localizer.get_string(69)}: {', '.join(df.columns)}")
+        profile = get_profile(df)
+        if profile is not None:
+            columns = [f"{name} ({column.kind})" for name, column in profile.columns.items()]
+        else:
+            columns = list(df.columns)
+        print(f"\n{self.localizer.get_string(69)}: {', '.join(columns)}")
         try:
             x_col = input(f"{self.localizer.get_string(49)}: ").strip()
             y_col = input(f"{self.localizer.get_string(50)}: ").strip()
@@ -34,8 +42,12 @@ class DataFrameVisualizer:
                 print(self.localizer.get_string(51))
                 return
 
+            if isinstance(df, LazyDataset):
+                df = self._lazy_chart_data(df, chart_type, x_col, y_col)
+
             if chart_type == "line":
-                if not pd.api.types.is_numeric_dtype(df[y_col]):
+                y_kind = profile.columns[y_col].kind if profile is not None else column_kind(df[y_col])
+                if y_kind != NUMERIC:
                     print(self.localizer.get_string(53))
                     return
                 if len(df) > 200:
@@ -52,4 +64,19 @@ class DataFrameVisualizer:
             plt.tight_layout()
             plt.show(block=False)
         except Exception as e:
-            print(f"{self.localizer.get_string(52)}: {str(e)}")
\ No newline at end of file
+            print(f"{self.localizer.get_string(52)}: {str(e)}")
+
+    def _lazy_chart_data(self, dataset: LazyDataset, chart_type: str, x_col: str, y_col: str) -> pd.DataFrame:
+        """Готовит данные графика для датасета вне памяти за один потоковый проход.
+
+        Столбчатая диаграмма строится по среднему `y_col` в каждой группе `x_col`,
+        линейная — по случайной выборке строк.
+        """
+        if chart_type == "line":
+            return dataset[[x_col, y_col]].sample(200)
+        y_kind = column_kind(dataset[[y_col]].head(1000)[y_col])
+        if x_col == y_col or y_kind != NUMERIC:
+            counts = dataset.aggregate(x_col)["count"]
+            return pd.DataFrame({x_col: counts.index, y_col: counts.to_numpy()})
+        means = dataset.aggregate(x_col, y_col)["mean"]
+        return pd.DataFrame({x_col: means.index, y_col: means.to_numpy()})
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""Модуль отложенного импорта тяжелых зависимостей.
+
+`lazy_import` возвращает объект-заместитель модуля: настоящий импорт
+выполняется при первом обращении к атрибуту. Так pandas, numpy, sklearn,
+matplotlib и kaggle загружаются только тогда, когда впервые используется
+соответствующий пункт меню.
+
+`enable_import_profiling` включает замер времени импорта по пакетам верхнего
+уровня (собственное время пакета без вложенных импортов других пакетов), а
+`print_import_report` выводит сводку — используется ключом `--startup-profile`.
+
+Функции:
+    lazy_import: Создает заместитель модуля с отложенной загрузкой.
+    enable_import_profiling: Включает замер времени импортов.
+    print_import_report: Выводит время импортов по пакетам.
+"""
+
+import builtins
+import importlib
+import sys
+import time
+import types
+from collections import defaultdict
+
+_import_times = defaultdict(float)
+_profiling = False
+_original_import = builtins.__import__
+_nested_time = []
+
+
+class LazyModule(types.ModuleType):
+    """Заместитель модуля, загружающий его при первом обращении к атрибуту."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            started = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_lazy_module"] = module
+            if _profiling:
+                print(f"[startup-profile] {self.__name__} загружен при первом использовании "
+                      f"за {time.perf_counter() - started:.3f} с")
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_lazy_module"] is not None
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Возвращает заместитель модуля, если модуль еще не загружен.
+
+    Args:
+        name: Полное имя модуля, например "pandas"
+
+    Returns:
+        LazyModule: Заместитель, либо уже загруженный модуль из `sys.modules`
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def _profiled_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    started = time.perf_counter()
+    _nested_time.append(0.0)
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - started
+        nested = _nested_time.pop()
+        if _nested_time:
+            _nested_time[-1] += elapsed
+        _import_times[name.partition(".")[0]] += elapsed - nested
+
+
+def enable_import_profiling():
+    """Включает замер времени всех последующих импортов."""
+    global _profiling
+    _profiling = True
+    builtins.__import__ = _profiled_import
+
+
+def print_import_report(total_seconds: float, limit: int = 15):
+    """Выводит время импортов по пакетам верхнего уровня.
+
+    Args:
+        total_seconds: Полное время запуска до показа меню
+        limit: Максимальное количество строк сводки
+    """
+    print("\n=== Профиль запуска ===")
+    print(f"Время до главного меню: {total_seconds:.3f} с")
+    ranked = sorted(_import_times.items(), key=lambda item: item[1], reverse=True)
+    for package, seconds in ranked[:limit]:
+        print(f"  {package:<28} {seconds:8.3f} с")
+    print(f"  {'(всего на импорты)':<28} {sum(_import_times.values()):8.3f} с")
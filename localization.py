@@ -25,8 +25,8 @@ class Localizer:
         sys_lang = locale.getdefaultlocale()[0]
         return "ENG" if sys_lang.startswith("en") else "RU"
 
-    def _load_localization(self):
-        base_path = Path("files_for_the_project/localization")
+    def _load_localization(self, is_fallback=False):
+        base_path = Path(__file__).resolve().parent / "files_for_the_project" / "localization"
         lang_files = {
             "RU": base_path / "RU.txt",
             "ENG": base_path / "ENG.txt"
@@ -40,9 +40,12 @@ class Localizer:
                     for line in f if line.strip()
                 }
         except FileNotFoundError:
+            if is_fallback:
+                self._load_default_strings()
+                return
             print(f"⚠️ Missing {self.language} localization! Using {self._fallback_language}")
             self.language = self._fallback_language
-            self._load_localization()
+            self._load_localization(is_fallback=True)
 
     def _load_default_strings(self):
         """Устанавливает резервные строки локализации по умолчанию."""
@@ -5,6 +5,11 @@
 - Отображение меню
 - Обработка выбора пользователя
 
+Тяжелые зависимости (pandas, numpy, sklearn, matplotlib, kaggle) и модули
+компонентов импортируются отложенно — при первом использовании пункта меню.
+Ключ `--startup-profile` выводит время импортов при запуске, а ключ
+`--job FILE` выполняет пакетное задание без диалога (см. модуль `pipeline`).
+
 Пример использования:
     if __name__ == "__main__":
         app = MainApplication()
@@ -16,48 +21,106 @@
     localization: Локализация строк.
 """
 
-from data_importer_exporter import DataImporterExporter
+import sys
+import time
+
+_startup_started = time.perf_counter()
+
+from lazy_imports import enable_import_profiling, lazy_import, print_import_report
+
+if __name__ == "__main__" and "--startup-profile" in sys.argv[1:]:
+    enable_import_profiling()
+
+import argparse
+
 from localization import Localizer
-from data_table_viewer import DataFrameViewer
-from data_visualizer import DataFrameVisualizer
-import pandas as pd
-from neural_network import CancerPredictor
-import numpy as np
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+data_importer_exporter = lazy_import("data_importer_exporter")
+data_lazy = lazy_import("data_lazy")
+data_profiler = lazy_import("data_profiler")
+data_table_viewer = lazy_import("data_table_viewer")
+data_visualizer = lazy_import("data_visualizer")
+neural_network = lazy_import("neural_network")
+
 
 class MainApplication:
-    def __init__(self):
+    def __init__(self, startup_profile: bool = False):
         """Инициализирует главное приложение.
 
         Создает:
-            - Пустой DataFrame для хранения данных
+            - Пустой DataFrame для хранения данных (при первом импорте)
             - Объект локализации
-            - Основные компоненты приложения
+            - Основные компоненты приложения (при первом использовании)
+
+        Args:
+            startup_profile: Вывести время импортов перед главным меню
         """
+        self.df = None
         self.localizer = Localizer()
+        prompt_started = time.perf_counter()
         self._offer_language_switch()
+        prompt_seconds = time.perf_counter() - prompt_started
         self._init_components()
         self._show_welcome()
+        if startup_profile:
+            print_import_report(time.perf_counter() - _startup_started - prompt_seconds)
         self.run()
 
     def _init_components(self):
-        """Инициализирует основные компоненты приложения.
+        """Подготавливает основные компоненты приложения.
 
-        Создает:
-            - Импортер/экспортер данных
-            - Просмотрщик таблиц
-            - Визуализатор данных
+        Компоненты создаются при первом обращении:
+            - Импортер/экспортер данных (`importer`)
+            - Просмотрщик таблиц (`table_viewer`)
+            - Визуализатор данных (`visualizer`)
+        """
+        self._importer = None
+        self._table_viewer = None
+        self._visualizer = None
+
+    def _create_component(self, factory):
+        """Создает компонент, завершая работу при ошибке инициализации.
 
         Raises:
             SystemExit: Если инициализация не удалась
         """
         try:
-            self.importer = DataImporterExporter(self.localizer, self)
-            self.table_viewer = DataFrameViewer(self.localizer)
-            self.visualizer = DataFrameVisualizer(self.localizer)
+            return factory()
         except Exception as e:
             print(f"{self.localizer.get_string(14)}: {str(e)}")
             exit(1)
 
+    @property
+    def importer(self):
+        if self._importer is None:
+            self._importer = self._create_component(
+                lambda: data_importer_exporter.DataImporterExporter(self.localizer, self))
+        return self._importer
+
+    @property
+    def table_viewer(self):
+        if self._table_viewer is None:
+            self._table_viewer = self._create_component(
+                lambda: data_table_viewer.DataFrameViewer(self.localizer))
+        return self._table_viewer
+
+    @property
+    def visualizer(self):
+        if self._visualizer is None:
+            self._visualizer = self._create_component(
+                lambda: data_visualizer.DataFrameVisualizer(self.localizer))
+        return self._visualizer
+
+    def _has_data(self) -> bool:
+        """Проверяет, загружены ли данные."""
+        return self.df is not None and not self.df.empty
+
+    def _is_lazy(self) -> bool:
+        """Проверяет, что данные открыты вне памяти (`LazyDataset`)."""
+        return self.df is not None and not isinstance(self.df, pd.DataFrame)
+
     def _offer_language_switch(self):
         print(f"\nDetected system language: {self.localizer.language}")
         choice = input("Change language? (y/N): ").lower()
@@ -168,7 +231,7 @@ class MainApplication:
         }
 
         if choice in handlers:
-            if choice in [2, 3] and self.df.empty:
+            if choice in [2, 3] and not self._has_data():
                 print(self.localizer.get_string(10))
                 return
 
@@ -179,11 +242,30 @@ class MainApplication:
 
         Обновляет:
             self.df: Если импорт прошел успешно
+            Профиль данных: строится для каждого нового DataFrame
         """
         success, new_df = self.importer.show_menu()
         if success:
             self.df = new_df
             print(self.localizer.get_string(11).format(len(self.df)))
+            if data_profiler.get_profile(self.df) is None:
+                self._profile_data()
+
+    def _profile_data(self):
+        """Строит профиль загруженных данных и привязывает его к DataFrame.
+
+        Профиль переиспользуют просмотр таблицы, визуализация и нейросеть.
+        Для данных вне памяти профиль строится по случайной выборке строк.
+        """
+        if self._is_lazy():
+            profile = data_profiler.profile_dataframe(self.df.sample(data_lazy.DEFAULT_SAMPLE_ROWS))
+            print(f"Данные вне памяти: профиль строится по выборке из {profile.rows} строк")
+        else:
+            profile = data_profiler.profile_dataframe(self.df)
+        data_profiler.attach_profile(self.df, profile)
+        print(f"Профиль данных построен за {profile.seconds:.2f} с "
+              f"({len(profile.numeric_columns())} числовых, "
+              f"{len(profile.categorical_columns())} категориальных столбцов)")
 
     def _show_data_table(self):
         """Запускает просмотр данных в табличном виде."""
@@ -211,7 +293,7 @@ class MainApplication:
 
     def _predict_cancer_type(self):
         """Прогнозирует тип рака."""
-        if self.df.empty:
+        if not self._has_data():
             print("Ошибка: данные не загружены!")
             return
         
@@ -220,14 +302,17 @@ class MainApplication:
             activation = input("Введите функцию активации (relu, logistic, tanh): ")
             learning_rate = float(input("Введите скорость обучения (например, 0.001): "))
             
-            predictor = CancerPredictor(
+            predictor = neural_network.CancerPredictor(
                 hidden_layer_sizes=hidden_layers,
                 activation=activation,
                 learning_rate_init=learning_rate
             )
-            X_train, X_test, y_train, y_test = predictor.preprocess_data(self.df, "Cancer_Type")
-            predictor.train(X_train, y_train)
-            accuracy = predictor.evaluate(X_test, y_test)
+            if self._is_lazy():
+                accuracy = predictor.train_batches(self.df, "Cancer_Type")
+            else:
+                X_train, X_test, y_train, y_test = predictor.preprocess_data(self.df, "Cancer_Type")
+                predictor.train(X_train, y_train)
+                accuracy = predictor.evaluate(X_test, y_test)
             print(f"\nТочность модели: {accuracy:.2f}")
             
             predictor.save_model("cancer_model.pkl")
@@ -236,7 +321,7 @@ class MainApplication:
             print(f"Ошибка: {str(e)}")
     def _predict_mutation_type(self):
         """Прогнозирует тип мутации."""
-        if self.df.empty:
+        if not self._has_data():
             print("Ошибка: данные не загружены!")
             return
         
@@ -249,18 +334,22 @@ class MainApplication:
             activation = input("Введите функцию активации (relu, logistic, tanh): ")
             learning_rate = float(input("Введите скорость обучения (например, 0.001): "))
             
-            predictor = CancerPredictor(
+            predictor = neural_network.CancerPredictor(
                 hidden_layer_sizes=hidden_layers,
                 activation=activation,
                 learning_rate_init=learning_rate
             )
-            self.df = self.df.dropna(subset=["Mutation_Type"])
-            X_train, X_test, y_train, y_test = predictor.preprocess_data(
-                self.df, 
-                target_column='Mutation_Type' 
-            )
-            predictor.train(X_train, y_train)
-            accuracy = predictor.evaluate(X_test, y_test)
+            if self._is_lazy():
+                # Строки с пропусками отбрасываются в каждом пакете
+                accuracy = predictor.train_batches(self.df, 'Mutation_Type')
+            else:
+                self.df = self.df.dropna(subset=["Mutation_Type"])
+                X_train, X_test, y_train, y_test = predictor.preprocess_data(
+                    self.df, 
+                    target_column='Mutation_Type' 
+                )
+                predictor.train(X_train, y_train)
+                accuracy = predictor.evaluate(X_test, y_test)
             print(f"\nТочность модели: {accuracy:.2f}")
             
             predictor.save_model("mutation_model.pkl")
@@ -270,25 +359,27 @@ class MainApplication:
 
 
     def _predict_new_data(self):
-            if self.df.empty:
+            if not self._has_data():
                 print("Ошибка: данные не загружены!")
                 return
 
             try:
                 new_data = {}
                 valid_columns = [col for col in self.df.columns if col not in ['Cancer_Type', 'Mutation_Type']]
+                lazy = self._is_lazy()
+                dtypes = self.df.dtypes
 
                 print("\nВведите значения признаков:")
                 for column in valid_columns:
-                    dtype = self.df[column].dtype
+                    dtype = dtypes[column]
                     while True:
                         try:
                             value = input(f"{column} ({dtype}): ")
-                            if np.issubdtype(dtype, np.number):
+                            if pd.api.types.is_numeric_dtype(dtype):
                                 converted_value = float(value) if '.' in value else int(value)
                                 new_data[column] = [converted_value]
                             else:
-                                unique_values = list(map(str, self.df[column].unique()))
+                                unique_values = list(map(str, self.df.unique(column) if lazy else self.df[column].unique()))
                                 if value not in unique_values:
                                     print(f"Допустимые значения: {', '.join(unique_values)}")
                                     continue
@@ -299,18 +390,21 @@ class MainApplication:
 
                 new_df = pd.DataFrame(new_data)[valid_columns]
                 for col in valid_columns:
-                    new_df[col] = new_df[col].astype(self.df[col].dtype)
+                    # У данных вне памяти категории известны только по частям файла
+                    if not (lazy and isinstance(dtypes[col], pd.CategoricalDtype)):
+                        new_df[col] = new_df[col].astype(dtypes[col])
 
-                predictor = CancerPredictor.load_model("cancer_model.pkl")
+                predictor = neural_network.CancerPredictor.load_model("cancer_model.pkl")
                 X_processed, _ = predictor.preprocess_data(new_df)
 
-                mutation_predictor = CancerPredictor.load_model("mutation_model.pkl")
+                mutation_predictor = neural_network.CancerPredictor.load_model("mutation_model.pkl")
                 X_mut_processed, _ = mutation_predictor.preprocess_data(new_df)
 
                 cancer_proba = predictor.model.predict_proba(X_processed)
                 mutation_proba = mutation_predictor.model.predict_proba(X_mut_processed)
 
-                self.df = pd.concat([self.df, new_df], ignore_index=True)
+                if not lazy:
+                    self.df = pd.concat([self.df, new_df], ignore_index=True)
 
                 print("\nРезультаты прогноза:")
                 print("Вероятности типов рака:")
@@ -323,7 +417,7 @@ class MainApplication:
 
             except Exception as e:
                 print(f"Ошибка прогнозирования: {str(e)}")
-                if 'new_df' in locals() and not new_df.empty:
+                if 'new_df' in locals() and not new_df.empty and not self._is_lazy():
                     self.df = self.df[:-len(new_df)]
 
 
@@ -332,5 +426,20 @@ class MainApplication:
         print(f"\n{self.localizer.get_string(12)}")
         print(self.localizer.get_string(13))
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Система анализа медицинских данных")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="вывести время импортов при запуске и при первом использовании модулей")
+    parser.add_argument("--job", metavar="FILE",
+                        help="выполнить JSON-задание (импорт, обучение, оценка, экспорт) без диалога")
+    parser.add_argument("--track-memory", action="store_true",
+                        help="замерять пиковую память этапов задания (медленнее)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    app = MainApplication()
+    args = parse_args()
+    if args.job:
+        from pipeline import run_job
+        sys.exit(run_job(args.job, track_memory=args.track_memory))
+    app = MainApplication(startup_profile=args.startup_profile)
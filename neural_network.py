@@ -6,6 +6,8 @@ from sklearn.preprocessing import OneHotEncoder
 import numpy as np
 import joblib
 
+from data_profiler import CATEGORICAL, NUMERIC, column_kind, get_profile
+
 class CancerPredictor:
     def __init__(self, hidden_layer_sizes=(100,), activation='relu', learning_rate_init=0.001):
         self.model = MLPClassifier(
@@ -21,11 +23,17 @@ class CancerPredictor:
         self.feature_names = None
 
     def preprocess_data(self, df, target_column=None):
+        profile = get_profile(df)
+        if profile is not None:
+            kinds = {name: column.kind for name, column in profile.columns.items()}
+        else:
+            kinds = {name: column_kind(df[name]) for name in df.columns}
+
         df = df.copy()
         df = df.replace([np.inf, -np.inf], np.nan).dropna()
 
-        categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
-        numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+        categorical_cols = [col for col in df.columns if kinds.get(col) == CATEGORICAL]
+        numeric_cols = [col for col in df.columns if kinds.get(col) == NUMERIC]
 
         if target_column:
             if target_column in categorical_cols:
@@ -76,6 +84,50 @@ class CancerPredictor:
         y_pred = self.model.predict(X_test)
         return accuracy_score(y_test, y_pred)
 
+    def _batch_features(self, batch, target_column):
+        batch = batch.replace([np.inf, -np.inf], np.nan).dropna()
+        if batch.empty:
+            return None, None
+        X, _ = self.preprocess_data(batch.drop(columns=[target_column]))
+        return X, self.label_encoder.transform(batch[target_column])
+
+    def train_batches(self, dataset, target_column, epochs=5, sample_rows=100_000, holdout_every=5):
+        # Данные вне памяти (LazyDataset): кодировщик и масштабирование
+        # подбираются по выборке, классы — по всему столбцу, а сеть
+        # дообучается пакетами через partial_fit. Каждая holdout_every-я
+        # строка (по номеру) откладывается для оценки точности, поэтому
+        # проверочная выборка есть при любом числе частей.
+        self.preprocess_data(dataset.sample(sample_rows), target_column)
+        classes = self.label_encoder.fit(dataset.unique(target_column)).classes_
+        columns = list(dataset.columns)
+        for _ in range(epochs):
+            for batch in dataset.iter_batches(columns):
+                X, y = self._batch_features(batch[~self._holdout(batch, holdout_every)], target_column)
+                if X is not None:
+                    self.model.partial_fit(X, y, classes=np.arange(len(classes)))
+
+        correct = total = 0
+        for batch in dataset.iter_batches(columns):
+            X, y = self._batch_features(batch[self._holdout(batch, holdout_every)], target_column)
+            if X is not None:
+                correct += int((self.model.predict(X) == y).sum())
+                total += len(y)
+        return correct / total if total else float("nan")
+
+    @staticmethod
+    def _holdout(batch, holdout_every):
+        # Номера строк в индексе пакета не зависят от эпохи и разбиения на части
+        return batch.index.to_numpy() % holdout_every == holdout_every - 1
+
+    def evaluate_batches(self, dataset, target_column):
+        correct = total = 0
+        for batch in dataset.iter_batches(list(dataset.columns)):
+            X, y = self._batch_features(batch, target_column)
+            if X is not None:
+                correct += int((self.model.predict(X) == y).sum())
+                total += len(y)
+        return correct / total if total else float("nan")
+
     def save_model(self, path):
         to_dump = {
             'model': self.model,
@@ -0,0 +1,351 @@
+"""Модуль пакетного (неинтерактивного) режима.
+
+Задание описывается JSON-файлом со списком этапов, которые выполняются
+по порядку без запросов ввода: импорт, отбор строк, обучение, оценка модели
+и экспорт.
+Для каждого этапа выводятся время выполнения и (с `--track-memory`) пиковая
+память, а процесс
+завершается с кодом состояния, поэтому задание можно запускать по расписанию
+на вычислительном узле.
+
+Пример задания:
+    {
+        "stages": [
+            {"type": "import", "path": "data/site_*.csv", "streaming": true},
+            {"type": "filter", "expression": "Age > 60 and Cancer_Type in (Lung, Breast)"},
+            {"type": "train", "target": "Cancer_Type", "hidden_layers": [100, 50],
+             "model_path": "cancer_model.pkl"},
+            {"type": "evaluate", "target": "Cancer_Type", "model_path": "cancer_model.pkl"},
+            {"type": "export", "path": "out/cohort.parquet"},
+            {"type": "export", "path": "out/cohort_by_type", "partition_by": ["Cancer_Type"]}
+        ]
+    }
+
+Типы этапов:
+    import: `path` (файл, архив, каталог или glob-шаблон) либо `kaggle` (`owner/slug[/версия]`;
+        без версии берется последняя версия из кэша, `refresh` — `true`, чтобы узнать
+        последнюю версию у Kaggle) и необязательный список `files` (для архива — имена членов); параметры `streaming`, `columns`, `sheet`, `max_rows`,
+        для SQLite — `table` и `where` (условия через `;`); для каталога секционированного
+        Parquet — `partitions` (`{"Cancer_Type": ["Lung"]}`), читаются только подходящие секции;
+        `dedup` — `true` для удаления повторяющихся строк или список ключевых столбцов;
+        `compact_strings` — `false`, чтобы не переводить текстовые столбцы в `category`
+        и строки Arrow; `out_of_core` — `true`, чтобы открыть CSV/Parquet как датасет
+        на диске (`LazyDataset`) без загрузки в память: обучение и оценка идут пакетами,
+        экспорт — блоками строк
+    filter: `expression` — выражение фильтра (см. `data_filter_expression`); следующие
+        этапы работают только с подходящими строками
+    train: `target`, `hidden_layers`, `activation`, `learning_rate`, `model_path`
+    evaluate: `target`, `model_path`
+    export: `path` и необязательный `format` (по умолчанию — по расширению файла);
+        `partition_by` — список столбцов для записи каталога секционированного Parquet
+
+Коды завершения:
+    0 — все этапы выполнены, 1 — ошибка этапа, 2 — некорректное задание.
+
+Классы:
+    PipelineRunner: Выполняет этапы задания.
+
+Функции:
+    run_job: Загружает задание из файла и выполняет его.
+"""
+
+import json
+import time
+from pathlib import Path
+
+from data_streaming import MemoryTracker
+
+EXIT_OK = 0
+EXIT_STAGE_FAILED = 1
+EXIT_INVALID_JOB = 2
+
+STAGE_TYPES = ("import", "filter", "train", "evaluate", "export")
+# Обязательные ключи этапов; у импорта обязателен один из ключей `path` и `kaggle`
+REQUIRED_KEYS = {
+    "filter": ("expression",),
+    "train": ("target",),
+    "evaluate": ("target", "model_path"),
+    "export": ("path",),
+}
+
+
+class PipelineRunner:
+    """Выполняет этапы пакетного задания.
+
+    Attributes:
+        localizer: Объект локализации для компонентов
+        df: Текущий датасет (передается между этапами)
+        importer: Импортер/экспортер данных
+        results: Результаты этапов (тип, время, пиковая память, описание)
+    """
+
+    def __init__(self, localizer, track_memory: bool = False):
+        from data_importer_exporter import DataImporterExporter
+
+        self.localizer = localizer
+        self.track_memory = track_memory
+        self.df = None
+        self.importer = DataImporterExporter(localizer, self)
+        self.results = []
+
+    def run(self, stages) -> int:
+        """Выполняет этапы по порядку, останавливаясь на первой ошибке.
+
+        Args:
+            stages: Список словарей с описанием этапов
+
+        Returns:
+            int: Код завершения
+        """
+        handlers = {
+            "import": self._import,
+            "filter": self._filter,
+            "train": self._train,
+            "evaluate": self._evaluate,
+            "export": self._export,
+        }
+        status = EXIT_OK
+        for number, stage in enumerate(stages, 1):
+            stage_type = stage["type"]
+            started = time.perf_counter()
+            try:
+                with MemoryTracker(self.track_memory) as memory:
+                    summary = handlers[stage_type](stage)
+            except Exception as e:
+                summary = f"ошибка: {str(e)}"
+                status = EXIT_STAGE_FAILED
+            self.results.append((stage_type, time.perf_counter() - started, memory.peak_bytes, summary))
+            self._print_stage(number, *self.results[-1])
+            if status != EXIT_OK:
+                break
+        self._print_summary(status)
+        return status
+
+    def _print_stage(self, number, stage_type, seconds, peak_bytes, summary):
+        memory = f", пиковая память {peak_bytes / 2 ** 20:.1f} МБ" if peak_bytes is not None else ""
+        print(f"[{number}] {stage_type}: {seconds:.2f} с{memory} — {summary}", flush=True)
+
+    def _print_summary(self, status: int):
+        total = sum(result[1] for result in self.results)
+        state = "успешно" if status == EXIT_OK else "с ошибкой"
+        print(f"Задание завершено {state}: этапов {len(self.results)}, всего {total:.2f} с", flush=True)
+
+    def _require_data(self):
+        if self.df is None or self.df.empty:
+            raise ValueError(self.localizer.get_string(10))
+
+    def _import(self, stage) -> str:
+        from data_kaggle import data_file_label, list_data_files, parse_dataset_ref
+        from data_archives import is_archive, list_members
+        from data_dedup import RowDeduplicator
+        from data_multi_import import SOURCE_COLUMN, expand_sources, import_many, is_multi_source
+        from data_partitions import is_partitioned_dataset, read_partitioned
+
+        if stage.get("out_of_core"):
+            return self._import_lazy(stage)
+
+        deduplicator = None
+        if stage.get("dedup"):
+            keys = stage["dedup"] if isinstance(stage["dedup"], list) else None
+            deduplicator = RowDeduplicator(keys, exclude=[SOURCE_COLUMN])
+
+        partition_stats = None
+        if "kaggle" in stage:
+            owner, slug, version = parse_dataset_ref(stage["kaggle"])
+            dataset_dir, _ = self.importer.kaggle_cache.fetch(owner, slug, version,
+                                                              refresh=bool(stage.get("refresh")))
+            files = list_data_files(dataset_dir)
+            if stage.get("files"):
+                by_label = {data_file_label(f, dataset_dir): f for f in files}
+                missing = [name for name in stage["files"] if name not in by_label]
+                if missing:
+                    raise FileNotFoundError(self.localizer.get_string(22).format(", ".join(missing)))
+                files = [by_label[name] for name in stage["files"]]
+            if not files:
+                raise ValueError(self.localizer.get_string(31))
+            sources = files
+        elif is_partitioned_dataset(stage["path"]):
+            filters = {column: values if isinstance(values, list) else [values]
+                       for column, values in stage.get("partitions", {}).items()}
+            self.df, partition_stats = read_partitioned(stage["path"], filters or None, stage.get("columns"))
+            if deduplicator is not None:
+                self.df = deduplicator.filter_frame(self.df)
+            sources = []
+        elif is_multi_source(stage["path"]):
+            sources = expand_sources(stage["path"])
+            if not sources:
+                raise FileNotFoundError(self.localizer.get_string(22).format(stage["path"]))
+        elif is_archive(stage["path"]):
+            sources = list_members(stage["path"])
+            if stage.get("files"):
+                sources = [member for member in sources if member.name in stage["files"]]
+            if not sources:
+                raise ValueError(self.localizer.get_string(31))
+        else:
+            sources = [Path(stage["path"])]
+
+        if len(sources) == 1:
+            keys = ("streaming", "columns", "row_groups", "sheet", "max_rows", "table", "where")
+            options = {key: stage[key] for key in keys if key in stage}
+            self.df = self.importer.load_local_file(sources[0], deduplicator=deduplicator, **options)
+        elif sources:
+            self.df, _ = import_many(sources, streaming=stage.get("streaming", False), deduplicator=deduplicator)
+
+        from data_profiler import attach_profile, profile_dataframe
+        from data_strings import compact_strings
+        compaction = compact_strings(self.df) if stage.get("compact_strings", True) else None
+        attach_profile(self.df, profile_dataframe(self.df))
+        summary = f"строк {len(self.df)}, столбцов {len(self.df.columns)}"
+        if compaction is not None and compaction.converted:
+            summary += f", память {compaction.bytes_before / 2 ** 20:.1f} → {compaction.bytes_after / 2 ** 20:.1f} МБ"
+        if deduplicator is not None and deduplicator.rows_seen:
+            summary += f", удалено дубликатов {deduplicator.dropped}"
+        if partition_stats is not None:
+            summary += f", секций {partition_stats.partitions_read} из {partition_stats.partitions_total}"
+        return summary
+
+    def _import_lazy(self, stage) -> str:
+        from data_lazy import DEFAULT_SAMPLE_ROWS, open_lazy
+        from data_profiler import attach_profile, profile_dataframe
+        from data_sniffer import sniff_csv
+
+        path = Path(stage["path"])
+        read_options = sniff_csv(path).read_options(chunked=True) if path.suffix.lower() == ".csv" else {}
+        self.df = open_lazy(path, **read_options)
+        if stage.get("columns"):
+            self.df = self.df[stage["columns"]]
+        attach_profile(self.df, profile_dataframe(self.df.sample(DEFAULT_SAMPLE_ROWS)))
+        return (f"вне памяти: строк {len(self.df)}, столбцов {len(self.df.columns)}, "
+                f"частей {self.df.part_count}, на диске {self.df.disk_bytes / 2 ** 20:.1f} МБ")
+
+    def _filter(self, stage) -> str:
+        from data_filter_expression import parse_filter
+        from data_lazy import LazyDataset
+
+        self._require_data()
+        expression = parse_filter(stage["expression"])
+        rows_before = len(self.df)
+        if isinstance(self.df, LazyDataset):
+            self.df = self.df.filter(expression.mask, columns=expression.columns)
+        else:
+            self.df = self.df[expression.mask(self.df)].reset_index(drop=True)
+        return f"строк {len(self.df)} из {rows_before}"
+
+    def _train(self, stage) -> str:
+        from data_lazy import LazyDataset
+        from neural_network import CancerPredictor
+
+        self._require_data()
+        target = stage["target"]
+        predictor = CancerPredictor(
+            hidden_layer_sizes=tuple(stage.get("hidden_layers", (100,))),
+            activation=stage.get("activation", "relu"),
+            learning_rate_init=stage.get("learning_rate", 0.001),
+        )
+        if isinstance(self.df, LazyDataset):
+            accuracy = predictor.train_batches(self.df, target)
+        else:
+            df = self.df.dropna(subset=[target])
+            X_train, X_test, y_train, y_test = predictor.preprocess_data(df, target)
+            predictor.train(X_train, y_train)
+            accuracy = predictor.evaluate(X_test, y_test)
+        model_path = stage.get("model_path")
+        if model_path:
+            predictor.save_model(model_path)
+        return f"точность {accuracy:.4f}" + (f", модель сохранена в {model_path}" if model_path else "")
+
+    def _evaluate(self, stage) -> str:
+        import numpy as np
+        from data_lazy import LazyDataset
+        from neural_network import CancerPredictor
+
+        self._require_data()
+        target = stage["target"]
+        predictor = CancerPredictor.load_model(stage["model_path"])
+        if isinstance(self.df, LazyDataset):
+            accuracy = predictor.evaluate_batches(self.df, target)
+            return f"точность {accuracy:.4f} на {len(self.df)} строках (пакетами)"
+        df = self.df.replace([np.inf, -np.inf], np.nan).dropna()
+        X, _ = predictor.preprocess_data(df.drop(columns=[target]))
+        y = predictor.label_encoder.transform(df[target])
+        accuracy = predictor.evaluate(X, y)
+        return f"точность {accuracy:.4f} на {len(y)} строках"
+
+    def _export(self, stage) -> str:
+        from data_importer_exporter import EXPORT_FORMATS
+
+        self._require_data()
+        export_path = Path(stage["path"])
+        partition_by = stage.get("partition_by") or []
+        if partition_by:
+            file_format = "partitioned"
+        else:
+            file_format = stage.get("format") or "".join(export_path.suffixes).lstrip(".").lower()
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(self.localizer.get_string(37))
+        export_path.parent.mkdir(parents=True, exist_ok=True)
+        self.importer.export_frame(self.df, export_path, file_format, partition_by=partition_by)
+        if export_path.is_dir():
+            files = [f for f in export_path.rglob("*") if f.is_file()]
+            return f"{export_path} ({len(files)} файлов, {sum(f.stat().st_size for f in files) / 2 ** 20:.1f} МБ)"
+        return f"{export_path} ({export_path.stat().st_size / 2 ** 20:.1f} МБ)"
+
+
+def load_job(job_path: Path) -> list:
+    """Читает и проверяет файл задания.
+
+    Returns:
+        list: Этапы задания
+
+    Raises:
+        ValueError: Если задание некорректно
+    """
+    with open(job_path, "r", encoding="utf-8") as f:
+        job = json.load(f)
+    stages = job.get("stages") if isinstance(job, dict) else None
+    if not stages:
+        raise ValueError("задание не содержит этапов (ключ 'stages')")
+    if not isinstance(stages, list):
+        raise ValueError("'stages' должен быть списком этапов")
+    for number, stage in enumerate(stages, 1):
+        if not isinstance(stage, dict):
+            raise ValueError(f"этап {number}: ожидается объект, а не {type(stage).__name__}")
+        if stage.get("type") not in STAGE_TYPES:
+            raise ValueError(f"этап {number}: неизвестный тип {stage.get('type')!r}")
+        missing = [key for key in REQUIRED_KEYS.get(stage["type"], ()) if not stage.get(key)]
+        if stage["type"] == "import" and not (stage.get("path") or stage.get("kaggle")):
+            missing.append("path или kaggle")
+        if missing:
+            raise ValueError(f"этап {number} ({stage['type']}): не заданы {', '.join(missing)}")
+        if stage["type"] == "filter":
+            from data_filter_expression import parse_filter
+
+            try:
+                parse_filter(stage.get("expression", ""))
+            except ValueError as e:
+                raise ValueError(f"этап {number}: {str(e)}") from None
+    return stages
+
+
+def run_job(job_path: Path, localizer=None, track_memory: bool = False) -> int:
+    """Загружает задание из файла и выполняет его.
+
+    Args:
+        job_path: Путь к JSON-файлу задания
+        localizer: Объект локализации (по умолчанию создается новый)
+        track_memory: Замерять пиковую память этапов через tracemalloc
+            (замедляет этапы, поэтому выключено по умолчанию)
+
+    Returns:
+        int: Код завершения
+    """
+    try:
+        stages = load_job(job_path)
+    except (OSError, ValueError) as e:
+        print(f"Некорректное задание {job_path}: {str(e)}")
+        return EXIT_INVALID_JOB
+
+    if localizer is None:
+        from localization import Localizer
+        localizer = Localizer()
+    return PipelineRunner(localizer, track_memory).run(stages)
@@ -0,0 +1,73 @@
+import gzip
+import io
+import tarfile
+import zipfile
+
+import pandas as pd
+import pytest
+
+from data_archives import (ArchiveMember, full_suffix, inner_suffix, is_archive, list_members,
+                           read_member)
+
+CSV = "ID;Age;Tumor_Size\n1;35;1,5\n2;62;2,25\n3;70;\n"
+
+
+def _expected():
+    return pd.DataFrame({"ID": [1, 2, 3], "Age": [35, 62, 70], "Tumor_Size": [1.5, 2.25, None]})
+
+
+def test_suffixes():
+    assert full_suffix("data/Cohort.CSV.GZ") == ".csv.gz"
+    assert full_suffix("site.v2.tar.xz") == ".tar.xz"
+    assert inner_suffix("cohort.csv.zst") == ".csv"
+    assert inner_suffix("cohort.parquet") == ".parquet"
+    assert is_archive("a.tgz") and is_archive("a.tar.bz2") and not is_archive("a.csv.gz")
+
+
+def test_zip_members_are_read_without_extracting(tmp_path):
+    path = tmp_path / "cohort.zip"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("b/cohort.csv", CSV)
+        archive.writestr("a/nested.csv.gz", gzip.compress(CSV.encode()))
+        archive.writestr("readme.txt", "text")
+        archive.writestr("empty/", "")
+
+    members = list_members(path)
+
+    assert [member.name for member in members] == ["a/nested.csv.gz", "b/cohort.csv"]
+    assert members[0].compression == "gzip" and members[1].compression is None
+    assert members[1].size == len(CSV)
+    for member in members:
+        for streaming in (False, True):
+            df = read_member(member, streaming=streaming)
+            pd.testing.assert_frame_equal(df, _expected(), check_dtype=False)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cohort.zip"]
+
+
+@pytest.mark.parametrize("mode, name", [("w", "cohort.tar"), ("w:gz", "cohort.tar.gz"), ("w:xz", "cohort.tar.xz")])
+def test_tar_members(tmp_path, mode, name):
+    path = tmp_path / name
+    frame = _expected()
+    parquet = io.BytesIO()
+    frame.to_parquet(parquet, index=False)
+    with tarfile.open(path, mode) as archive:
+        for member_name, data in (("data/cohort.csv", CSV.encode()), ("data/cohort.parquet", parquet.getvalue())):
+            info = tarfile.TarInfo(member_name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+    members = list_members(path)
+
+    assert [member.suffix for member in members] == [".csv", ".parquet"]
+    for member in members:
+        pd.testing.assert_frame_equal(read_member(member), frame, check_dtype=False)
+    assert str(members[0]) == f"{path}/data/cohort.csv"
+
+
+def test_unsupported_member(tmp_path):
+    path = tmp_path / "notes.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("notes.txt", "text")
+    assert list_members(path) == []
+    with pytest.raises(ValueError):
+        read_member(ArchiveMember(path, "notes.txt"))
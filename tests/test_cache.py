@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data_cache import CACHE_ROOT, DEFAULT_CACHE_DIR, DatasetCache  # noqa: E402
+
+
+def _source(tmp_path, text="a,b\n1,x\n2,y\n"):
+    path = tmp_path / "data.csv"
+    path.write_text(text)
+    return path
+
+
+def test_round_trip_returns_same_frame(tmp_path):
+    cache = DatasetCache(tmp_path / "cache")
+    path = _source(tmp_path)
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"], "c": [0.5, None]})
+
+    assert cache.get(path, {"sep": ","}) is None
+    cache.put(path, {"sep": ","}, df)
+    cached = cache.get(path, {"sep": ","})
+
+    pd.testing.assert_frame_equal(cached, df, check_dtype=False)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cached_frame_can_be_edited_in_place(tmp_path):
+    cache = DatasetCache(tmp_path / "cache")
+    path = _source(tmp_path)
+    cache.put(path, {}, pd.DataFrame({"a": [1, 2], "b": [0.5, 1.5]}))
+
+    cached = cache.get(path, {})
+    cached.loc[0, "a"] = 99
+
+    assert cached["a"].tolist() == [99, 2]
+
+
+def test_changed_file_or_options_miss(tmp_path):
+    cache = DatasetCache(tmp_path / "cache")
+    path = _source(tmp_path)
+    cache.put(path, {"sep": ","}, pd.DataFrame({"a": [1]}))
+
+    assert cache.get(path, {"sep": ";"}) is None
+    path.write_text("a,b\n3,z\n")
+    assert cache.get(path, {"sep": ","}) is None
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = DatasetCache(tmp_path / "cache")
+    first, second = tmp_path / "1.csv", tmp_path / "2.csv"
+    first.write_text("a\n1\n")
+    second.write_text("a\n2\n")
+    cache.put(first, {}, pd.DataFrame({"a": [1]}))
+    cache.max_bytes = cache.stats()["bytes"]
+
+    cache.put(second, {}, pd.DataFrame({"a": [2]}))
+
+    assert cache.stats()["entries"] == 1
+    assert cache.get(first, {}) is None
+    assert cache.get(second, {})["a"].tolist() == [2]
+
+
+def test_cache_root_does_not_depend_on_working_directory():
+    assert CACHE_ROOT.is_absolute()
+    assert DEFAULT_CACHE_DIR.parent == CACHE_ROOT
+    expected = os.environ.get("DATALYZE_CACHE_DIR") or Path.home() / ".datalyze_cache"
+    assert CACHE_ROOT == Path(expected)
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data_columnar import describe_columnar, is_columnar, read_columnar, write_columnar  # noqa: E402
+
+
+@pytest.fixture
+def cohort():
+    rows = 1000
+    return pd.DataFrame({
+        "Patient_ID": np.arange(rows),
+        "Age": np.arange(rows) % 80 + 18,
+        "Tumor_Size": np.linspace(0.5, 9.5, rows),
+        "Cancer_Type": pd.Categorical(np.array(["Lung", "Breast", "Colon"])[np.arange(rows) % 3]),
+        "Visit": pd.date_range("2024-01-01", periods=rows, freq="h"),
+    })
+
+
+@pytest.mark.parametrize("name", ["cohort.parquet", "cohort.feather"])
+def test_round_trip(tmp_path, cohort, name):
+    path = tmp_path / name
+    write_columnar(cohort, path, row_group_size=300)
+
+    assert is_columnar(path)
+    assert describe_columnar(path) == (list(cohort.columns), 4)
+    pd.testing.assert_frame_equal(read_columnar(path), cohort, check_dtype=False)
+
+
+@pytest.mark.parametrize("name", ["cohort.pq", "cohort.arrow"])
+def test_projection_of_columns_and_row_groups(tmp_path, cohort, name):
+    path = tmp_path / name
+    write_columnar(cohort, path, row_group_size=300)
+
+    df = read_columnar(path, columns=["Age", "Patient_ID"], row_groups=[1, 3])
+
+    assert list(df.columns) == ["Age", "Patient_ID"]
+    assert df["Patient_ID"].tolist() == list(range(300, 600)) + list(range(900, 1000))
+
+
+def test_unsupported_suffix(tmp_path, cohort):
+    assert not is_columnar(tmp_path / "cohort.csv")
+    with pytest.raises(ValueError):
+        write_columnar(cohort, tmp_path / "cohort.csv")
+    with pytest.raises(ValueError):
+        read_columnar(tmp_path / "cohort.orc")
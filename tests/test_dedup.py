@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from data_dedup import RowDeduplicator
+
+
+def test_duplicates_within_and_across_blocks():
+    dedup = RowDeduplicator()
+
+    first = dedup.filter(pd.DataFrame({"x": [1, 2, 1], "s": ["a", "b", "a"]}))
+    second = dedup.filter(pd.DataFrame({"x": [2, 3], "s": ["b", "c"]}))
+
+    assert first["x"].tolist() == [1, 2]
+    assert second["x"].tolist() == [3]
+    assert (dedup.rows_seen, dedup.dropped, dedup.unique_rows) == (5, 2, 3)
+
+
+def test_int_chunk_widened_to_float_still_matches():
+    # Потоковый импорт переводит столбец в float64, когда в чанке появляется пропуск
+    dedup = RowDeduplicator()
+
+    dedup.filter(pd.DataFrame({"x": np.array([1, 2], dtype=np.int8), "s": ["a", "b"]}))
+    kept = dedup.filter(pd.DataFrame({"x": [1.0, np.nan], "s": ["a", "a"]}))
+
+    assert len(kept) == 1
+    assert np.isnan(kept["x"].iloc[0])
+
+
+def test_integer_widths_and_nullable_integers_match():
+    dedup = RowDeduplicator()
+
+    dedup.filter(pd.DataFrame({"x": np.array([-1, 5], dtype=np.int8)}))
+    kept = dedup.filter(pd.DataFrame({"x": pd.array([-1, 5, None], dtype="Int64")}))
+
+    assert kept["x"].isna().tolist() == [True]
+
+
+def test_keys_and_exclude():
+    df = pd.DataFrame({"Patient_ID": [1, 1, 2], "Visit": [1, 2, 1], "Source_File": ["a", "b", "a"]})
+
+    by_key = RowDeduplicator(keys=["Patient_ID"]).filter_frame(df)
+    excluded = RowDeduplicator(exclude=["Source_File"]).filter_frame(
+        pd.DataFrame({"x": [1, 1], "Source_File": ["a", "b"]}))
+
+    assert by_key["Visit"].tolist() == [1, 1]
+    assert len(excluded) == 1
+
+
+def test_filter_frame_across_blocks_resets_index():
+    df = pd.DataFrame({"x": [1, 2, 3, 1, 2, 4]})
+
+    result = RowDeduplicator().filter_frame(df, block_rows=2)
+
+    assert result["x"].tolist() == [1, 2, 3, 4]
+    assert result.index.tolist() == [0, 1, 2, 3]
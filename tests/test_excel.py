@@ -0,0 +1,69 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from data_excel import iter_excel_chunks, list_sheets, read_excel_streaming, write_excel_rows  # noqa: E402
+
+
+@pytest.fixture
+def cohort():
+    return pd.DataFrame({
+        "Patient_ID": np.arange(7, dtype=np.int64),
+        "Age": [35, 62, 70, 55, 81, 44, 29],
+        "Tumor_Size": [1.5, np.nan, 12.25, 3.0, 0.5, 2.0, 7.75],
+        "Cancer_Type": ["Lung", "Breast", None, "Colon", "Lung", "Lung", "Breast"],
+        "Visit": pd.date_range("2024-01-01", periods=7, freq="D"),
+    })
+
+
+def test_round_trip_in_blocks(tmp_path, cohort):
+    path = tmp_path / "cohort.xlsx"
+    written = []
+    blocks = (cohort.iloc[start:start + 3] for start in range(0, len(cohort), 3))
+    write_excel_rows(blocks, list(cohort.columns), path, sheet_name="Cohort", on_block=written.append)
+
+    assert written == [3, 3, 1]
+    assert list_sheets(path) == ["Cohort"]
+    df = read_excel_streaming(path)
+    pd.testing.assert_frame_equal(df, cohort, check_dtype=False)
+    assert pd.api.types.is_datetime64_any_dtype(df["Visit"])
+    assert pd.isna(df.loc[2, "Cancer_Type"]) and np.isnan(df.loc[1, "Tumor_Size"])
+
+
+def test_chunks_and_row_limit(tmp_path, cohort):
+    path = tmp_path / "cohort.xlsx"
+    write_excel_rows([cohort], list(cohort.columns), path)
+
+    sizes = [len(chunk) for chunk in iter_excel_chunks(path, chunk_rows=3)]
+    assert sizes == [3, 3, 1]
+    assert read_excel_streaming(path, sheet="Sheet1", max_rows=4)["Patient_ID"].tolist() == [0, 1, 2, 3]
+
+
+def test_ragged_rows_and_blank_headers(tmp_path):
+    from openpyxl import Workbook
+
+    path = tmp_path / "raw.xlsx"
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.append(["ID", None, "Date"])
+    worksheet.append([1, "x"])
+    worksheet.append([2, "y", datetime.datetime(2024, 5, 1), "extra"])
+    workbook.save(path)
+
+    df = read_excel_streaming(path)
+
+    # Как у pd.read_excel: пустые заголовки и лишние ячейки дают столбцы «Unnamed: N»
+    assert list(df.columns) == list(pd.read_excel(path).columns) == ["ID", "Unnamed: 1", "Date", "Unnamed: 3"]
+    assert df["ID"].tolist() == [1, 2]
+    assert pd.isna(df.loc[0, "Date"]) and df.loc[1, "Date"] == pd.Timestamp("2024-05-01")
+
+
+def test_header_only_sheet(tmp_path):
+    path = tmp_path / "empty.xlsx"
+    write_excel_rows([], ["A", "B"], path)
+    df = read_excel_streaming(path)
+    assert list(df.columns) == ["A", "B"] and df.empty
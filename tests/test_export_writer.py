@@ -0,0 +1,55 @@
+import gzip
+
+import pandas as pd
+import pytest
+
+from data_export_writer import BackgroundExport, split_format
+
+
+def _export(df, path, file_format, compression=None, block_rows=3):
+    export = BackgroundExport(df, path, file_format, compression, block_rows=block_rows).start()
+    export.join()
+    assert export.error is None, export.error
+    return export
+
+
+def test_split_format():
+    assert split_format("csv") == ("csv", None)
+    assert split_format("csv.gz") == ("csv", "gzip")
+    with pytest.raises(ValueError):
+        split_format("csv.rar")
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "feather"])
+def test_column_empty_in_first_block_is_written(tmp_path, file_format):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"id": range(6), "note": pd.Series([None, None, None, "x", "y", "z"], dtype=object)})
+    path = tmp_path / f"out.{file_format}"
+
+    export = _export(df, path, file_format)
+
+    result = pd.read_parquet(path) if file_format == "parquet" else pd.read_feather(path)
+    assert export.rows_written == 6
+    assert result["note"].tolist()[3:] == ["x", "y", "z"]
+    assert result["note"].isna().tolist()[:3] == [True, True, True]
+
+
+def test_all_null_column_is_written(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"id": range(5), "empty": pd.Series([None] * 5, dtype=object)})
+    path = tmp_path / "out.parquet"
+
+    _export(df, path, "parquet")
+
+    assert pd.read_parquet(path)["empty"].isna().all()
+
+
+def test_compressed_csv_round_trip_without_leftovers(tmp_path):
+    df = pd.DataFrame({"a": range(7), "b": list("abcdefg")})
+    path = tmp_path / "out.csv.gz"
+
+    _export(df, path, "csv", "gzip")
+
+    with gzip.open(path, "rt") as f:
+        assert pd.read_csv(f).equals(df)
+    assert [p.name for p in tmp_path.iterdir()] == ["out.csv.gz"]
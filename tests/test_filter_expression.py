@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_table_index
+from data_filter_expression import parse_filter
+
+
+def _frame(rows=3000, seed=2):
+    rng = np.random.default_rng(seed)
+    genes = rng.choice(["TP53", "BRCA1", "EGFR", "KRAS"], rows)
+    return pd.DataFrame({
+        "Age": rng.integers(18, 90, rows),
+        "Score": np.where(rng.random(rows) < 0.1, np.nan, rng.random(rows) * 100),
+        "Cancer_Type": pd.Categorical(rng.choice(["Lung", "Breast", "Colon"], rows)),
+        "Gene": pd.Series(np.where(rng.random(rows) < 0.05, None, genes), dtype=object),
+        "Smoker": rng.random(rows) < 0.3,
+        "Tumor Size": rng.random(rows) * 10,
+    })
+
+
+CASES = [
+    ("Age > 60", lambda df: df["Age"] > 60),
+    ("Age >= 60 and Age < 62", lambda df: (df["Age"] >= 60) & (df["Age"] < 62)),
+    ("Age between 40 and 41.5", lambda df: df["Age"].between(40, 41.5)),
+    ("Age = 30 or Age == 31", lambda df: df["Age"].isin([30, 31])),
+    ("Age in (20, 25) and not Smoker = true", lambda df: df["Age"].isin([20, 25]) & ~df["Smoker"]),
+    ("Age != 50", lambda df: df["Age"] != 50),
+    ("Score < 5", lambda df: df["Score"] < 5),
+    ("Score != 5", lambda df: df["Score"].notna() & (df["Score"] != 5)),
+    ("Cancer_Type in (lung, COLON)", lambda df: df["Cancer_Type"].isin(["Lung", "Colon"])),
+    ("Cancer_Type not in (Lung)", lambda df: df["Cancer_Type"] != "Lung"),
+    ('Gene ~ "tp5"', lambda df: df["Gene"].str.contains("TP5", na=False)),
+    ("Gene !~ RA", lambda df: df["Gene"].notna() & ~df["Gene"].str.contains("RA", na=False)),
+    ("Gene ~ '^(?:EG|KR)'", lambda df: df["Gene"].str.match("EG|KR", na=False)),
+    ("(Age < 30 or Age > 80) and `Tumor Size` <= 2.5",
+     lambda df: ((df["Age"] < 30) | (df["Age"] > 80)) & (df["Tumor Size"] <= 2.5)),
+    ("not (Gene = TP53 or Gene = KRAS)", lambda df: df["Gene"].notna() & ~df["Gene"].isin(["TP53", "KRAS"])),
+    ("not Score > 60", lambda df: df["Score"] <= 60),
+    ("not (Score > 60 or Age < 30)", lambda df: (df["Score"] <= 60) & (df["Age"] >= 30)),
+    ("not not Score > 60", lambda df: df["Score"] > 60),
+]
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+@pytest.mark.parametrize("text, expected", CASES, ids=[case[0] for case in CASES])
+def test_mask_matches_pandas(text, expected, use_index):
+    df = _frame()
+    mask = parse_filter(text).mask(df, use_index=use_index)
+    assert mask.dtype == bool and len(mask) == len(df)
+    assert np.array_equal(mask, expected(df).to_numpy(dtype=bool))
+
+
+def test_narrow_range_uses_sorted_index(monkeypatch):
+    df = _frame()
+    calls = []
+    range_rows = data_table_index.TableIndex.range_rows
+
+    def spy(self, *args, **kwargs):
+        calls.append(args)
+        return range_rows(self, *args, **kwargs)
+
+    monkeypatch.setattr(data_table_index.TableIndex, "range_rows", spy)
+    narrow = parse_filter("Age between 40 and 41").mask(df, use_index=True)
+    assert calls and np.array_equal(narrow, df["Age"].between(40, 41).to_numpy())
+
+    # Широкий диапазон считается сравнением, результат тот же
+    wide = parse_filter("Age > 20").mask(df, use_index=True)
+    assert np.array_equal(wide, (df["Age"] > 20).to_numpy())
+
+
+def test_columns_and_repr():
+    expression = parse_filter(' Age > 60 and (Gene ~ "TP5" or `Tumor Size` < 1) and Age < 70 ')
+    assert expression.columns == ["Age", "Gene", "Tumor Size"]
+    assert repr(expression) == "FilterExpression('Age > 60 and (Gene ~ \"TP5\" or `Tumor Size` < 1) and Age < 70')"
+
+
+@pytest.mark.parametrize("text", [
+    "", "Age >", "Age 60", "> 60", "Age > 60 and", "(Age > 60", "Age in 1, 2",
+    "Age in (1,", "Age between 1 or 2", "Age > 60 Gene = TP53", "Age ? 3",
+])
+def test_syntax_errors(text):
+    with pytest.raises(ValueError):
+        parse_filter(text)
+
+
+@pytest.mark.parametrize("text", ["Age > old", "Smoker = maybe", "Gene > TP53", "Cancer_Type between a and b"])
+def test_type_errors(text):
+    df = _frame(rows=100)
+    with pytest.raises(ValueError):
+        parse_filter(text).mask(df)
+
+
+@pytest.mark.parametrize("text", ["Stage = 2", "age > 60"])
+def test_missing_column(text):
+    with pytest.raises(KeyError):
+        parse_filter(text).mask(_frame(rows=10))
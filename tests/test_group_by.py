@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_group_by
+from data_group_by import group_by, parse_aggregations, pivot
+from data_table_viewer import DataFrameViewer
+
+
+def _frame(rows=500, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "City": rng.choice(["Омск", "Казань", "Самара"], rows),
+        "Sex": pd.Categorical(rng.choice(["F", "M"], rows)),
+        "Stage": np.where(rng.random(rows) < 0.05, np.nan, rng.integers(1, 5, rows)),
+        "Age": np.where(rng.random(rows) < 0.1, np.nan, rng.integers(18, 90, rows)),
+    })
+
+
+def test_parse_aggregations():
+    assert parse_aggregations(" Mean, q90 ,mean,q99.5") == ["mean", "q90", "q99.5"]
+    with pytest.raises(ValueError):
+        parse_aggregations("sum")
+    with pytest.raises(ValueError):
+        parse_aggregations(" , ")
+
+
+@pytest.mark.parametrize("keys", [["City"], ["Sex"], ["City", "Stage"], ["Sex", "City", "Stage"]])
+def test_aggregations_match_pandas(keys):
+    df = _frame()
+    result = group_by(df, keys, "Age", ["count", "mean", "median", "min", "max", "q25", "q90"])
+    grouped = df.groupby(keys, observed=True, dropna=True, sort=True)["Age"]
+    expected = pd.DataFrame({
+        "count": grouped.count(), "mean": grouped.mean(), "median": grouped.median(),
+        "min": grouped.min(), "max": grouped.max(),
+        "q25": grouped.quantile(0.25), "q90": grouped.quantile(0.9),
+    })
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_names=False,
+                                  check_index_type=False, check_categorical=False)
+
+
+def test_count_without_value_column_skips_missing_keys():
+    df = _frame()
+    result = group_by(df, ["Stage"])
+    expected = df.groupby("Stage", dropna=True).size()
+    assert result["count"].tolist() == expected.tolist()
+    assert result.index.tolist() == expected.index.tolist()
+
+
+def test_result_is_memoized_until_data_changes():
+    df = _frame()
+    first = group_by(df, ["City"], "Age", ["mean"])
+    assert group_by(df, ["City"], "Age", ["mean"]) is first
+    df.loc[0, "Age"] = 1000
+    assert group_by(df, ["City"], "Age", ["mean"]) is not first
+
+
+def test_memo_is_bounded(monkeypatch):
+    monkeypatch.setattr(data_group_by, "MEMO_SIZE", 2)
+    data_group_by._memo.clear()
+    df = _frame()
+    for column in ("Age", "Stage", "Age"):
+        group_by(df, ["City"], column, ["max"])
+    assert len(data_group_by._memo) == 2
+
+
+def test_pivot_fills_missing_combinations():
+    df = pd.DataFrame({"A": ["x", "x", "y"], "B": [1, 2, 1], "V": [1.0, 2.0, 3.0]})
+    counts = pivot(group_by(df, ["A", "B"]))
+    assert counts.loc["y"].tolist() == [1, 0]
+    means = pivot(group_by(df, ["A", "B"], "V", ["mean", "max"]))
+    assert list(means.columns) == ["mean 1", "mean 2", "max 1", "max 2"]
+    assert np.isnan(means.loc["y", "mean 2"])
+
+
+def test_errors():
+    df = _frame()
+    with pytest.raises(KeyError):
+        group_by(df, ["Missing"])
+    with pytest.raises(ValueError):
+        group_by(df, [])
+    with pytest.raises(ValueError):
+        group_by(df, ["Stage"], "City", ["mean"])
+
+
+def test_mixed_type_key_is_grouped():
+    df = pd.DataFrame({
+        "Key": pd.Series([1, "a", pd.Timestamp("2020-01-01"), "a", None, 1], dtype=object),
+        "V": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+    })
+    with pytest.raises(TypeError):
+        pd.factorize(df["Key"], sort=True)
+    result = group_by(df, ["Key"], "V", ["count", "mean"])
+    assert result.index.tolist() == [pd.Timestamp("2020-01-01"), 1, "a"]
+    assert result["count"].tolist() == [1, 2, 2]
+    assert result["mean"].tolist() == [3.0, 3.5, 3.0]
+
+
+class _Localizer:
+    def get_string(self, string_id):
+        return f"#{string_id}"
+
+
+def test_viewer_reports_group_errors(monkeypatch, capsys):
+    answers = iter(["Key", "", "n"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    df = pd.DataFrame({"Key": pd.Series([1, "a"], dtype=object)})
+    monkeypatch.setattr(data_group_by, "_key_codes",
+                        lambda series: (_ for _ in ()).throw(TypeError("unorderable")))
+    data_group_by._memo.clear()
+
+    DataFrameViewer(_Localizer())._show_groups(df)
+
+    assert "#47: unorderable" in capsys.readouterr().out
@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+
+from data_incremental import TailTracker, append_block
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_start_skips_partial_last_line(tmp_path):
+    path = tmp_path / "log.csv"
+    path.write_text("ID,Age,Gene\n1,40,TP53\n2,55,EG")
+    tracker = TailTracker()
+    df = tracker.start(path)
+    assert df["ID"].tolist() == [1]
+    assert tracker.state_for(path).offset == len("ID,Age,Gene\n1,40,TP53\n")
+
+
+def test_append_reads_only_new_complete_rows(tmp_path):
+    path = tmp_path / "log.csv"
+    path.write_text("ID,Age,Gene\n1,40,TP53\n")
+    tracker = TailTracker()
+    df = tracker.start(path)
+
+    assert tracker.append_new_rows(path, df) == (df, 0)
+
+    _append(path, "2,55,EGFR\n3,61,KR")
+    df, added = tracker.append_new_rows(path, df)
+    assert added == 1 and df["ID"].tolist() == [1, 2]
+
+    _append(path, "AS\n4,70.5,BRCA1\n")
+    df, added = tracker.append_new_rows(path, df)
+    assert added == 2
+    pd.testing.assert_frame_equal(df, pd.read_csv(path))
+
+
+def test_stale_frame_and_rewritten_file_are_rejected(tmp_path):
+    path = tmp_path / "log.csv"
+    path.write_text("ID,Age\n1,40\n2,41\n")
+    tracker = TailTracker()
+    first = tracker.start(path)
+    _append(path, "3,42\n")
+    second, _ = tracker.append_new_rows(path, first)
+
+    with pytest.raises(ValueError):
+        tracker.append_new_rows(path, first)
+
+    path.write_text("ID,Age\n9,10\n8,11\n7,12\n")
+    with pytest.raises(ValueError):
+        tracker.append_new_rows(path, second)
+
+    path.write_text("Key,Age\n1,40\n")
+    with pytest.raises(ValueError):
+        tracker.append_new_rows(tmp_path / "other.csv", second)
+
+
+def test_changed_header_is_rejected(tmp_path):
+    path = tmp_path / "log.csv"
+    path.write_text("ID,Age\n1,40\n")
+    tracker = TailTracker()
+    df = tracker.start(path)
+    path.write_text("ID,AGE\n1,40\n2,41\n")
+    with pytest.raises(ValueError):
+        tracker.append_new_rows(path, df)
+
+
+def test_append_block_widens_instead_of_truncating():
+    df = pd.DataFrame({"Age": [40, 50], "Small": pd.Series([1, 2], dtype="int8")})
+    block = pd.DataFrame({"Age": [70.5], "Small": [300]})
+    combined = append_block(df, block)
+    assert combined["Age"].tolist() == [40.0, 50.0, 70.5]
+    assert combined["Small"].tolist() == [1, 2, 300]
+
+
+def test_append_block_keeps_types_and_extends_categories():
+    df = pd.DataFrame({"Age": [40, 50], "Type": pd.Categorical(["Lung", "Colon"])})
+    block = pd.DataFrame({"Age": [61.0], "Type": ["Breast"]})
+    combined = append_block(df, block)
+    assert combined["Age"].dtype == df["Age"].dtype
+    assert isinstance(combined["Type"].dtype, pd.CategoricalDtype)
+    assert combined["Type"].tolist() == ["Lung", "Colon", "Breast"]
+    assert append_block(df, block.iloc[:0]) is df
@@ -0,0 +1,97 @@
+import zipfile
+
+import pytest
+
+from data_archives import ArchiveMember
+from data_kaggle import (KaggleClient, KaggleDatasetCache, LocalDirectoryClient, data_file_label,
+                         list_data_files, parse_dataset_ref)
+
+
+class CountingClient(LocalDirectoryClient):
+    def __init__(self, root):
+        super().__init__(root)
+        self.latest_calls = 0
+        self.downloads = []
+
+    def latest_version(self, owner, slug):
+        self.latest_calls += 1
+        return super().latest_version(owner, slug)
+
+    def download(self, owner, slug, version, target_dir):
+        self.downloads.append(version)
+        super().download(owner, slug, version, target_dir)
+
+
+def _publish(root, version, files):
+    directory = root / "owner" / "cancer" / version
+    directory.mkdir(parents=True)
+    for name, text in files.items():
+        (directory / name).write_text(text)
+
+
+def test_parse_dataset_ref():
+    assert parse_dataset_ref("https://www.kaggle.com/datasets/owner/cancer") == ("owner", "cancer", None)
+    assert parse_dataset_ref("https://www.kaggle.com/datasets/owner/cancer/versions/3") == ("owner", "cancer", "3")
+    assert parse_dataset_ref("owner/cancer/2") == ("owner", "cancer", "2")
+    with pytest.raises(ValueError):
+        parse_dataset_ref("cancer")
+
+
+def test_client_interface_is_abstract():
+    with pytest.raises(TypeError):
+        KaggleClient()
+
+
+def test_unversioned_import_uses_cache_until_refresh(tmp_path):
+    source = tmp_path / "source"
+    _publish(source, "1", {"data.csv": "a\n1\n"})
+    client = CountingClient(source)
+    cache = KaggleDatasetCache(client, tmp_path / "cache")
+
+    first, from_cache = cache.fetch("owner", "cancer")
+    assert (first.name, from_cache, client.downloads) == ("1", False, ["1"])
+    assert cache.latest_cached("owner", "cancer") == "1"
+
+    _publish(source, "2", {"data.csv": "a\n2\n"})
+    calls = client.latest_calls
+    again, from_cache = cache.fetch("owner", "cancer")
+    assert (again, from_cache) == (first, True)
+    assert client.latest_calls == calls
+
+    refreshed, from_cache = cache.fetch("owner", "cancer", refresh=True)
+    assert (refreshed.name, from_cache, client.downloads) == ("2", False, ["1", "2"])
+    assert (refreshed / "data.csv").read_text() == "a\n2\n"
+    assert cache.fetch("owner", "cancer", "1") == (first, True)
+
+
+def test_refresh_falls_back_to_cache_when_source_fails(tmp_path):
+    source = tmp_path / "source"
+    _publish(source, "1", {"data.csv": "a\n1\n"})
+    client = CountingClient(source)
+    cache = KaggleDatasetCache(client, tmp_path / "cache")
+    cached, _ = cache.fetch("owner", "cancer")
+
+    client.latest_version = lambda owner, slug: (_ for _ in ()).throw(OSError("нет сети"))
+    assert cache.fetch("owner", "cancer", refresh=True) == (cached, True)
+
+
+def test_failed_download_leaves_no_version(tmp_path):
+    cache = KaggleDatasetCache(LocalDirectoryClient(tmp_path / "source"), tmp_path / "cache")
+    with pytest.raises(FileNotFoundError):
+        cache.fetch("owner", "cancer", "5")
+    assert cache.latest_cached("owner", "cancer") is None
+
+
+def test_data_files_are_selected_inside_archives(tmp_path):
+    source = tmp_path / "source"
+    _publish(source, "1", {"readme.txt": "text", "extra.csv": "a\n1\n"})
+    with zipfile.ZipFile(source / "owner" / "cancer" / "1" / "cancer.zip", "w") as archive:
+        archive.writestr("data/train.csv", "a\n1\n")
+        archive.writestr("data/notes.md", "text")
+    dataset_dir, _ = KaggleDatasetCache(LocalDirectoryClient(source), tmp_path / "cache").fetch("owner", "cancer")
+
+    files = list_data_files(dataset_dir)
+    labels = sorted(data_file_label(f, dataset_dir) for f in files)
+
+    assert labels == ["cancer.zip/data/train.csv", "extra.csv"]
+    assert any(isinstance(f, ArchiveMember) for f in files)
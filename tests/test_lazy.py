@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data_lazy import _spills, open_lazy, spill_csv
+
+
+def _write_csv(path, rows, offset=0):
+    pd.DataFrame({
+        "ID": np.arange(offset, offset + rows),
+        "Age": np.arange(rows) % 70,
+        "City": [f"city{i % 5}" for i in range(rows)],
+    }).to_csv(path, index=False)
+
+
+def test_spill_is_reused_for_unchanged_file(tmp_path):
+    source = tmp_path / "data.csv"
+    _write_csv(source, 500)
+    first = spill_csv(source, tmp_path / "lazy", chunk_rows=200)
+    second = spill_csv(source, tmp_path / "lazy", chunk_rows=200)
+    assert first == second
+    assert len(list(first.glob("part-*.parquet"))) == 3
+
+
+def test_changed_source_replaces_previous_spill(tmp_path):
+    lazy_dir = tmp_path / "lazy"
+    source = tmp_path / "data.csv"
+    _write_csv(source, 300)
+    old = spill_csv(source, lazy_dir)
+    _write_csv(source, 400, offset=1000)
+    os.utime(source, ns=(source.stat().st_mtime_ns + 10 ** 9,) * 2)
+    new = spill_csv(source, lazy_dir)
+
+    assert new != old
+    assert not old.exists()
+    assert _spills(lazy_dir) == [new]
+
+
+def test_other_sources_are_kept_and_evicted_by_last_access(tmp_path):
+    lazy_dir = tmp_path / "lazy"
+    paths = []
+    for name in ("a", "b", "c"):
+        source = tmp_path / f"{name}.csv"
+        _write_csv(source, 2000)
+        paths.append(source)
+    spilled_a = spill_csv(paths[0], lazy_dir)
+    os.utime(spilled_a, ns=(1, 1))
+    spilled_b = spill_csv(paths[1], lazy_dir)
+    os.utime(spilled_b, ns=(2, 2))
+    # Повторное открытие `a` делает его недавно использованным
+    assert spill_csv(paths[0], lazy_dir) == spilled_a
+    size = sum(part.stat().st_size for part in spilled_a.glob("part-*.parquet"))
+
+    spilled_c = spill_csv(paths[2], lazy_dir, max_bytes=int(size * 2.5))
+
+    assert sorted(_spills(lazy_dir)) == sorted([spilled_a, spilled_c])
+
+
+def test_lazy_dataset_matches_pandas(tmp_path):
+    source = tmp_path / "data.csv"
+    _write_csv(source, 1000)
+    frame = pd.read_csv(source)
+    dataset = open_lazy(source, tmp_path / "lazy")
+
+    assert len(dataset) == len(frame)
+    # План типов может сделать текстовый столбец категориальным
+    loaded = dataset.to_pandas().astype({"City": str})
+    pd.testing.assert_frame_equal(loaded, frame, check_dtype=False)
+    page = dataset.page(10, 15).astype({"City": str}).reset_index(drop=True)
+    pd.testing.assert_frame_equal(page, frame.iloc[10:15].reset_index(drop=True), check_dtype=False)
+
+    young = dataset.filter(lambda batch: (batch["Age"] < 10).to_numpy(), columns=["Age"])
+    assert young.to_pandas()["ID"].tolist() == frame.loc[frame["Age"] < 10, "ID"].tolist()
+
+    ordered = dataset.sort_values("Age", ascending=False).to_pandas()
+    expected = frame.sort_values("Age", ascending=False, kind="stable")
+    assert ordered["ID"].tolist() == expected["ID"].tolist()
+    assert dataset.top_k("Age", 5).to_pandas()["Age"].tolist() == [0] * 5
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from lazy_imports import LazyModule, lazy_import
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _run(code):
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+
+
+def test_importing_main_does_not_load_heavy_packages():
+    output = _run(
+        "import sys, main\n"
+        "heavy = ('pandas', 'numpy', 'sklearn', 'matplotlib', 'kaggle', 'pyarrow', 'openpyxl')\n"
+        "print(sorted(name for name in heavy if name in sys.modules))\n"
+        "print(type(main.pd).__name__, main.pd.is_loaded)\n"
+    )
+    assert output.splitlines() == ["[]", "LazyModule False"]
+
+
+def test_module_is_loaded_on_first_attribute(tmp_path, monkeypatch):
+    (tmp_path / "lazy_probe_module.py").write_text("VALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_probe_module", raising=False)
+
+    module = lazy_import("lazy_probe_module")
+    assert isinstance(module, LazyModule) and not module.is_loaded
+    assert "lazy_probe_module" not in sys.modules
+
+    assert module.VALUE == 42
+    assert module.is_loaded and "VALUE" in dir(module)
+    # Уже загруженный модуль возвращается без заместителя
+    assert lazy_import("lazy_probe_module") is sys.modules["lazy_probe_module"]
+
+
+def test_import_profile_report():
+    output = _run(
+        "import lazy_imports\n"
+        "lazy_imports.enable_import_profiling()\n"
+        "import json\n"
+        "lazy_imports.print_import_report(0.5)\n"
+    )
+    assert "Время до главного меню: 0.500 с" in output
+    assert "(всего на импорты)" in output
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from data_multi_import import SOURCE_COLUMN, _common_dtype, harmonize_frames, import_many
+
+
+def test_datetimes_keep_their_type():
+    first = pd.Series(pd.to_datetime(["2020-01-01", "2020-01-02"]).as_unit("ns"))
+    second = pd.Series(pd.to_datetime(["2021-03-04"]).as_unit("s"))
+
+    assert _common_dtype([first, second], False) == np.dtype("M8[ns]")
+    aware = _common_dtype([first.dt.tz_localize("UTC"), second.dt.tz_localize("Europe/Moscow")], False)
+    assert aware == pd.DatetimeTZDtype(unit="ns", tz="UTC")
+    # Наивные даты с датами в часовом поясе согласовать нельзя
+    assert _common_dtype([first, second.dt.tz_localize("UTC")], False) == np.dtype("object")
+
+
+def test_extension_dtypes_are_not_collapsed_to_object():
+    nullable = pd.Series([1, None], dtype="Int64")
+
+    assert _common_dtype([nullable, pd.Series([3])], False) == pd.Int64Dtype()
+    assert _common_dtype([nullable, pd.Series([0.5])], False) == pd.Float64Dtype()
+    assert _common_dtype([pd.Series([True]), pd.Series([False])], True) == pd.BooleanDtype()
+    text = pd.Series(["a"], dtype=pd.StringDtype())
+    assert _common_dtype([text, text], True) == pd.StringDtype()
+    assert _common_dtype([pd.Series(["a"], dtype=object), pd.Series([1])], False) == np.dtype("object")
+
+
+def test_harmonize_fills_gaps_in_native_missing_values():
+    first = pd.DataFrame({
+        "Date": pd.to_datetime(["2020-01-01", "2020-01-02"]),
+        "Count": pd.Series([1, None], dtype="Int64"),
+        "Flag": [True, False],
+    })
+    second = pd.DataFrame({"Date": pd.to_datetime(["2021-01-01"]), "Count": [5]})
+
+    df = harmonize_frames([first, second], ["a.csv", "b.csv"])
+
+    assert pd.api.types.is_datetime64_any_dtype(df["Date"])
+    assert df["Date"].iloc[2] == pd.Timestamp("2021-01-01")
+    assert df["Count"].dtype == pd.Int64Dtype()
+    assert df["Count"].isna().tolist() == [False, True, False]
+    assert df["Flag"].dtype == pd.BooleanDtype()
+    assert df["Flag"].isna().tolist() == [False, False, True]
+    assert df[SOURCE_COLUMN].tolist() == ["a.csv", "a.csv", "b.csv"]
+
+
+def test_import_many_keeps_sniffed_dates(tmp_path):
+    for name, day in (("a.csv", "2020-01-15"), ("b.csv", "2020-02-20")):
+        (tmp_path / name).write_text(f"Date,Age\n{day},40\n{day},50\n")
+
+    df, _ = import_many([tmp_path / "a.csv", tmp_path / "b.csv"], max_workers=1)
+
+    assert pd.api.types.is_datetime64_any_dtype(df["Date"])
+    assert df["Date"].dt.month.tolist() == [1, 1, 2, 2]
+    assert df["Age"].tolist() == [40, 50, 40, 50]
+
+
+def test_category_missing_from_one_file(tmp_path):
+    rows = "\n".join(f"{i},{'Lung' if i % 2 else 'Breast'}" for i in range(40))
+    (tmp_path / "a.csv").write_text(f"Age,Cancer_Type\n{rows}\n")
+    (tmp_path / "b.csv").write_text("Age\n70\n71\n")
+
+    df, _ = import_many([tmp_path / "a.csv", tmp_path / "b.csv"], streaming=True, max_workers=1)
+
+    assert isinstance(df["Cancer_Type"].dtype, pd.CategoricalDtype)
+    assert df["Cancer_Type"].iloc[:2].tolist() == ["Breast", "Lung"]
+    assert df["Cancer_Type"].iloc[40:].isna().all()
+    assert df[SOURCE_COLUMN].value_counts().tolist() == [40, 2]
+
+
+def test_categories_of_different_types_fall_back_to_object():
+    first = pd.DataFrame({"Stage": pd.Categorical(["I", "II"])})
+    second = pd.DataFrame({"Stage": pd.Categorical([1, 2])})
+    third = pd.DataFrame({"Age": [1]})
+
+    df = harmonize_frames([first, second, third], ["a", "b", "c"])
+
+    assert df["Stage"].dtype == np.dtype("object")
+    assert df["Stage"].tolist()[:4] == ["I", "II", 1, 2]
+    assert pd.isna(df["Stage"].iloc[4])
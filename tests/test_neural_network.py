@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("pyarrow")
+
+from data_lazy import open_lazy  # noqa: E402
+from neural_network import CancerPredictor  # noqa: E402
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    rng = np.random.default_rng(4)
+    rows = 1000
+    age = rng.integers(18, 90, rows)
+    df = pd.DataFrame({
+        "Age": age,
+        "Smoker": rng.choice(["yes", "no"], rows),
+        "Cancer_Type": np.where(age > 55, "Lung", "Breast"),
+    })
+    path = tmp_path / "cohort.parquet"
+    df.to_parquet(path, index=False)
+    return open_lazy(path)
+
+
+def test_single_part_dataset_is_validated_on_held_out_rows(dataset, monkeypatch):
+    assert len(dataset._parts) == 1
+    predictor = CancerPredictor(hidden_layer_sizes=(8,))
+    fitted, predicted = [], []
+    partial_fit, predict = predictor.model.partial_fit, predictor.model.predict
+    monkeypatch.setattr(predictor.model, "partial_fit",
+                        lambda X, y, **kwargs: fitted.append(len(X)) or partial_fit(X, y, **kwargs))
+    monkeypatch.setattr(predictor.model, "predict", lambda X: predicted.append(len(X)) or predict(X))
+    monkeypatch.setattr(predictor, "evaluate_batches",
+                        lambda *args: pytest.fail("оценка на обучающих строках"))
+
+    accuracy = predictor.train_batches(dataset, "Cancer_Type", epochs=2, holdout_every=5)
+
+    assert fitted == [800, 800]
+    assert predicted == [200]
+    assert 0.0 <= accuracy <= 1.0
+
+
+def test_holdout_rows_are_every_nth_row():
+    batch = pd.DataFrame({"a": range(7)}, index=pd.RangeIndex(100, 107))
+    assert list(np.flatnonzero(CancerPredictor._holdout(batch, 5))) == [4]
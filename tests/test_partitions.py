@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data_partitions import (NULL_PARTITION, is_partitioned_dataset, list_partitions,  # noqa: E402
+                             parse_partition_filter, read_partitioned, write_partitioned)
+
+
+@pytest.fixture
+def cohort():
+    rng = np.random.default_rng(3)
+    rows = 300
+    return pd.DataFrame({
+        "Patient_ID": np.arange(rows),
+        "Age": rng.integers(18, 90, rows),
+        "Cancer_Type": rng.choice(["Lung", "Breast", "Colon/Rectum"], rows),
+        "Stage": np.where(rng.random(rows) < 0.1, np.nan, rng.integers(1, 4, rows)),
+    })
+
+
+def _sorted(df):
+    return df.sort_values("Patient_ID").reset_index(drop=True)
+
+
+def test_round_trip(tmp_path, cohort):
+    root = tmp_path / "dataset"
+    written = write_partitioned(cohort, root, ["Cancer_Type", "Stage"], max_workers=2)
+
+    assert is_partitioned_dataset(root) and not is_partitioned_dataset(tmp_path)
+    assert written == len(list_partitions(root)) == cohort.groupby(["Cancer_Type", "Stage"], dropna=False).ngroups
+    assert any(p.values["Stage"] == NULL_PARTITION for p in list_partitions(root))
+    with pytest.raises(FileExistsError):
+        write_partitioned(cohort, root, ["Cancer_Type"])
+
+    df, stats = read_partitioned(root)
+    assert stats.partitions_read == stats.partitions_total == written
+    assert isinstance(df["Cancer_Type"].dtype, pd.CategoricalDtype)
+    result = _sorted(df)[cohort.columns].astype({"Cancer_Type": object})
+    pd.testing.assert_frame_equal(result, cohort.astype({"Cancer_Type": object}), check_dtype=False)
+
+
+def test_filter_prunes_partitions(tmp_path, cohort):
+    root = tmp_path / "dataset"
+    write_partitioned(cohort, root, ["Cancer_Type"])
+
+    filters = parse_partition_filter(" Cancer_Type = Lung, Colon/Rectum ")
+    df, stats = read_partitioned(root, filters)
+
+    assert (stats.partitions_read, stats.partitions_total) == (2, 3)
+    assert stats.bytes_read < stats.bytes_total
+    expected = cohort[cohort["Cancer_Type"] != "Breast"]
+    assert sorted(df["Patient_ID"]) == sorted(expected["Patient_ID"])
+    with pytest.raises(KeyError):
+        read_partitioned(root, {"Site": ["Moscow"]})
+    with pytest.raises(ValueError):
+        parse_partition_filter("Cancer_Type")
+
+
+def test_projection_with_partition_columns(tmp_path, cohort):
+    root = tmp_path / "dataset"
+    write_partitioned(cohort, root, ["Cancer_Type", "Stage"])
+
+    df, _ = read_partitioned(root, columns=["Stage", "Patient_ID", "Cancer_Type"])
+    assert list(df.columns) == ["Stage", "Patient_ID", "Cancer_Type"]
+    expected = cohort[["Stage", "Patient_ID", "Cancer_Type"]].sort_values("Patient_ID").reset_index(drop=True)
+    pd.testing.assert_frame_equal(_sorted(df).astype({"Cancer_Type": object}), expected, check_dtype=False)
+
+    only_keys, _ = read_partitioned(root, {"Cancer_Type": ["Lung"]}, columns=["Cancer_Type"])
+    assert list(only_keys.columns) == ["Cancer_Type"]
+    assert len(only_keys) == (cohort["Cancer_Type"] == "Lung").sum()
+
+    data_only, _ = read_partitioned(root, columns=["Age"])
+    assert list(data_only.columns) == ["Age"]
+    assert sorted(data_only["Age"]) == sorted(cohort["Age"])
@@ -0,0 +1,82 @@
+import json
+
+import pandas as pd
+import pytest
+
+import data_importer_exporter
+from data_cache import DatasetCache
+from pipeline import EXIT_INVALID_JOB, EXIT_OK, EXIT_STAGE_FAILED, load_job, run_job
+
+
+class _Localizer:
+    def get_string(self, string_id):
+        return f"#{string_id} {{}}"
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_importer_exporter, "DatasetCache", lambda: DatasetCache(tmp_path / "cache"))
+    pd.DataFrame({
+        "Age": [35, 62, 70, 55, 81],
+        "Cancer_Type": ["Lung", "Breast", "Lung", "Colon", "Lung"],
+    }).to_csv(tmp_path / "cohort.csv", index=False)
+    return tmp_path
+
+
+def _job(path, stages):
+    path.write_text(json.dumps({"stages": stages}), encoding="utf-8")
+    return path
+
+
+def test_successful_job(workdir, capsys):
+    job = _job(workdir / "job.json", [
+        {"type": "import", "path": str(workdir / "cohort.csv")},
+        {"type": "filter", "expression": "Age > 60 and Cancer_Type = lung"},
+        {"type": "export", "path": str(workdir / "out" / "old.csv")},
+    ])
+
+    assert run_job(job, _Localizer()) == EXIT_OK
+    assert pd.read_csv(workdir / "out" / "old.csv")["Age"].tolist() == [70, 81]
+    output = capsys.readouterr().out
+    assert "[2] filter" in output and "строк 2 из 5" in output
+
+
+def test_failed_stage_stops_the_job(workdir, capsys):
+    job = _job(workdir / "job.json", [
+        {"type": "import", "path": str(workdir / "missing.csv")},
+        {"type": "export", "path": str(workdir / "never.csv")},
+    ])
+
+    assert run_job(job, _Localizer()) == EXIT_STAGE_FAILED
+    assert not (workdir / "never.csv").exists()
+    assert "[2]" not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("content", [
+    "{not json",
+    json.dumps({"stages": []}),
+    json.dumps({"stages": {"type": "import"}}),
+    json.dumps({"stages": ["import"]}),
+    json.dumps({"stages": [{"type": "unknown"}]}),
+    json.dumps({"stages": [{"type": "import"}]}),
+    json.dumps({"stages": [{"type": "import", "path": "a.csv"}, {"type": "train"}]}),
+    json.dumps({"stages": [{"type": "evaluate", "target": "Cancer_Type"}]}),
+    json.dumps({"stages": [{"type": "export"}]}),
+    json.dumps({"stages": [{"type": "filter", "expression": "Age >"}]}),
+])
+def test_invalid_job(tmp_path, content):
+    job = tmp_path / "job.json"
+    job.write_text(content, encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        load_job(job)
+    assert run_job(job, _Localizer()) == EXIT_INVALID_JOB
+
+
+def test_missing_job_file(tmp_path):
+    assert run_job(tmp_path / "missing.json", _Localizer()) == EXIT_INVALID_JOB
+
+
+def test_valid_job_is_loaded(tmp_path):
+    stages = [{"type": "import", "kaggle": "owner/cancer"}, {"type": "train", "target": "Cancer_Type"}]
+    assert load_job(_job(tmp_path / "job.json", stages)) == stages
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_profiler import (CATEGORICAL, EXACT_DISTINCT_LIMIT, KMV_SIZE, NUMERIC, _estimate_distinct,
+                           attach_profile, get_profile, profile_dataframe)
+
+
+def test_small_columns_are_counted_exactly():
+    series = pd.Series([1, 2, 2, None, 3])
+
+    assert _estimate_distinct(series) == 3
+    assert _estimate_distinct(pd.Series(["a", "b", "a"], dtype="category")) == 2
+
+
+@pytest.mark.parametrize("distinct", [500_000, 50_000])
+def test_kmv_estimate_is_close_for_large_columns(distinct):
+    rng = np.random.default_rng(7)
+    series = pd.Series(rng.integers(0, distinct, EXACT_DISTINCT_LIMIT * 5))
+    exact = series.nunique()
+
+    estimate = _estimate_distinct(series)
+
+    # Стандартная ошибка KMV — 1/√k; допуск в четыре раза больше
+    assert abs(estimate - exact) / exact < 4 / np.sqrt(KMV_SIZE)
+
+
+def test_low_cardinality_large_column_is_exact():
+    series = pd.Series(np.tile(np.arange(KMV_SIZE // 2), EXACT_DISTINCT_LIMIT // 1_000))
+
+    assert len(series) > EXACT_DISTINCT_LIMIT
+    assert _estimate_distinct(series) == KMV_SIZE // 2
+
+
+def test_profile_summarises_columns_and_attaches_to_frame():
+    df = pd.DataFrame({"Age": [40, 50, None, 60], "Cancer_Type": ["Lung", "Lung", "Skin", None]})
+
+    profile = profile_dataframe(df, max_workers=1)
+    attach_profile(df, profile)
+
+    age, cancer = profile.columns["Age"], profile.columns["Cancer_Type"]
+    assert (profile.rows, age.kind, age.nulls, age.minimum, age.maximum, age.mean) == (4, NUMERIC, 1, 40, 60, 50)
+    assert (cancer.kind, cancer.distinct, cancer.top_values[0]) == (CATEGORICAL, 2, ("Lung", 2))
+    assert get_profile(df) is profile
+    assert get_profile(df.copy()) is None
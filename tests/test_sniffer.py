@@ -0,0 +1,60 @@
+import gzip
+
+import pandas as pd
+import pytest
+
+from data_sniffer import read_csv_auto, sniff_csv
+
+RUSSIAN = "Пациент;Возраст;Размер опухоли;Дата визита\nИванов;35;1,5;31.12.2024\nПетрова;62;12,25;01.02.2025\n"
+
+
+def test_cp1251_semicolon_and_decimal_comma(tmp_path):
+    path = tmp_path / "registry.csv"
+    path.write_bytes(RUSSIAN.encode("cp1251"))
+
+    dialect = sniff_csv(path)
+
+    assert (dialect.encoding, dialect.delimiter, dialect.decimal, dialect.header) == ("cp1251", ";", ",", 0)
+    assert dialect.date_formats == {"Дата визита": "%d.%m.%Y"}
+    for streaming in (False, True):
+        df, _, _ = read_csv_auto(path, streaming=streaming)
+        assert list(df.columns) == ["Пациент", "Возраст", "Размер опухоли", "Дата визита"]
+        assert df["Пациент"].astype(str).tolist() == ["Иванов", "Петрова"]
+        assert df["Размер опухоли"].tolist() == [1.5, 12.25]
+        assert df["Дата визита"].tolist() == [pd.Timestamp("2024-12-31"), pd.Timestamp("2025-02-01")]
+
+
+@pytest.mark.parametrize("delimiter", [",", "\t", "|"])
+def test_delimiters_keep_decimal_point(tmp_path, delimiter):
+    path = tmp_path / "data.csv"
+    rows = [["ID", "Size", "Visit"], ["1", "1.5", "2024-01-31"], ["2", "3", "2024-02-29"]]
+    path.write_text("\n".join(delimiter.join(row) for row in rows) + "\n", encoding="utf-8-sig")
+
+    dialect = sniff_csv(path)
+
+    assert (dialect.encoding, dialect.delimiter, dialect.decimal) == ("utf-8-sig", delimiter, ".")
+    assert dialect.date_formats == {"Visit": "%Y-%m-%d"}
+    df, _, _ = read_csv_auto(path)
+    assert list(df.columns) == ["ID", "Size", "Visit"]
+
+
+def test_file_without_header(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("1;35;1,5\n2;62;2,0\n", encoding="utf-8")
+
+    dialect = sniff_csv(path)
+    df, _, _ = read_csv_auto(path)
+
+    assert dialect.header is None
+    assert df.shape == (2, 3) and df[2].tolist() == [1.5, 2.0]
+
+
+def test_compressed_stream(tmp_path):
+    path = tmp_path / "registry.csv.gz"
+    path.write_bytes(gzip.compress(RUSSIAN.encode("cp1251")))
+
+    dialect = sniff_csv(path)
+    df, _, _ = read_csv_auto(lambda: open(path, "rb"), "gzip")
+
+    assert (dialect.encoding, dialect.delimiter, dialect.decimal) == ("cp1251", ";", ",")
+    assert df["Возраст"].tolist() == [35, 62]
@@ -0,0 +1,101 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from data_sql import build_select, list_tables, parse_filters, read_sql_table, table_columns, write_sql_table
+
+
+@pytest.fixture
+def cohort():
+    return pd.DataFrame({
+        "Patient_ID": [1, 2, 3, 4],
+        "Age": [35, 62, 70, 55],
+        "Cancer_Type": ["Lung", "Breast", "Lung", None],
+        "Tumor_Size": [1.5, 2.0, None, 3.25],
+    })
+
+
+def test_parse_filters_and_build_select():
+    filters = parse_filters("Age > 60; Cancer_Type in (Lung, Breast); Gene like TP5%")
+
+    sql, params = build_select("cohort", ["Age"], filters, limit=10)
+
+    assert sql == ('SELECT "Age" FROM "cohort" WHERE "Age" > ? AND "Cancer_Type" IN (?, ?) '
+                   'AND "Gene" LIKE ? LIMIT ?')
+    assert params == [60, "Lung", "Breast", "TP5%", 10]
+    with pytest.raises(ValueError):
+        parse_filters("Age")
+
+
+def test_quoted_values_stay_text():
+    filters = parse_filters("Code = '0123'; Stage in (\"2\", 3); Name = \"O'Neil\"")
+    assert [item.value for item in filters] == ["0123", ["2", 3], "O'Neil"]
+
+
+def test_round_trip_with_filters(tmp_path, cohort):
+    db_path = tmp_path / "registry.db"
+    write_sql_table(cohort, db_path, "cohort", index_columns=["Age"])
+
+    assert list_tables(db_path) == ["cohort"]
+    assert table_columns(db_path, "cohort") == list(cohort.columns)
+    df = read_sql_table(db_path, "cohort", ["Patient_ID", "Tumor_Size"], parse_filters("Age >= 55"))
+    assert list(df.columns) == ["Patient_ID", "Tumor_Size"]
+    assert sorted(df["Patient_ID"]) == [2, 3, 4]
+    assert df.set_index("Patient_ID")["Tumor_Size"].isna().to_dict() == {2: False, 3: True, 4: False}
+    assert len(read_sql_table(db_path, "cohort", limit=2)) == 2
+
+
+def test_path_with_uri_characters(tmp_path, cohort):
+    folder = tmp_path / "odd?dir#x%41"
+    folder.mkdir()
+    db_path = folder / "a b.db"
+    write_sql_table(cohort, db_path, "cohort")
+
+    assert list_tables(db_path) == ["cohort"]
+    assert len(read_sql_table(db_path, "cohort")) == len(cohort)
+
+
+def test_connections_are_closed(tmp_path, cohort, monkeypatch):
+    db_path = tmp_path / "registry.db"
+    write_sql_table(cohort, db_path, "cohort")
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+    list_tables(db_path)
+    table_columns(db_path, "cohort")
+    read_sql_table(db_path, "cohort")
+
+    assert len(opened) == 3
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+def test_missing_database_is_not_created(tmp_path):
+    db_path = tmp_path / "missing.db"
+
+    with pytest.raises(sqlite3.OperationalError):
+        list_tables(db_path)
+    assert not db_path.exists()
+
+
+def test_failed_rewrite_keeps_old_table(tmp_path, cohort):
+    db_path = tmp_path / "registry.db"
+    write_sql_table(cohort, db_path, "cohort")
+
+    def fail(rows):
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        write_sql_table(cohort.iloc[:2], db_path, "cohort", batch_rows=1, on_batch=fail)
+
+    assert len(read_sql_table(db_path, "cohort")) == len(cohort)
+    write_sql_table(cohort.iloc[:2], db_path, "cohort")
+    assert len(read_sql_table(db_path, "cohort")) == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["registry.db"]
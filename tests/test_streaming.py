@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from data_streaming import _assemble, _collect, build_dtype_plan, read_csv_chunked
+
+
+def _write_csv(path, rows=1_000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "Patient_ID": np.arange(rows),
+        "Age": rng.integers(18, 95, rows),
+        "Tumor_Size": rng.normal(3.5, 1.2, rows).round(2),
+        "Cancer_Type": rng.choice(["Lung", "Breast", "Colon"], rows),
+    })
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_chunked_read_matches_pandas(tmp_path):
+    path = tmp_path / "cohort.csv"
+    expected = _write_csv(path)
+
+    df, stats = read_csv_chunked(path, sample_rows=100, chunksize=128)
+
+    assert stats.rows == len(expected)
+    assert df["Cancer_Type"].dtype == "category"
+    pd.testing.assert_frame_equal(df.astype({"Cancer_Type": object, "Age": np.int64}),
+                                  expected.astype({"Cancer_Type": object}), check_dtype=False)
+
+
+def test_memory_is_not_tracked_by_default(tmp_path):
+    path = tmp_path / "cohort.csv"
+    _write_csv(path, rows=50)
+
+    _, stats = read_csv_chunked(path)
+    _, tracked = read_csv_chunked(path, track_memory=True)
+
+    assert stats.peak_bytes is None
+    assert tracked.peak_bytes > 0
+
+
+def test_plan_widens_when_later_chunk_does_not_fit(tmp_path):
+    path = tmp_path / "widen.csv"
+    path.write_text("x,s\n" + "\n".join([f"{x},a" for x in ["1"] * 10 + ["100000", "", "2"]]) + "\n")
+
+    df, _ = read_csv_chunked(path, sample_rows=5, chunksize=5)
+
+    assert df["x"].dtype == np.float64
+    assert df["x"].iloc[10] == 100000
+    assert np.isnan(df["x"].iloc[11])
+
+
+def test_float_plan_widens_instead_of_rounding(tmp_path):
+    path = tmp_path / "floats.csv"
+    values = ["0.5"] * 10 + ["123456.789", "0.25"]
+    path.write_text("x,s\n" + "\n".join(f"{x},a" for x in values) + "\n")
+
+    df, _ = read_csv_chunked(path, sample_rows=5, chunksize=5)
+
+    assert df["x"].dtype == np.float64
+    assert df["x"].iloc[10] == 123456.789
+    assert build_dtype_plan(pd.DataFrame({"a": [0.5, 2.25], "b": [0.1, 1.0]})) == {"a": "float32", "b": "float64"}
+
+
+def test_assemble_releases_column_parts():
+    chunks = [pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}), pd.DataFrame({"a": [3], "b": ["x"]})]
+    plan = build_dtype_plan(chunks[0])
+    columns = _collect(chunks)
+
+    df = _assemble(columns, plan)
+
+    assert columns == {}
+    assert df["a"].tolist() == [1, 2, 3]
+    assert df["b"].tolist() == ["x", "y", "x"]
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from data_strings import arrow_string_dtype, compact_strings
+
+
+def _frame():
+    rows = 40
+    return pd.DataFrame({
+        "Cancer Type": pd.Series(["Lung", "Breast", "Colon", None] * (rows // 4), dtype=object),
+        "Sample ID": pd.Series([f"S-{i:04d}" for i in range(rows)], dtype=object),
+        "Age": np.arange(rows),
+    })
+
+
+def test_compacts_columns_in_place():
+    df = _frame()
+    original = df.copy()
+    same = df
+
+    result = compact_strings(df)
+
+    assert same is df
+    assert isinstance(df["Cancer Type"].dtype, pd.CategoricalDtype)
+    assert df["Cancer Type"].cat.categories.tolist() == ["Breast", "Colon", "Lung"]
+    assert df["Cancer Type"].astype(object).where(df["Cancer Type"].notna(), None).tolist() == \
+        original["Cancer Type"].tolist()
+    assert df["Sample ID"].dtype == arrow_string_dtype()
+    assert df["Sample ID"].tolist() == original["Sample ID"].tolist()
+    assert df["Age"].dtype == original["Age"].dtype
+    assert result.converted == {"Cancer Type": "category", "Sample ID": str(arrow_string_dtype())}
+    assert result.bytes_after < result.bytes_before
+
+
+def test_sorted_categories_keep_sort_order():
+    df = pd.DataFrame({"Mutation": pd.Series(["nonsense", "frameshift", "missense", "frameshift"] * 5, dtype=object)})
+    expected = df["Mutation"].sort_values(kind="stable").tolist()
+
+    compact_strings(df)
+
+    assert df["Mutation"].sort_values(kind="stable").astype(str).tolist() == expected
+
+
+def test_max_category_ratio():
+    df = _frame()
+
+    result = compact_strings(df, max_category_ratio=0.01)
+
+    assert set(result.converted.values()) == {str(arrow_string_dtype())}
+    assert not isinstance(df["Cancer Type"].dtype, pd.CategoricalDtype)
+
+
+def test_no_text_columns():
+    df = pd.DataFrame({"Age": [1, 2], "Cancer Type": pd.Categorical(["Lung", "Lung"])})
+
+    assert compact_strings(df) is None
+
+
+def test_second_call_is_noop():
+    df = _frame()
+    compact_strings(df)
+
+    result = compact_strings(df)
+
+    assert result is None or result.converted == {}
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_table_index
+from data_group_by import group_by
+from data_table_index import index_for, invalidate
+
+
+def _frame(rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "ID": np.arange(rows),
+        "Age": rng.integers(18, 90, rows),
+        "Score": np.where(rng.random(rows) < 0.1, np.nan, rng.random(rows) * 100),
+        "City": rng.choice(["Москва", "Казань", "Самара", "Омск"], rows),
+    })
+
+
+def test_contains_and_equals_match_pandas():
+    df = _frame()
+    index = index_for(df)
+    for pattern in ("ка", "МОСК", "ар", "a.a", "нет"):
+        expected = df["City"].str.contains(pattern, case=False, regex=True).to_numpy()
+        assert np.array_equal(index.contains("City", pattern), expected)
+    assert np.array_equal(index.equals("City", "омск"), (df["City"] == "Омск").to_numpy())
+
+
+def test_order_and_top_k_match_sort_values():
+    df = _frame()
+    index = index_for(df)
+    for ascending in (True, False):
+        expected = df["Score"].reset_index(drop=True).sort_values(
+            ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+        assert np.array_equal(index.order("Score", ascending), expected)
+    rows = np.arange(0, len(df), 3)
+    top = index.top_k("Age", rows, 5, largest=True)
+    assert sorted(df["Age"].to_numpy()[top]) == sorted(np.sort(df["Age"].to_numpy()[rows])[-5:])
+
+
+@pytest.mark.parametrize("low, high, include_low, include_high", [
+    (30, 50, True, True),
+    (30, 50, False, False),
+    (30.5, None, True, True),
+    (None, 25, True, False),
+    (95, 99, True, True),
+])
+def test_range_rows_match_comparison(low, high, include_low, include_high):
+    df = _frame()
+    rows = index_for(df).range_rows("Age", low, high, include_low, include_high)
+    ages = df["Age"]
+    mask = np.ones(len(df), dtype=bool)
+    if low is not None:
+        mask &= (ages >= low if include_low else ages > low).to_numpy()
+    if high is not None:
+        mask &= (ages <= high if include_high else ages < high).to_numpy()
+    assert sorted(rows) == list(np.flatnonzero(mask))
+    assert np.all(np.diff(ages.to_numpy()[rows]) >= 0)
+
+
+def test_range_rows_skip_missing_and_reject_text():
+    df = _frame()
+    index = index_for(df)
+    assert sorted(index.range_rows("Score", 0, 100)) == list(np.flatnonzero(df["Score"].notna()))
+    with pytest.raises(TypeError):
+        index.range_rows("City", 0, 1)
+
+
+def test_in_place_edit_rebuilds_index():
+    df = _frame()
+    index = index_for(df)
+    assert not index.range_rows("Age", 99, 99).size
+    index.order("Age")
+
+    df.loc[7, "Age"] = 99
+    fresh = index_for(df)
+
+    assert fresh is not index and fresh.version > index.version
+    assert list(fresh.range_rows("Age", 99, 99)) == [7]
+    assert fresh.order("Age", ascending=False)[0] == 7
+
+
+def test_invalidate_resets_index_missed_by_sample(monkeypatch):
+    monkeypatch.setattr(data_table_index, "FINGERPRINT_ROWS", 10)
+    df = _frame(rows=1000)
+    index = index_for(df)
+    before = group_by(df, ["City"], "Age", ["max"])
+    assert 99 not in before["max"].to_numpy()
+
+    # Строка 7 не попадает в выборку через каждые 100 строк
+    df.loc[7, "Age"] = 99
+    assert index_for(df) is index
+    invalidate(df)
+
+    assert index_for(df) is not index
+    after = group_by(df, ["City"], "Age", ["max"])
+    assert after.loc[df.loc[7, "City"], "max"] == 99
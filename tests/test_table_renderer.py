@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_table_renderer import ELLIPSIS, TableRenderer, render_table
+
+tabulate = pytest.importorskip("tabulate").tabulate
+
+
+def _psql(df, **kwargs):
+    return tabulate(df, headers="keys", tablefmt="psql", **kwargs)
+
+
+@pytest.fixture
+def mixed():
+    return pd.DataFrame({
+        "ID": [1, 22, 333, 4],
+        "Tumor_Size": [1.5, np.nan, 12.25, 3.0],
+        "Gene": ["TP53", None, "BRCA1", "A"],
+        "Smoker": [True, False, True, False],
+        "x": [0.001, 1e7, -2.5, 3],
+        "Long_Header_Name": [1, 2, 3, 4],
+        "A": ["a", "b", "c", "d"],
+    })
+
+
+def test_matches_tabulate_psql(mixed):
+    assert render_table(mixed) == _psql(mixed)
+    named = mixed.rename_axis("row").iloc[1:3]
+    assert render_table(named) == _psql(named)
+    assert TableRenderer(show_index=False).render(mixed) == _psql(mixed, showindex=False)
+
+
+def test_pages_share_widths(mixed):
+    renderer = TableRenderer().fit(mixed)
+    first = renderer.render(mixed.iloc[:1]).splitlines()
+    second = renderer.render(mixed.iloc[2:3]).splitlines()
+    assert len(first[0]) == len(second[0]) == len(_psql(mixed).splitlines()[0])
+
+
+def test_long_text_is_cut_and_newlines_flattened():
+    df = pd.DataFrame({"Note": ["x" * 50, "two\nlines"]})
+    table = render_table(df, max_width=10)
+    assert "xxxxxxxxx" + ELLIPSIS in table
+    assert "two lines" in table
+    assert len({len(line) for line in table.splitlines()}) == 1
+
+
+def test_frame_without_columns():
+    assert TableRenderer(show_index=False).render(pd.DataFrame(index=[0, 1])) == ""
+    assert TableRenderer(show_index=False).render(pd.DataFrame()) == ""